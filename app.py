@@ -1,15 +1,79 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
-from flask import Flask, render_template, jsonify
+from flask import Flask, Response, render_template, jsonify, request
 import io
 import base64
+import json
 import os
+import sys
+import threading
 from datetime import datetime
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+from label_stream import LabelStreamFollower, count_deltas
+from search_index import FILTER_FIELDS, CsvSource, SearchIndex, StoreSource
+from ticket_loader import PROJECTIONS, aggregate_labels, read_tickets
+from ticket_store import TicketStore, store_enabled
+
 app = Flask(__name__)
 
 DATA_FILE = "analyzed_tickets.csv"
+_label_cache = {}
+_follower = None
+_follower_lock = threading.Lock()
+# Each open /stream holds a worker thread; keep some free for the other routes
+# (the Dockerfile runs gunicorn with 8 threads)
+MAX_STREAMS = int(os.environ.get('MAX_STREAMS', 4))
+_stream_slots = threading.BoundedSemaphore(MAX_STREAMS)
+_store = None
+_store_lock = threading.Lock()  # One SQLite connection shared by the request threads
+_search_cache = {}
+_search_source = None
+_search_lock = threading.Lock()
+
+def get_store():
+    global _store
+    if _store is None:
+        _store = TicketStore()
+    return _store
+
+def load_label_counts():
+    """Label counts streamed from the CSV in chunks (or one GROUP BY in the store), cached until the data changes"""
+    if store_enabled():
+        with _store_lock:
+            store = get_store()
+            key = ('store', store.data_version())
+            if _label_cache.get('key') != key:
+                _label_cache['cube'] = store.cube(exclude_errors=False)
+                _label_cache['key'] = key
+        return _label_cache['cube']
+    stat = os.stat(DATA_FILE)
+    key = (stat.st_mtime_ns, stat.st_size)
+    if _label_cache.get('key') != key:
+        _label_cache['cube'] = aggregate_labels(DATA_FILE, consumer='dashboard')
+        _label_cache['key'] = key
+    return _label_cache['cube']
+
+def load_preview(nrows):
+    """First tickets with their text: a LIMIT query on the store, or the head of the CSV"""
+    if store_enabled():
+        with _store_lock:
+            return get_store().query(PROJECTIONS['preview'], limit=nrows)
+    return read_tickets(DATA_FILE, consumer='preview', nrows=nrows)
+
+def get_search_index():
+    """BM25 index for the current dataset version: built once, then memory-mapped from disk"""
+    global _search_source
+    with _search_lock:
+        if _search_source is None:
+            _search_source = StoreSource(TicketStore()) if store_enabled() else CsvSource(DATA_FILE)
+        # Cheap change check (a stat or one-row lookup); the index directory is keyed on it too
+        key = _search_source.version()
+        if _search_cache.get('key') != key:
+            _search_cache['index'] = SearchIndex.open(_search_source)
+            _search_cache['key'] = key
+        return _search_cache['index']
 
 def plot_to_base64(fig):
     """Convert Matplotlib figure to base64 string for HTML embedding"""
@@ -20,11 +84,19 @@ def plot_to_base64(fig):
     plt.close(fig)
     return encoded
 
+def get_follower():
+    """Single background tail of the analyzer's label log, shared by all /stream clients"""
+    global _follower
+    with _follower_lock:
+        if _follower is None:
+            _follower = LabelStreamFollower().start()
+    return _follower
+
 @app.route('/')
 def index():
     try:
         # Debug: Check if file exists and show directory contents
-        if not os.path.exists(DATA_FILE):
+        if not store_enabled() and not os.path.exists(DATA_FILE):
             files = os.listdir('.')
             return f"""
             <h1>Data File Not Found</h1>
@@ -34,28 +106,29 @@ def index():
             <p>Please ensure analyzed_tickets.csv is in your GitHub repository.</p>
             """
         
-        # Load dataset with error handling
+        # Check for required columns
+        columns = list(pd.read_csv(DATA_FILE, nrows=0).columns) if not store_enabled() else ['sentiment', 'urgency', 'category']
+        required_columns = ['sentiment', 'urgency', 'category']
+        missing_columns = [col for col in required_columns if col not in columns]
+        if missing_columns:
+            return f"Error: Missing required columns in CSV: {', '.join(missing_columns)}. Available columns: {', '.join(columns)}"
+        
+        # Load label counts with error handling (memory stays flat as the CSV grows)
         try:
-            df = pd.read_csv(DATA_FILE)
+            cube = load_label_counts()
         except Exception as e:
             return f"Error reading CSV file: {str(e)}"
         
-        # Check if dataframe is empty
-        if df.empty:
+        # Check if dataset is empty
+        if cube.total == 0:
             return "Error: The dataset is empty. Please check your CSV file."
         
-        # Check for required columns
-        required_columns = ['sentiment', 'urgency', 'category']
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        if missing_columns:
-            return f"Error: Missing required columns in CSV: {', '.join(missing_columns)}. Available columns: {', '.join(df.columns)}"
-        
         # Generate plots with smaller size to save memory
         plt.style.use('default')  # Use default style to avoid memory issues
         
         # Plot 1: Sentiment Distribution
         fig1, ax1 = plt.subplots(figsize=(8, 4))  # Smaller size
-        sentiment_counts = df["sentiment"].value_counts()
+        sentiment_counts = cube.marginal("sentiment")
         sentiment_counts.plot(kind='barh', ax=ax1, color=sns.color_palette("Dark2"))
         ax1.spines[['top', 'right']].set_visible(False)
         ax1.set_title('Sentiment Distribution')
@@ -63,7 +136,7 @@ def index():
 
         # Plot 2: Urgency Distribution
         fig2, ax2 = plt.subplots(figsize=(8, 4))  # Smaller size
-        urgency_counts = df["urgency"].value_counts()
+        urgency_counts = cube.marginal("urgency")
         urgency_counts.plot(kind='barh', ax=ax2, color=sns.color_palette("Dark2"))
         ax2.spines[['top', 'right']].set_visible(False)
         ax2.set_title('Urgency Distribution')
@@ -71,7 +144,7 @@ def index():
 
         # Plot 3: Category Distribution (only top 10 to save memory)
         fig3, ax3 = plt.subplots(figsize=(8, 4))  # Smaller size
-        category_counts = df["category"].value_counts().head(10)  # Only top 10
+        category_counts = cube.marginal("category", top=10)  # Only top 10
         category_counts.plot(kind='barh', ax=ax3, color=sns.color_palette("Dark2"))
         ax3.spines[['top', 'right']].set_visible(False)
         ax3.set_title('Top 10 Categories Distribution')
@@ -79,11 +152,11 @@ def index():
 
         # Statistics
         stats = {
-            'total_tickets': len(df),
-            'sentiment_counts': df['sentiment'].value_counts().to_dict(),
-            'urgency_counts': df['urgency'].value_counts().to_dict(),
-            'category_counts': df['category'].value_counts().head(10).to_dict(),  # Only top 10
-            'data_preview': df.head(3).to_dict(orient='records')  # Sample data for debugging
+            'total_tickets': cube.total,
+            'sentiment_counts': sentiment_counts.to_dict(),
+            'urgency_counts': urgency_counts.to_dict(),
+            'category_counts': category_counts.to_dict(),  # Only top 10
+            'data_preview': load_preview(3).to_dict(orient='records')  # Sample data for debugging
         }
 
         current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -125,7 +198,7 @@ def debug():
             'files': files,
             'csv_exists': csv_exists,
             'csv_size': csv_size,
-            'csv_columns': list(pd.read_csv(DATA_FILE).columns) if csv_exists and csv_size > 0 else []
+            'csv_columns': list(pd.read_csv(DATA_FILE, nrows=0).columns) if csv_exists and csv_size > 0 else []
         })
     except Exception as e:
         return jsonify({'error': str(e)})
@@ -133,18 +206,79 @@ def debug():
 @app.route('/data')
 def get_data():
     try:
-        if not os.path.exists(DATA_FILE):
+        if not store_enabled() and not os.path.exists(DATA_FILE):
             return jsonify({'success': False, 'error': f'File {DATA_FILE} not found'})
         
-        df = pd.read_csv(DATA_FILE)
+        # Only the 50 preview rows are read with their text; the total comes from the cached counts
+        df = load_preview(50)
         return jsonify({
             'success': True,
-            'data': df.head(50).to_dict(orient='records'),  # Limit to 50 records
-            'total_records': len(df)
+            'data': df.astype(object).where(df.notna(), None).to_dict(orient='records'),  # Limit to 50 records
+            'total_records': load_label_counts().total
         })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
+@app.route('/search')
+def search():
+    """Full-text search over ticket_text and summary, e.g. /search?q=ERR-500&urgency=High"""
+    try:
+        if not store_enabled() and not os.path.exists(DATA_FILE):
+            return jsonify({'success': False, 'error': f'File {DATA_FILE} not found'})
+        
+        limit = min(max(int(request.args.get('limit', 20)), 1), 100)
+        offset = max(int(request.args.get('offset', 0)), 0)
+        filters = {field: request.args.get(field) for field in FILTER_FIELDS}
+        result = get_search_index().search(request.args.get('q', ''), filters, limit, offset,
+                                           match_all=request.args.get('match') == 'all')
+        return jsonify({'success': True, **result})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/stream')
+def stream():
+    """Server-Sent Events: live label counts while 02_analyze_data.py is running"""
+    if not _stream_slots.acquire(blocking=False):
+        response = jsonify({'success': False, 'error': f'At most {MAX_STREAMS} live streams; poll /stream/status instead'})
+        response.status_code = 503
+        response.headers['Retry-After'] = '30'
+        return response
+    follower = get_follower()
+
+    def events():
+        # Each open stream holds a worker thread: it ends as soon as the run is no longer running
+        version, snapshot = follower.current()
+        yield f"event: snapshot\ndata: {json.dumps(snapshot)}\n\n"
+        while snapshot['status'] == 'running':
+            update = follower.wait(version, timeout=15)
+            if update is None:
+                # A killed analyzer never writes run_finished: its run turns stalled instead
+                latest = follower.current()[1]
+                if latest['status'] != 'running':
+                    snapshot = latest
+                    break
+                yield ": keep-alive\n\n"
+                continue
+            previous = snapshot
+            version, snapshot = update
+            if snapshot['run_id'] != previous['run_id']:
+                # A new run started: counts were reset, send everything
+                yield f"event: snapshot\ndata: {json.dumps(snapshot)}\n\n"
+            else:
+                delta = dict(snapshot, counts=count_deltas(previous['counts'], snapshot['counts']))
+                yield f"event: update\ndata: {json.dumps(delta)}\n\n"
+        yield f"event: finished\ndata: {json.dumps({'status': snapshot['status']})}\n\n"
+
+    response = Response(events(), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+    response.call_on_close(_stream_slots.release)
+    return response
+
+@app.route('/stream/status')
+def stream_status():
+    """Current live aggregates as plain JSON"""
+    return jsonify(get_follower().current()[1])
+
 @app.route('/health')
 def health_check():
     return jsonify({'status': 'healthy', 'timestamp': datetime.now().isoformat()})
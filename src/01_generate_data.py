@@ -5,36 +5,28 @@ import json
 import time
 import os
 from datetime import datetime
+from ticket_store import TicketStore, store_enabled
+from ticket_vocabulary import PRODUCTS, ISSUES, TONES
 
 class DataGenerator:
     def __init__(self):
-        self.ollama_url = "http://localhost:11434/api/generate"
+        # OLLAMA_HOST lets the pipeline point at another server (e.g. src/mock_ollama.py)
+        host = os.environ.get("OLLAMA_HOST", "http://localhost:11434").rstrip("/")
+        self.ollama_host = host if "://" in host else f"http://{host}"
+        self.ollama_url = f"{self.ollama_host}/api/generate"
+        self.request_timeout = 180
         self.model_name = "deepseek-r1:8b"
-        self.products = [
-            "CloudSync Pro", 
-            "FinanceManager SaaS", 
-            "StreamFlix Subscription", 
-            "HomeSecurity Hub", 
-            "GymFlow App",
-            "OfficeSuite 365",
-            "DataBackup Pro",
-            "EmailShield Security",
-            "ProjectFlow Manager",
-            "CustomerCRM Platform"
-        ]
-        self.issues = [
-            "login problems", "billing dispute", "feature request", 
-            "bug report", "account deletion", "performance issues",
-            "subscription renewal", "data sync error", "mobile app crash",
-            "payment failure", "account setup", "password reset",
-            "invoice discrepancy", "feature not working", "slow performance"
-        ]
-        self.sentiments = ["frustrated", "neutral", "happy", "confused", "angry", "urgent", "satisfied", "disappointed"]
+        self.products = list(PRODUCTS)
+        self.issues = list(ISSUES)
+        self.sentiments = list(TONES)
+        # With TICKET_DB set, tickets are also upserted into the SQLite store in batches
+        self.store = TicketStore() if store_enabled() else None
+        self.stored_count = 0
         
     def check_ollama_connection(self):
         """Check if Ollama is running"""
         try:
-            response = requests.get("http://localhost:11434/api/tags", timeout=10)
+            response = requests.get(f"{self.ollama_host}/api/tags", timeout=10)
             return response.status_code == 200
         except:
             return False
@@ -68,7 +60,7 @@ class DataGenerator:
         }
         
         try:
-            response = requests.post(self.ollama_url, json=payload, timeout=180)
+            response = requests.post(self.ollama_url, json=payload, timeout=self.request_timeout)
             response.raise_for_status()
             
             response_data = response.json()
@@ -186,6 +178,13 @@ class DataGenerator:
             'ticket_text': tickets
         })
         df.to_csv(filename, index=False)
+        self._store_new_tickets(df)
+    
+    def _store_new_tickets(self, df):
+        """Upsert only the tickets generated since the last batch"""
+        if self.store is not None:
+            self.store.upsert(df.iloc[self.stored_count:])
+            self.stored_count = len(df)
     
     def _save_final_dataset(self, tickets, products_used):
         """Save final dataset with timestamp"""
@@ -196,6 +195,10 @@ class DataGenerator:
             'generated_timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         })
         df.to_csv('generated_tickets.csv', index=False)
+        if self.store is not None:
+            # Final batch: the rest of the tickets plus the generation timestamp for all of them
+            self.stored_count = 0
+            self._store_new_tickets(df)
         
         # Save a backup with timestamp
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -1,3 +1,4 @@
+import argparse
 import requests
 import pandas as pd
 import json
@@ -7,16 +8,47 @@ from typing import Dict, Any
 from datetime import datetime
 import os
 import random  # Moved to top level
+from label_stream import LabelPublisher
+from near_duplicates import NearDuplicateIndex
+from ticket_store import TicketStore, store_enabled
+from ticket_vocabulary import SENTIMENT_LABELS, URGENCY_LABELS, CATEGORY_LABELS
+from urgency_scheduler import UrgencyScheduler, arrival_seconds, prescore, print_report, time_to_label_report
+
+CHECKPOINT_FILE = 'analyzed_tickets_checkpoint.csv'
 
 class TicketAnalyzer:
-    def __init__(self):
-        self.ollama_url = "http://localhost:11434/api/generate"
+    def __init__(self, dedup: bool = True, dedup_threshold: float = 0.8, stream: bool = True,
+                 prioritize: bool = True, prescore_method: str = 'auto', max_boost_seconds: float = 1800.0):
+        # OLLAMA_HOST lets the pipeline point at another server (e.g. src/mock_ollama.py)
+        host = os.environ.get("OLLAMA_HOST", "http://localhost:11434").rstrip("/")
+        self.ollama_host = host if "://" in host else f"http://{host}"
+        self.ollama_url = f"{self.ollama_host}/api/generate"
+        self.request_timeout = 180
         self.model_name = "deepseek-r1:8b"
         
+        # Near-duplicate tickets are analyzed once and share their labels
+        self.dedup_index = NearDuplicateIndex(threshold=dedup_threshold) if dedup else None
+        self.labels_by_ticket = {}
+        self.llm_calls = 0  # tickets the LLM actually labeled: the budget active labeling spends
+        self.llm_requests = 0  # every attempt, retries included
+        self.last_was_duplicate = False
+        
+        # Every labeled ticket is published so the dashboard can follow the run live
+        self.publisher = LabelPublisher() if stream else None
+        
+        # With TICKET_DB set, labels are also upserted into the SQLite store, one batch per checkpoint
+        self.store = TicketStore() if store_enabled() else None
+        self.pending_labels = []
+        
+        # Likely-High tickets are dispatched first; aging caps how far any ticket can be overtaken
+        self.prioritize = prioritize
+        self.prescore_method = prescore_method
+        self.max_boost_seconds = max_boost_seconds
+        
     def check_ollama_connection(self):
         """Check if Ollama is running"""
         try:
-            response = requests.get("http://localhost:11434/api/tags", timeout=10)
+            response = requests.get(f"{self.ollama_host}/api/tags", timeout=10)
             return response.status_code == 200
         except:
             return False
@@ -61,7 +93,8 @@ class TicketAnalyzer:
         """Analyze a single ticket and extract structured data - FIXED VERSION"""
         if attempt > 2:
             return self.get_error_response()
-            
+        
+        self.llm_requests += 1
         prompt = f"""
         Analyze this customer support ticket and return ONLY valid JSON without any other text.
         
@@ -88,7 +121,7 @@ class TicketAnalyzer:
         }
         
         try:
-            response = requests.post(self.ollama_url, json=payload, timeout=180)
+            response = requests.post(self.ollama_url, json=payload, timeout=self.request_timeout)
             response.raise_for_status()
             
             response_data = response.json()
@@ -127,15 +160,15 @@ class TicketAnalyzer:
                 print(f"   ⚠️ Fixed missing keys: {analysis_data}")
             
             # Validate values are acceptable
-            valid_sentiments = {"Negative", "Neutral", "Positive"}
-            valid_urgency = {"High", "Medium", "Low"}
-            valid_categories = {"Billing", "Login Issue", "Feature Request", "Bug Report", 
-                               "Technical Issue", "Account Management", "Payment Issue", "Other"}
+            valid_sentiments = set(SENTIMENT_LABELS)
+            valid_urgency = set(URGENCY_LABELS)
+            valid_categories = set(CATEGORY_LABELS)
             
             if (analysis_data.get("sentiment") in valid_sentiments and
                 analysis_data.get("urgency") in valid_urgency and
                 analysis_data.get("category") in valid_categories):
                 
+                self.llm_calls += 1
                 return analysis_data
             else:
                 print(f"   ⚠️ Invalid values in response: {analysis_data}")
@@ -172,93 +205,204 @@ class TicketAnalyzer:
             print("💡 Run: ollama serve")
             return False
             
-        print("📖 Loading generated tickets...")
-        try:
-            df = pd.read_csv(input_file)
-        except FileNotFoundError:
-            print(f"❌ File {input_file} not found. Run 01_generate_data.py first!")
+        load_work = self._load_store_work if self.store is not None else self._load_csv_work
+        df, analyses, done = load_work(input_file)
+        if df is None:
             return False
+        total = done + len(df)
+        start_index = len(analyses)
+        if start_index == len(df):
+            print("✅ Every ticket is already labeled")
+            return self._save_final_results(df, analyses, output_file)
         
-        print(f"✅ Loaded {len(df)} tickets")
-        print(f"🔍 Analyzing {len(df)} tickets with local LLM...")
+        print(f"🔍 Analyzing {len(df) - start_index} tickets with local LLM...")
         print("⏰ This will take 60-90 minutes for 1200 tickets...")
         print("💡 Press Ctrl+C to pause and save progress\n")
         
-        # Try to load existing progress
-        analyses = []
-        start_index = 0
-        checkpoint_file = 'analyzed_tickets_checkpoint.csv'
-        
-        if os.path.exists(checkpoint_file):
-            try:
-                existing_df = pd.read_csv(checkpoint_file)
-                analyses = existing_df[['sentiment', 'urgency', 'category', 'summary']].to_dict('records')
-                start_index = len(analyses)
-                print(f"📂 Resuming from checkpoint: {start_index}/{len(df)} tickets already analyzed")
-            except:
-                print("⚠️ Could not load checkpoint, starting from beginning")
+        queue = self.build_queue(df, [index for index in range(len(df)) if index not in analyses])
+        timings = []
         
         start_time = time.time()
+        last_done = start_time
+        if self.publisher is not None:
+            self.publisher.start_run(total, done + start_index)
         
+        run_status = "failed"  # Unless the loop and the final save finish, or the user pauses
         try:
-            for index in range(start_index, len(df)):
-                if index >= len(df):
-                    break
-                    
+            while queue:
+                index = queue.pop()
                 row = df.iloc[index]
-                print(f"   Analyzing ticket {index + 1}/{len(df)}...")
+                print(f"   Analyzing ticket {done + len(analyses) + 1}/{total} (row {index + 1})...")
                 
-                analysis = self.analyze_ticket(row['ticket_text'])
-                analyses.append(analysis)
+                analysis = self.analyze_with_dedup(row)
+                analyses[index] = analysis
+                # Time since the previous label (including its sleep) is this ticket's share of the run
+                now = time.time()
+                timings.append({'position': index, 'urgency': analysis.get('urgency'),
+                                'service_seconds': now - last_done, 'labeled_seconds': now - start_time})
+                last_done = now
+                if self.publisher is not None:
+                    self.publisher.publish(row['ticket_id'], analysis, self.last_was_duplicate)
+                if self.store is not None:
+                    self.pending_labels.append({'ticket_id': row['ticket_id'], **analysis})
                 
                 print(f"      ✅ {analysis['sentiment']} | {analysis['urgency']} | {analysis['category']}")
                 
                 # Progress tracking every 10 tickets
-                if (index + 1) % 10 == 0:
+                if len(analyses) % 10 == 0:
                     elapsed = time.time() - start_time
-                    avg_time = elapsed / (index + 1 - start_index)
-                    remaining = (len(df) - (index + 1)) * avg_time
-                    print(f"   📊 {index + 1}/{len(df)} - "
+                    avg_time = elapsed / (len(analyses) - start_index)
+                    remaining = (len(df) - len(analyses)) * avg_time
+                    print(f"   📊 {done + len(analyses)}/{total} - "
                           f"Avg: {avg_time:.1f}s/ticket - "
                           f"ETA: {remaining/60:.1f}min")
                 
                 # Save checkpoint every 50 tickets
-                if (index + 1) % 50 == 0:
-                    self._save_checkpoint(df, analyses, checkpoint_file, index + 1)
-                    print(f"💾 Checkpoint saved at {index + 1} tickets")
+                if len(analyses) % 50 == 0:
+                    self._save_checkpoint(df, analyses, CHECKPOINT_FILE, len(analyses))
+                    print(f"💾 Checkpoint saved at {len(analyses)} tickets")
                 
-                # Dynamic sleep to prevent overheating
-                sleep_time = random.uniform(1.5, 2.5)
-                time.sleep(sleep_time)
+                # Dynamic sleep to prevent overheating (skipped when no LLM call was made)
+                if not self.last_was_duplicate:
+                    sleep_time = random.uniform(1.5, 2.5)
+                    time.sleep(sleep_time)
         
         except KeyboardInterrupt:
             print("\n⏸️  Analysis paused by user. Saving progress...")
-            self._save_checkpoint(df, analyses, checkpoint_file, len(analyses))
+            self._save_checkpoint(df, analyses, CHECKPOINT_FILE, len(analyses))
+            run_status = "paused"
             return False
-        
-        # Final save
-        result_df = self._save_final_results(df, analyses, output_file)
+        else:
+            # Final save
+            result_df = self._save_final_results(df, analyses, output_file)
+            run_status = "completed"
+        finally:
+            # Any other exception also ends the run, so the dashboard never shows a dead run as running
+            if self.publisher is not None:
+                self.publisher.finish_run(run_status)
         
         total_time = time.time() - start_time
         print(f"\n🎉 Analysis completed!")
         print(f"⏱️  Total time: {total_time/60:.1f} minutes")
-        print(f"📊 Average: {total_time/len(analyses):.1f} seconds per ticket")
+        print(f"📊 Average: {total_time/(len(analyses) - start_index):.1f} seconds per ticket")
         print(f"💾 Saved to '{output_file}'")
         
         # Show summary
         self.print_summary(result_df)
+        if self.dedup_index is not None:
+            self.dedup_index.print_report()
+            print(f"   LLM Calls: {self.llm_calls} for {len(analyses) - start_index} tickets "
+                  f"({self.llm_requests} requests incl. retries)")
+        if timings:
+            print_report(time_to_label_report(pd.DataFrame(timings)), 'reports/time_to_label.csv')
         
         return result_df
     
+    def build_queue(self, df: pd.DataFrame, pending) -> UrgencyScheduler:
+        """Queue the rows still to analyze: likely-High first when prioritizing, else file order"""
+        queue = UrgencyScheduler(self.max_boost_seconds)
+        if self.prioritize and pending:
+            scores = prescore(df['ticket_text'].iloc[pending].tolist(), self.prescore_method)
+            arrivals = arrival_seconds(df)[pending]
+        else:
+            scores = arrivals = [0.0] * len(pending)
+        for index, score, arrival in zip(pending, scores, arrivals):
+            queue.push(index, score, arrival)
+        return queue
+    
+    def _remember_analysis(self, row, analysis: Dict[str, Any]):
+        """Index an analyzed ticket so its near-duplicates can reuse the labels"""
+        representative = self.dedup_index.add(row['ticket_id'], str(row['ticket_text']))
+        if representative not in self.labels_by_ticket and analysis.get('sentiment') != 'Error':
+            self.labels_by_ticket[representative] = analysis
+    
+    def analyze_with_dedup(self, row) -> Dict[str, Any]:
+        """Analyze a ticket row, propagating labels from an analyzed near-duplicate"""
+        self.last_was_duplicate = False
+        if self.dedup_index is None:
+            return self.analyze_ticket(row['ticket_text'])
+        
+        text = str(row['ticket_text'])
+        sig = self.dedup_index.signature(text)
+        for match_id, similarity in self.dedup_index.lookup(text, sig):
+            representative = self.dedup_index.representative(match_id)
+            if representative in self.labels_by_ticket:
+                self.dedup_index.add(row['ticket_id'], text, sig)
+                self.last_was_duplicate = True
+                print(f"      ♻️ Near-duplicate of ticket {representative} (similarity {similarity:.2f})")
+                return dict(self.labels_by_ticket[representative])
+        
+        analysis = self.analyze_ticket(row['ticket_text'])
+        self._remember_analysis(row, analysis)
+        return analysis
+    
+    def _load_csv_work(self, input_file):
+        """(tickets, analyses resumed from the checkpoint, 0) from the generated CSV"""
+        print("📖 Loading generated tickets...")
+        try:
+            df = pd.read_csv(input_file)
+        except FileNotFoundError:
+            print(f"❌ File {input_file} not found. Run 01_generate_data.py first!")
+            return None, {}, 0
+        print(f"✅ Loaded {len(df)} tickets")
+        
+        # Try to load existing progress (file position → analysis; tickets finish out of file order)
+        analyses = {}
+        if os.path.exists(CHECKPOINT_FILE):
+            try:
+                existing_df = pd.read_csv(CHECKPOINT_FILE)
+                labels = existing_df[['sentiment', 'urgency', 'category', 'summary']].to_dict('records')
+                if 'ticket_id' in existing_df and 'ticket_id' in df:
+                    positions = pd.Index(df['ticket_id']).get_indexer(existing_df['ticket_id'])
+                else:
+                    positions = range(len(labels))  # Checkpoint without ids: a prefix of the file
+                analyses = {int(p): analysis for p, analysis in zip(positions, labels) if p >= 0}
+                print(f"📂 Resuming from checkpoint: {len(analyses)}/{len(df)} tickets already analyzed")
+            except:
+                print("⚠️ Could not load checkpoint, starting from beginning")
+        
+        if self.dedup_index is not None:
+            for index, analysis in analyses.items():
+                self._remember_analysis(df.iloc[index], analysis)
+        return df, analyses, 0
+    
+    def _load_store_work(self, input_file):
+        """(unlabeled tickets, {}, labeled count) from the store - it is the source of truth"""
+        if self.store.count() == 0:
+            if not os.path.exists(input_file):
+                print(f"❌ The ticket store is empty and {input_file} was not found. "
+                      "Run 01_generate_data.py with TICKET_DB set first!")
+                return None, {}, 0
+            print(f"📥 Importing {self.store.import_csv(input_file)} tickets from {input_file} into the store")
+        
+        print(f"📖 Loading unlabeled tickets from {self.store.path}...")
+        df = self.store.unlabeled()
+        labeled = self.store.labeled()
+        print(f"✅ {len(df)} tickets to analyze, {len(labeled)} already labeled")
+        
+        if self.dedup_index is not None:
+            for _, row in labeled.iterrows():
+                self._remember_analysis(row, row[['sentiment', 'urgency', 'category', 'summary']].to_dict())
+        return df, {}, len(labeled)
+    
     def _save_checkpoint(self, df, analyses, filename, current_count):
-        """Save progress to checkpoint file"""
-        if len(analyses) > 0:
-            result_df = pd.concat([df.iloc[:len(analyses)], pd.DataFrame(analyses)], axis=1)
+        """Save progress to checkpoint file (store mode: the label batch is the checkpoint)"""
+        self._flush_labels()
+        if self.store is None and len(analyses) > 0:
+            positions = sorted(analyses)
+            result_df = pd.concat([df.iloc[positions].reset_index(drop=True),
+                                   pd.DataFrame([analyses[p] for p in positions])], axis=1)
             result_df.to_csv(filename, index=False)
     
     def _save_final_results(self, df, analyses, output_file):
-        """Save final results with timestamp"""
-        result_df = pd.concat([df, pd.DataFrame(analyses)], axis=1)
+        """Save final results with timestamp (store mode: export the store to CSV)"""
+        self._flush_labels()
+        if self.store is not None:
+            # CSV is only an export for tools that still read files; the store keeps the history
+            self.store.export_csv(output_file)
+            return pd.read_csv(output_file)
+        
+        result_df = pd.concat([df, pd.DataFrame([analyses[p] for p in range(len(df))])], axis=1)
         result_df.to_csv(output_file, index=False)
         
         # Save backup with timestamp
@@ -270,6 +414,12 @@ class TicketAnalyzer:
         
         return result_df
     
+    def _flush_labels(self):
+        """Write the labels buffered since the last checkpoint in one transaction"""
+        if self.store is not None and self.pending_labels:
+            self.store.upsert(self.pending_labels)
+            self.pending_labels = []
+    
     def print_summary(self, df: pd.DataFrame):
         """Print analysis summary"""
         print("\n" + "="*60)
@@ -321,7 +471,17 @@ def main():
     print("💻 Hardware: RTX 3060 8GB + 16GB RAM")
     print("=" * 60)
     
-    analyzer = TicketAnalyzer()
+    parser = argparse.ArgumentParser(description="Label tickets with the local LLM")
+    parser.add_argument('--no-prioritize', action='store_true',
+                        help="Analyze in file order instead of likely-High tickets first")
+    parser.add_argument('--prescore', choices=['auto', 'model', 'keywords'], default='auto',
+                        help="Urgency pre-scoring: Models/urgency_best.joblib (auto falls back to keywords)")
+    parser.add_argument('--max-boost-seconds', type=float, default=1800.0,
+                        help="Aging: how far ahead of older tickets a likely-High ticket may jump")
+    args = parser.parse_args()
+    
+    analyzer = TicketAnalyzer(prioritize=not args.no_prioritize, prescore_method=args.prescore,
+                              max_boost_seconds=args.max_boost_seconds)
     result_df = analyzer.analyze_dataset()
     
     if result_df is not False:
@@ -1,20 +1,59 @@
+import argparse
+import hashlib
+import inspect
+import json
+import time
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import os
 import matplotlib
 from scipy import stats  # For statistical analysis
+from ticket_aggregates import IncrementalAggregator, SummaryCube
+from ticket_loader import read_tickets
+from ticket_store import TicketStore, store_enabled
 # Set the backend to avoid VS Code issues
 matplotlib.use('Agg')  # Use non-interactive backend
 
+# (chart method, output file) - rendered independently, so they can run in parallel
+CHARTS = [
+    ('create_sentiment_chart', 'figures/sentiment_analysis.png'),
+    ('create_category_chart', 'figures/category_distribution.png'),
+    ('create_urgency_chart', 'figures/urgency_analysis.png'),
+    ('create_product_analysis', 'figures/product_analysis.png'),
+    ('create_correlation_heatmap', 'figures/correlation_heatmap.png'),
+    ('create_executive_summary_chart', 'figures/executive_summary.png'),
+]
+CHART_MANIFEST = 'figures/.chart_hashes.json'
+
+
+def apply_plot_style():
+    """Shared matplotlib/seaborn style (also applied in each worker process)"""
+    plt.style.use('default')
+    sns.set_palette("husl")
+
+
+def _render_chart(visualizer, method: str, cube: SummaryCube) -> float:
+    """Render one chart in a worker process and return its wall time"""
+    start = time.perf_counter()
+    getattr(visualizer, method)(cube)
+    return time.perf_counter() - start
+
+
 class DataVisualizer:
-    def __init__(self):
+    def __init__(self, dpi: int = 300, workers: int = None, force: bool = False,
+                 incremental: bool = True, full_refresh: bool = False):
         # Set up plotting style
-        plt.style.use('default')
-        sns.set_palette("husl")
+        apply_plot_style()
         self.colors = sns.color_palette("husl", 8)
+        self.dpi = dpi
+        self.workers = workers or min(len(CHARTS), os.cpu_count() or 1)
+        self.force = force
+        self.incremental = incremental
+        self.full_refresh = full_refresh
         
         # Create figures directory if it doesn't exist
         os.makedirs('figures', exist_ok=True)
@@ -26,7 +65,8 @@ class DataVisualizer:
             return None
         
         try:
-            df = pd.read_csv('analyzed_tickets.csv')
+            # Only the label columns, as categoricals - the text columns are never needed here
+            df = read_tickets('analyzed_tickets.csv', consumer='visualizer')
             print(f"✅ Loaded {len(df)} analyzed tickets")
             
             # Clean data - remove any rows with 'Error' in sentiment
@@ -42,11 +82,95 @@ class DataVisualizer:
             print(f"❌ Error loading data: {e}")
             return None
     
-    def create_sentiment_chart(self, df: pd.DataFrame):
+    def build_cube(self, df: pd.DataFrame) -> SummaryCube:
+        """Aggregate the tickets once; charts and report render from the cube"""
+        cube = SummaryCube.from_frame(df)
+        print(f"✅ Aggregated {cube.total} tickets into {len(cube)} label combinations")
+        return cube
+    
+    def chart_inputs(self, method: str, cube: SummaryCube):
+        """The aggregates a chart is drawn from (the fallback urgency chart included)"""
+        if method == 'create_urgency_chart':
+            return [cube.crosstab('urgency', 'sentiment'), cube.marginal('urgency')]
+        if method == 'create_correlation_heatmap':
+            return [cube.correlation(top_categories=6)]
+        if method == 'create_executive_summary_chart':
+            return [cube.marginal('sentiment'), cube.marginal('urgency'),
+                    cube.marginal('category', top=5), cube.marginal('product', top=5)]
+        dimension = {'create_sentiment_chart': 'sentiment', 'create_category_chart': 'category',
+                     'create_product_analysis': 'product'}[method]
+        return [cube.marginal(dimension, top=8 if dimension == 'product' else None)]
+    
+    def chart_hash(self, method: str, cube: SummaryCube) -> str:
+        """Fingerprint of a chart's input aggregates, style settings and drawing code"""
+        digest = hashlib.sha256()
+        for data in self.chart_inputs(method, cube):
+            digest.update(data.to_json().encode())
+        digest.update(json.dumps({'dpi': self.dpi, 'colors': [list(c) for c in self.colors],
+                                  'matplotlib': matplotlib.__version__,
+                                  'seaborn': sns.__version__}).encode())
+        digest.update(inspect.getsource(getattr(DataVisualizer, method)).encode())
+        if method == 'create_urgency_chart':
+            digest.update(inspect.getsource(DataVisualizer.create_simple_urgency_chart).encode())
+        return digest.hexdigest()
+    
+    def render_charts(self, cube: SummaryCube) -> pd.DataFrame:
+        """Render changed charts in a process pool, skip the rest; returns a timing table"""
+        manifest = {}
+        if os.path.exists(CHART_MANIFEST) and not self.force:
+            with open(CHART_MANIFEST) as f:
+                manifest = json.load(f)
+        
+        hashes = {path: self.chart_hash(method, cube) for method, path in CHARTS}
+        stale = [(method, path) for method, path in CHARTS
+                 if manifest.get(path) != hashes[path] or not os.path.exists(path)]
+        timings = {path: {'Chart': os.path.basename(path), 'Status': 'skipped', 'Seconds': 0.0}
+                   for _, path in CHARTS}
+        
+        start = time.perf_counter()
+        if stale:
+            if self.workers > 1 and len(stale) > 1:
+                with ProcessPoolExecutor(max_workers=min(self.workers, len(stale)),
+                                         initializer=apply_plot_style) as pool:
+                    futures = {path: pool.submit(_render_chart, self, method, cube)
+                               for method, path in stale}
+                    seconds = {path: future.result() for path, future in futures.items()}
+            else:
+                seconds = {path: _render_chart(self, method, cube) for method, path in stale}
+            for path, elapsed in seconds.items():
+                # Chart methods report their own errors; a missing file means it failed
+                rendered = os.path.exists(path)
+                timings[path].update(Status='rendered' if rendered else 'failed',
+                                     Seconds=round(elapsed, 3))
+                if rendered:
+                    manifest[path] = hashes[path]
+                else:
+                    manifest.pop(path, None)
+        
+        with open(CHART_MANIFEST, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        
+        table = pd.DataFrame(list(timings.values()))
+        print(f"\n⏱️  Chart rendering ({len(stale)} rendered, {len(CHARTS) - len(stale)} unchanged, "
+              f"{self.workers} workers, {time.perf_counter() - start:.1f}s wall):")
+        print(table.to_string(index=False))
+        return table
+    
+    def significant_correlations(self, cube: SummaryCube):
+        """Correlations above 0.1 in absolute value (top 10) for the report"""
+        corr_matrix = cube.correlation(top_categories=6)
+        significant_correlations = []
+        for col in corr_matrix.columns:
+            for idx in corr_matrix.index:
+                if col != idx and abs(corr_matrix.loc[idx, col]) > 0.1:
+                    significant_correlations.append(f"{idx} ↔ {col}: {corr_matrix.loc[idx, col]:.2f}")
+        return significant_correlations[:10]
+    
+    def create_sentiment_chart(self, cube: SummaryCube):
         """Create sentiment distribution chart"""
         plt.figure(figsize=(10, 6))
         
-        sentiment_counts = df['sentiment'].value_counts()
+        sentiment_counts = cube.marginal('sentiment')
         colors = ['#ff6b6b', '#4ecdc4', '#45b7d1', '#96ceb4']  # Red, Teal, Blue, Green
         
         # Create bar chart
@@ -63,15 +187,15 @@ class DataVisualizer:
                     f'{int(height)}', ha='center', va='bottom', fontweight='bold')
         
         plt.tight_layout()
-        plt.savefig('figures/sentiment_analysis.png', dpi=300, bbox_inches='tight')
+        plt.savefig('figures/sentiment_analysis.png', dpi=self.dpi, bbox_inches='tight')
         plt.close()  # Important: close the figure to free memory
         print("✅ Created sentiment analysis chart")
     
-    def create_category_chart(self, df: pd.DataFrame):
+    def create_category_chart(self, cube: SummaryCube):
         """Create category distribution chart"""
         plt.figure(figsize=(12, 6))
         
-        category_counts = df['category'].value_counts()
+        category_counts = cube.marginal('category')
         
         # Create horizontal bar chart
         bars = plt.barh(category_counts.index, category_counts.values, 
@@ -87,17 +211,17 @@ class DataVisualizer:
                     f'{int(width)}', ha='left', va='center', fontweight='bold')
         
         plt.tight_layout()
-        plt.savefig('figures/category_distribution.png', dpi=300, bbox_inches='tight')
+        plt.savefig('figures/category_distribution.png', dpi=self.dpi, bbox_inches='tight')
         plt.close()  # Important: close the figure to free memory
         print("✅ Created category distribution chart")
     
-    def create_urgency_chart(self, df: pd.DataFrame):
+    def create_urgency_chart(self, cube: SummaryCube):
         """Create urgency analysis chart - FIXED VERSION"""
         try:
             plt.figure(figsize=(12, 8))
             
             # Create a cross-tabulation for urgency vs sentiment
-            urgency_data = pd.crosstab(df['urgency'], df['sentiment'])
+            urgency_data = cube.crosstab('urgency', 'sentiment')
             
             # If we have data, create the chart
             if not urgency_data.empty:
@@ -116,7 +240,7 @@ class DataVisualizer:
                 plt.xticks(rotation=45, ha='right')
                 
                 plt.tight_layout()
-                plt.savefig('figures/urgency_analysis.png', dpi=300, bbox_inches='tight')
+                plt.savefig('figures/urgency_analysis.png', dpi=self.dpi, bbox_inches='tight')
                 plt.close()  # Important: close the figure to free memory
                 print("✅ Created urgency analysis chart")
             else:
@@ -125,14 +249,14 @@ class DataVisualizer:
         except Exception as e:
             print(f"❌ Error creating urgency chart: {e}")
             # Create a simple alternative chart
-            self.create_simple_urgency_chart(df)
+            self.create_simple_urgency_chart(cube)
     
-    def create_simple_urgency_chart(self, df: pd.DataFrame):
+    def create_simple_urgency_chart(self, cube: SummaryCube):
         """Fallback urgency chart if the main one fails"""
         try:
             plt.figure(figsize=(10, 6))
             
-            urgency_counts = df['urgency'].value_counts()
+            urgency_counts = cube.marginal('urgency')
             colors = ['#ff6b6b', '#f9ca24', '#4ecdc4']  # Red, Yellow, Green
             
             bars = plt.bar(urgency_counts.index, urgency_counts.values, 
@@ -149,20 +273,20 @@ class DataVisualizer:
                         f'{int(height)}', ha='center', va='bottom', fontweight='bold')
             
             plt.tight_layout()
-            plt.savefig('figures/urgency_analysis.png', dpi=300, bbox_inches='tight')
+            plt.savefig('figures/urgency_analysis.png', dpi=self.dpi, bbox_inches='tight')
             plt.close()
             print("✅ Created simple urgency distribution chart")
             
         except Exception as e:
             print(f"❌ Could not create any urgency chart: {e}")
     
-    def create_product_analysis(self, df: pd.DataFrame):
+    def create_product_analysis(self, cube: SummaryCube):
         """Create product analysis chart"""
         try:
             plt.figure(figsize=(12, 8))
             
             # Count tickets by product
-            product_counts = df['product'].value_counts().head(8)  # Top 8 products
+            product_counts = cube.marginal('product', top=8)  # Top 8 products
             
             # Create a colorful pie chart
             colors = plt.cm.Set3(np.linspace(0, 1, len(product_counts)))
@@ -181,30 +305,20 @@ class DataVisualizer:
                 autotext.set_fontsize(10)
             
             plt.tight_layout()
-            plt.savefig('figures/product_analysis.png', dpi=300, bbox_inches='tight')
+            plt.savefig('figures/product_analysis.png', dpi=self.dpi, bbox_inches='tight')
             plt.close()
             print("✅ Created product analysis chart")
             
         except Exception as e:
             print(f"❌ Error creating product chart: {e}")
     
-    def create_correlation_heatmap(self, df: pd.DataFrame):
+    def create_correlation_heatmap(self, cube: SummaryCube):
         """Create correlation heatmap between categories, sentiment, and urgency"""
         try:
             plt.figure(figsize=(12, 10))
             
-            # Create encoded data for correlation
-            encoded_df = pd.DataFrame()
-            encoded_df['sentiment_num'] = df['sentiment'].map({'Negative': -1, 'Neutral': 0, 'Positive': 1})
-            encoded_df['urgency_num'] = df['urgency'].map({'Low': 0, 'Medium': 1, 'High': 2})
-            
-            # Get top categories and one-hot encode
-            top_categories = df['category'].value_counts().head(6).index
-            for category in top_categories:
-                encoded_df[f'category_{category}'] = (df['category'] == category).astype(int)
-            
-            # Calculate correlation matrix
-            corr_matrix = encoded_df.corr()
+            # Encoded sentiment/urgency and top-6 category one-hots, weighted by combination counts
+            corr_matrix = cube.correlation(top_categories=6)
             
             # Create heatmap
             mask = np.triu(np.ones_like(corr_matrix, dtype=bool))
@@ -215,37 +329,27 @@ class DataVisualizer:
             plt.title('Correlation Analysis: Sentiment vs Urgency vs Top Categories\n(1200 Tickets AI-Powered Insights)', 
                      fontweight='bold', fontsize=14)
             plt.tight_layout()
-            plt.savefig('figures/correlation_heatmap.png', dpi=300, bbox_inches='tight')
+            plt.savefig('figures/correlation_heatmap.png', dpi=self.dpi, bbox_inches='tight')
             plt.close()
             print("✅ Created correlation heatmap")
             
-            # Return significant correlations for the report
-            significant_correlations = []
-            for col in corr_matrix.columns:
-                for idx in corr_matrix.index:
-                    if col != idx and abs(corr_matrix.loc[idx, col]) > 0.1:
-                        significant_correlations.append(f"{idx} ↔ {col}: {corr_matrix.loc[idx, col]:.2f}")
-            
-            return significant_correlations[:10]  # Return top 10 correlations
-            
         except Exception as e:
             print(f"❌ Error creating correlation heatmap: {e}")
-            return []
     
-    def create_executive_summary_chart(self, df: pd.DataFrame):
+    def create_executive_summary_chart(self, cube: SummaryCube):
         """Create a comprehensive summary chart"""
         try:
             fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
             
             # Sentiment pie chart
-            sentiment_counts = df['sentiment'].value_counts()
+            sentiment_counts = cube.marginal('sentiment')
             colors_sentiment = ['#ff6b6b', '#4ecdc4', '#45b7d1']
             ax1.pie(sentiment_counts.values, labels=sentiment_counts.index, autopct='%1.1f%%',
                    colors=colors_sentiment, startangle=90)
             ax1.set_title('Customer Sentiment Distribution', fontweight='bold', fontsize=12)
             
             # Urgency bar chart
-            urgency_counts = df['urgency'].value_counts()
+            urgency_counts = cube.marginal('urgency')
             colors_urgency = ['#4ecdc4', '#f9ca24', '#ff6b6b']  # Green, Yellow, Red
             bars = ax2.bar(urgency_counts.index, urgency_counts.values, color=colors_urgency, alpha=0.8)
             ax2.set_title('Urgency Level Distribution', fontweight='bold', fontsize=12)
@@ -259,7 +363,7 @@ class DataVisualizer:
                         f'{int(height)}', ha='center', va='bottom', fontweight='bold')
             
             # Top categories
-            category_counts = df['category'].value_counts().head(5)
+            category_counts = cube.marginal('category', top=5)
             bars = ax3.barh(category_counts.index, category_counts.values, color=self.colors[:5])
             ax3.set_title('Top 5 Support Categories', fontweight='bold', fontsize=12)
             ax3.set_xlabel('Number of Tickets')
@@ -272,7 +376,7 @@ class DataVisualizer:
                         f'{int(width)}', ha='left', va='center', fontweight='bold')
             
             # Product distribution
-            product_counts = df['product'].value_counts().head(5)
+            product_counts = cube.marginal('product', top=5)
             colors_products = plt.cm.Pastel1(np.linspace(0, 1, len(product_counts)))
             wedges, texts, autotexts = ax4.pie(product_counts.values, labels=product_counts.index,
                                               autopct='%1.1f%%', colors=colors_products, startangle=90)
@@ -286,24 +390,25 @@ class DataVisualizer:
             plt.suptitle('Executive Summary: Customer Support Analysis (1200 Tickets)\nAI-Powered Insights', 
                         fontweight='bold', fontsize=16)
             plt.tight_layout()
-            plt.savefig('figures/executive_summary.png', dpi=300, bbox_inches='tight')
+            plt.savefig('figures/executive_summary.png', dpi=self.dpi, bbox_inches='tight')
             plt.close()
             print("✅ Created executive summary dashboard")
             
         except Exception as e:
             print(f"❌ Error creating executive summary: {e}")
     
-    def generate_report(self, df: pd.DataFrame):
+    def generate_report(self, cube: SummaryCube):
         """Generate a markdown report with insights"""
         try:
             # Calculate some insights
-            total_tickets = len(df)
-            negative_tickets = len(df[df['sentiment'] == 'Negative'])
-            high_urgency = len(df[df['urgency'] == 'High'])
-            most_common_category = df['category'].value_counts().index[0] if not df.empty else "N/A"
+            total_tickets = cube.total
+            negative_tickets = cube.count(sentiment='Negative')
+            high_urgency = cube.count(urgency='High')
+            category_counts = cube.marginal('category')
+            most_common_category = category_counts.index[0] if len(category_counts) else "N/A"
             
-            # Calculate correlation insights
-            significant_correlations = self.create_correlation_heatmap(df)
+            # Calculate correlation insights (the heatmap itself is rendered with the other charts)
+            significant_correlations = self.significant_correlations(cube)
             
             report = f"""# 🤖 AI-Powered Customer Support Analysis Report
 
@@ -321,13 +426,13 @@ This analysis used local LLM (DeepSeek R1 8B) to automatically categorize and an
 - **Most Common Category:** {most_common_category}
 
 ### Sentiment Distribution
-{df['sentiment'].value_counts().to_string()}
+{cube.marginal('sentiment').to_string()}
 
 ### Category Distribution  
-{df['category'].value_counts().to_string()}
+{category_counts.to_string()}
 
 ### Urgency Levels
-{df['urgency'].value_counts().to_string()}
+{cube.marginal('urgency').to_string()}
 
 ## 📈 Large Dataset Insights (1200+ Tickets)
 
@@ -357,16 +462,16 @@ This analysis used local LLM (DeepSeek R1 8B) to automatically categorize and an
 ## 🎯 Business Insights & Recommendations
 
 ### 1. Priority Areas
-- **Immediate Attention:** {len(df[(df['sentiment'] == 'Negative') & (df['urgency'] == 'High')])} tickets require urgent resolution
+- **Immediate Attention:** {cube.count(sentiment='Negative', urgency='High')} tickets require urgent resolution
 - **Common Issues:** Focus on improving {most_common_category} related processes
 
 ### 2. Customer Satisfaction
-- **Positive Experience:** {len(df[df['sentiment'] == 'Positive'])} customers had good experiences
+- **Positive Experience:** {cube.count(sentiment='Positive')} customers had good experiences
 - **Improvement Needed:** {negative_tickets} customers reported negative experiences
 
 ### 3. Operational Efficiency
-- **Resource Allocation:** {len(df[df['urgency'] == 'High'])} high-urgency tickets need immediate resources
-- **Process Optimization:** Consider automating responses for {df['category'].value_counts().index[1] if len(df['category'].value_counts()) > 1 else "common"} issues
+- **Resource Allocation:** {high_urgency} high-urgency tickets need immediate resources
+- **Process Optimization:** Consider automating responses for {category_counts.index[1] if len(category_counts) > 1 else "common"} issues
 
 ## 📊 Visualization Files
 
@@ -406,23 +511,39 @@ The following charts have been generated:
         print("🔄 Enhanced for 1200+ Tickets")
         print("=" * 60)
         
-        df = self.load_data()
-        if df is None:
-            print("❌ Cannot proceed without valid data")
-            return
+        if store_enabled():
+            # One indexed GROUP BY in the SQLite store (TICKET_DB) instead of reading the CSV
+            with TicketStore() as store:
+                cube = store.cube()
+            print(f"🗄️ Loaded aggregates for {cube.total} tickets from the ticket store")
+            if cube.total == 0:
+                print("❌ No valid data after cleaning errors!")
+                return
+        elif self.incremental and os.path.exists('analyzed_tickets.csv'):
+            # Persisted aggregates: only rows past the ticket_id watermark are read
+            cube = IncrementalAggregator('analyzed_tickets.csv').update(self.full_refresh)
+            if cube.total == 0:
+                print("❌ No valid data after cleaning errors!")
+                return
+        else:
+            df = self.load_data()
+            if df is None:
+                print("❌ Cannot proceed without valid data")
+                return
+            
+            cube = self.build_cube(df)
+            del df  # Everything below renders from the aggregates
         
         print("🎨 Creating enhanced visualizations...")
         
         # Create all charts with error handling
         try:
-            self.create_sentiment_chart(df)
-            self.create_category_chart(df)
-            self.create_urgency_chart(df)
-            self.create_product_analysis(df)
-            self.create_executive_summary_chart(df)
+            timings = self.render_charts(cube)
+            os.makedirs('reports', exist_ok=True)
+            timings.to_csv('reports/chart_timings.csv', index=False)
             
-            # Generate report (includes correlation heatmap)
-            self.generate_report(df)
+            # Generate report
+            self.generate_report(cube)
             
             print("\n✅ All visualizations completed successfully!")
             print("📁 Charts saved to 'figures/' directory")
@@ -444,7 +565,19 @@ The following charts have been generated:
 
 def main():
     """Main function for visualization"""
-    visualizer = DataVisualizer()
+    parser = argparse.ArgumentParser(description="Render charts and the analysis report")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Chart rendering processes (default: one per chart, up to the CPU count)")
+    parser.add_argument('--dpi', type=int, default=300)
+    parser.add_argument('--force', action='store_true', help="Re-render charts even if unchanged")
+    parser.add_argument('--full-refresh', action='store_true',
+                        help="Rebuild the persisted aggregates from the whole CSV")
+    parser.add_argument('--no-incremental', action='store_true',
+                        help="Aggregate in memory without reading or writing persisted state")
+    args = parser.parse_args()
+    
+    visualizer = DataVisualizer(dpi=args.dpi, workers=args.workers, force=args.force,
+                                incremental=not args.no_incremental, full_refresh=args.full_refresh)
     visualizer.run_visualization()
 
 if __name__ == "__main__":
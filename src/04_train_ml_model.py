@@ -0,0 +1,487 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+from typing import Dict, List
+
+import joblib
+import numpy as np
+import pandas as pd
+import matplotlib
+matplotlib.use('Agg')  # Use non-interactive backend (also inside worker processes)
+import matplotlib.pyplot as plt
+import seaborn as sns
+from joblib import Parallel, delayed
+from scipy import sparse
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, classification_report, confusion_matrix, f1_score
+from sklearn.model_selection import StratifiedGroupKFold
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import LabelEncoder
+from sklearn.svm import LinearSVC
+
+from compact_model import export_linear_pipeline
+from hyperparameter_search import HyperbandSearch
+from incremental_training import IncrementalRetrainer
+from multitask_model import LabelDecodedClassifier, MultiTaskTicketClassifier
+from near_duplicates import cluster_ids
+from serving_benchmark import DEFAULT_F1_TOLERANCE, markdown_table, measure_serving_cost, pareto_front, select_model
+from streaming_training import StreamingTrainer
+
+# Optional boosters - skipped with a warning when not installed
+try:
+    from xgboost import XGBClassifier
+except ImportError:
+    XGBClassifier = None
+try:
+    from catboost import CatBoostClassifier
+except ImportError:
+    CatBoostClassifier = None
+
+TASKS = {"Sentiment": "sentiment", "Urgency": "urgency", "Category": "category"}
+INVALID_LABELS = {
+    "sentiment": ["Error", "No sentiment detected", "Unknown"],
+    "urgency": ["Error", "No urgency detected", "Unknown"],
+    "category": ["Error", "No category detected"]
+}
+VECTORIZER_PARAMS = {"stop_words": "english", "max_features": 5000}
+
+
+def build_model_candidates(random_state: int = 42) -> Dict[str, object]:
+    """Candidate models from the CAS.ipynb benchmark (single-threaded, we parallelize across models)"""
+    candidates = {
+        "LogReg": LogisticRegression(max_iter=1000, class_weight="balanced"),
+        "NaiveBayes": MultinomialNB(),
+        "RandomForest": RandomForestClassifier(n_estimators=200, class_weight="balanced",
+                                               random_state=random_state, n_jobs=1),
+        "LinearSVC": LinearSVC(class_weight="balanced"),
+    }
+    if XGBClassifier is not None:
+        candidates["XGBoost"] = XGBClassifier(eval_metric="mlogloss", random_state=random_state,
+                                              n_jobs=1)
+    else:
+        print("⚠️ xgboost not installed, skipping XGBoost")
+    if CatBoostClassifier is not None:
+        candidates["CatBoost"] = CatBoostClassifier(verbose=0, random_state=random_state,
+                                                    thread_count=1)
+    else:
+        print("⚠️ catboost not installed, skipping CatBoost")
+    return candidates
+
+
+def load_training_data(input_file: str = 'analyzed_tickets.csv') -> pd.DataFrame:
+    """Load analyzed tickets and apply the notebook's label cleaning"""
+    df = pd.read_csv(input_file, usecols=["ticket_id", "ticket_text", "sentiment", "urgency", "category"])
+    df = df.dropna(subset=["ticket_text", "sentiment", "urgency", "category"])
+    for column, invalid in INVALID_LABELS.items():
+        df = df[~df[column].isin(invalid)]
+
+    # Handle rare categories: merge into "Other"
+    category_counts = df["category"].value_counts()
+    rare_categories = category_counts[category_counts < 5].index
+    df["category"] = df["category"].replace(list(rare_categories), "Other")
+    return df.reset_index(drop=True)
+
+
+def _fit_and_evaluate(task_name: str, model_name: str, model, feature_dir: str,
+                      report_dir: str, make_reports: bool, artifact_dir: str) -> dict:
+    """Fit one candidate on cached features, score it and save its serving pipeline (runs in a worker process)"""
+    X_train = sparse.load_npz(os.path.join(feature_dir, 'X_train.npz'))
+    X_test = sparse.load_npz(os.path.join(feature_dir, 'X_test.npz'))
+    y_train = np.load(os.path.join(feature_dir, 'y_train.npy'))
+    y_test = np.load(os.path.join(feature_dir, 'y_test.npy'))
+    classes = np.load(os.path.join(feature_dir, 'classes.npy'), allow_pickle=True)
+
+    model = clone(model)
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+
+    # Full text -> label pipeline, so serving cost can be measured on raw tickets
+    artifact_path = os.path.join(artifact_dir, f"{task_name.lower()}_{model_name}.joblib")
+    pipeline = Pipeline([("tfidf", joblib.load(os.path.join(feature_dir, 'vectorizer.joblib'))),
+                         ("clf", LabelDecodedClassifier(model, classes))])
+    joblib.dump(pipeline, artifact_path)
+
+    y_pred = classes[np.asarray(model.predict(X_test)).ravel().astype(int)]
+    y_true = classes[y_test]
+    acc = accuracy_score(y_true, y_pred)
+    f1 = f1_score(y_true, y_pred, average="weighted")
+
+    if make_reports:
+        os.makedirs(report_dir, exist_ok=True)
+        prefix = os.path.join(report_dir, f"{task_name.lower()}_{model_name}")
+        with open(f"{prefix}_report.txt", "w") as rep_file:
+            rep_file.write(classification_report(y_true, y_pred, zero_division=0))
+
+        cm = confusion_matrix(y_true, y_pred, labels=classes)
+        plt.figure(figsize=(8, 6))
+        sns.heatmap(cm, annot=True, fmt="d", cmap="Blues", xticklabels=classes, yticklabels=classes)
+        plt.title(f"{task_name} - {model_name} Confusion Matrix")
+        plt.xlabel("Predicted")
+        plt.ylabel("True")
+        plt.tight_layout()
+        plt.savefig(f"{prefix}_cm.png", dpi=300)
+        plt.close()
+
+    return {
+        "Task": task_name,
+        "Model": model_name,
+        "Accuracy": round(acc, 4),
+        "F1": round(f1, 4),
+        "FitSeconds": round(fit_seconds, 3),
+        "Artifact": artifact_path
+    }
+
+
+def _fit_full(model, X, y):
+    """Refit a model on the full dataset (runs in a worker process)"""
+    return clone(model).fit(X, y)
+
+
+class ModelTrainer:
+    def __init__(self, input_file: str = 'analyzed_tickets.csv', models_dir: str = 'Models',
+                 reports_dir: str = 'reports', cache_dir: str = '.cache/features',
+                 n_jobs: int = -1, random_state: int = 42, make_reports: bool = True,
+                 f1_tolerance: float = DEFAULT_F1_TOLERANCE, max_latency_ms: float = None,
+                 tuned_params: Dict[str, Dict[str, dict]] = None):
+        self.input_file = input_file
+        self.models_dir = models_dir
+        self.reports_dir = reports_dir
+        self.cache_dir = cache_dir
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+        self.make_reports = make_reports
+        self.candidates = build_model_candidates(random_state)
+        # Model selection: fastest within f1_tolerance of the best F1 (0.0 = pure F1)
+        self.f1_tolerance = f1_tolerance
+        self.max_latency_ms = max_latency_ms
+        # {task: {model: params}} from a previous --search run
+        self.tuned_params = tuned_params or {}
+
+    def candidates_for(self, task_name: str) -> Dict[str, object]:
+        """Candidate models for a task, with tuned hyperparameters applied if available"""
+        tuned = self.tuned_params.get(task_name, {})
+        return {name: clone(model).set_params(**tuned[name]) if name in tuned else model
+                for name, model in self.candidates.items()}
+
+    def _fingerprint(self, *parts) -> str:
+        """Stable hash of the data and settings a feature matrix depends on"""
+        digest = hashlib.sha256()
+        for part in parts:
+            if isinstance(part, (pd.Series, pd.DataFrame)):
+                digest.update(pd.util.hash_pandas_object(part, index=False).values.tobytes())
+            elif isinstance(part, np.ndarray):
+                digest.update(part.tobytes())
+            else:
+                digest.update(repr(part).encode('utf-8'))
+        return digest.hexdigest()[:16]
+
+    def split_indices(self, df: pd.DataFrame, target_col: str, groups: np.ndarray):
+        """Stratified 80/20 split that keeps near-duplicate clusters on one side"""
+        splitter = StratifiedGroupKFold(n_splits=5, shuffle=True, random_state=self.random_state)
+        train_idx, test_idx = next(splitter.split(df, df[target_col], groups))
+        return train_idx, test_idx
+
+    def cached_split_features(self, df: pd.DataFrame, target_col: str, groups: np.ndarray) -> str:
+        """Fit the TF-IDF vectorizer once per task split and cache the sparse matrices"""
+        train_idx, test_idx = self.split_indices(df, target_col, groups)
+        key = self._fingerprint(df["ticket_text"], df[target_col], train_idx, VECTORIZER_PARAMS)
+        feature_dir = os.path.join(self.cache_dir, f"{target_col}_{key}")
+        if os.path.exists(os.path.join(feature_dir, 'classes.npy')) and \
+                os.path.exists(os.path.join(feature_dir, 'texts_test.npy')):
+            print(f"♻️ Reusing cached features for {target_col} ({key})")
+            return feature_dir
+
+        le = LabelEncoder()
+        y = le.fit_transform(df[target_col])
+        vectorizer = TfidfVectorizer(**VECTORIZER_PARAMS)
+        X_train = vectorizer.fit_transform(df["ticket_text"].iloc[train_idx])
+        X_test = vectorizer.transform(df["ticket_text"].iloc[test_idx])
+
+        os.makedirs(feature_dir, exist_ok=True)
+        sparse.save_npz(os.path.join(feature_dir, 'X_train.npz'), X_train)
+        sparse.save_npz(os.path.join(feature_dir, 'X_test.npz'), X_test)
+        np.save(os.path.join(feature_dir, 'y_train.npy'), y[train_idx])
+        np.save(os.path.join(feature_dir, 'y_test.npy'), y[test_idx])
+        np.save(os.path.join(feature_dir, 'texts_test.npy'),
+                df["ticket_text"].iloc[test_idx].astype(str).values.astype(object))
+        joblib.dump(vectorizer, os.path.join(feature_dir, 'vectorizer.joblib'))
+        # classes.npy is written last so a partial cache is never reused
+        np.save(os.path.join(feature_dir, 'classes.npy'), le.classes_.astype(object))
+        print(f"💾 Cached {target_col} features: train {X_train.shape}, test {X_test.shape}")
+        return feature_dir
+
+    def full_features(self, df: pd.DataFrame):
+        """Fit the shared full-data vectorizer once for all tasks' final models"""
+        key = self._fingerprint(df["ticket_text"], VECTORIZER_PARAMS)
+        feature_dir = os.path.join(self.cache_dir, f"full_{key}")
+        vectorizer_path = os.path.join(feature_dir, 'vectorizer.joblib')
+        if os.path.exists(vectorizer_path):
+            return joblib.load(vectorizer_path), sparse.load_npz(os.path.join(feature_dir, 'X.npz'))
+
+        vectorizer = TfidfVectorizer(**VECTORIZER_PARAMS)
+        X = vectorizer.fit_transform(df["ticket_text"])
+        os.makedirs(feature_dir, exist_ok=True)
+        sparse.save_npz(os.path.join(feature_dir, 'X.npz'), X)
+        joblib.dump(vectorizer, vectorizer_path)
+        return vectorizer, X
+
+    def benchmark(self, df: pd.DataFrame, task_names: List[str]) -> pd.DataFrame:
+        """Score every candidate for every task, fitting models in parallel"""
+        groups = cluster_ids(df["ticket_text"].astype(str))
+
+        artifact_dir = os.path.join(os.path.dirname(self.cache_dir.rstrip('/')) or '.', 'candidates')
+        os.makedirs(artifact_dir, exist_ok=True)
+        jobs, test_texts = [], {}
+        for task_name in task_names:
+            target_col = TASKS[task_name]
+            if df[target_col].nunique() < 2:
+                print(f"⚠️ Skipping {task_name}: only one class available.")
+                continue
+            feature_dir = self.cached_split_features(df, target_col, groups)
+            test_texts[task_name] = np.load(os.path.join(feature_dir, 'texts_test.npy'), allow_pickle=True)
+            report_dir = os.path.join(self.reports_dir, target_col)
+            for model_name, model in self.candidates_for(task_name).items():
+                jobs.append(delayed(_fit_and_evaluate)(task_name, model_name, model, feature_dir,
+                                                       report_dir, self.make_reports, artifact_dir))
+
+        print(f"🚀 Training {len(jobs)} models in parallel (n_jobs={self.n_jobs})...")
+        results = Parallel(n_jobs=self.n_jobs)(jobs)
+        for row in results:
+            print(f"✅ {row['Task']} / {row['Model']}: Accuracy={row['Accuracy']:.3f}, "
+                  f"F1={row['F1']:.3f} ({row['FitSeconds']:.1f}s)")
+
+        # Serving cost is measured sequentially so parallel fits don't skew the timings
+        print("⏱️  Measuring load time and prediction latency...")
+        for row in results:
+            row.update(measure_serving_cost(row.pop("Artifact"), test_texts[row["Task"]]))
+            print(f"   {row['Task']} / {row['Model']}: {row['SizeKB']:.0f} KB, "
+                  f"load {row['LoadMs']:.0f} ms, p99 single {row['P99Ms_b1']:.2f} ms")
+        return pd.DataFrame(results)
+
+    def save_best_models(self, df: pd.DataFrame, results: pd.DataFrame) -> Dict[str, str]:
+        """Refit each task's best model on the full dataset and save it as a pipeline"""
+        vectorizer, X = self.full_features(df)
+
+        best = {}
+        for task_name, task_results in results.groupby("Task", sort=False):
+            best_row = select_model(task_results, self.f1_tolerance, self.max_latency_ms)
+            best[task_name] = best_row["Model"]
+            print(f"🏆 Best model for {task_name}: {best_row['Model']} (F1={best_row['F1']:.3f}, "
+                  f"p99 single {best_row.get('P99Ms_b1', float('nan')):.2f} ms)")
+
+        encoders = {task: LabelEncoder().fit(df[TASKS[task]]) for task in best}
+        fitted = Parallel(n_jobs=self.n_jobs)(
+            delayed(_fit_full)(self.candidates_for(task)[best[task]], X, encoders[task].transform(df[TASKS[task]]))
+            for task in best
+        )
+
+        os.makedirs(self.models_dir, exist_ok=True)
+        paths = {}
+        for task_name, model in zip(best, fitted):
+            # The classifier was fitted on encoded labels; the artifact still predicts label names
+            pipeline = Pipeline([("tfidf", vectorizer),
+                                 ("clf", LabelDecodedClassifier(model, encoders[task_name].classes_))])
+            model_path = os.path.join(self.models_dir, f"{task_name.lower()}_best.joblib")
+            joblib.dump(pipeline, model_path)
+            paths[task_name] = model_path
+            print(f"💾 Saved best {task_name} model → {model_path}")
+
+            # Linear winners also get the fast-loading NumPy format for serving
+            if hasattr(model, "coef_"):
+                npz_path = model_path.replace(".joblib", ".npz")
+                export_linear_pipeline(pipeline, npz_path)
+                print(f"💾 Exported compact {task_name} model → {npz_path}")
+
+        # All heads share the full-data vectorizer, so they can be served as one artifact
+        multitask = MultiTaskTicketClassifier(
+            vectorizer, dict(zip(best, fitted)),
+            {task: encoders[task].classes_ for task in best}
+        )
+        paths["MultiTask"] = os.path.join(self.models_dir, "multitask_best.joblib")
+        multitask.save(paths["MultiTask"])
+        print(f"💾 Saved multi-task model → {paths['MultiTask']}")
+        return paths
+
+    def write_evaluation_report(self, results: pd.DataFrame):
+        """Write Models/evaluation_report.md and the F1 comparison chart"""
+        f1_chart_path = "figures/benchmark_f1_scores.png"
+        os.makedirs(os.path.dirname(f1_chart_path), exist_ok=True)
+        plt.figure(figsize=(10, 6))
+        sns.barplot(data=results, x="Model", y="F1", hue="Task")
+        plt.title("Model Benchmark Comparison (F1 Score)")
+        plt.ylabel("F1 Score")
+        plt.ylim(0, 1)
+        plt.legend(title="Task")
+        plt.tight_layout()
+        plt.savefig(f1_chart_path, dpi=300)
+        plt.close()
+
+        report_path = os.path.join(self.models_dir, "evaluation_report.md")
+        with open(report_path, "w", encoding="utf-8") as f:
+            f.write("# 📊 Model Evaluation Report\n\n")
+            f.write("This report summarizes the benchmarking results for the Sentiment, Urgency, "
+                    "and Category classification tasks.\n\n")
+            f.write("## 🏆 Best Models Per Task\n\n")
+            for task, task_results in results.groupby("Task", sort=False):
+                best_row = select_model(task_results, self.f1_tolerance, self.max_latency_ms)
+                f.write(f"- **{task}** → {best_row['Model']} (Accuracy={best_row['Accuracy']:.2f}, "
+                        f"F1={best_row['F1']:.2f})\n")
+            f.write("\n## 📋 Full Benchmark Results\n\n")
+            f.write(markdown_table(results[["Task", "Model", "Accuracy", "F1"]]))
+            if "P99Ms_b1" in results:
+                f.write("\n\n## ⚡ Serving Cost\n\n")
+                f.write("Latency is per `predict` call on raw ticket text (ms), by batch size.\n\n")
+                f.write(markdown_table(results.drop(columns=["Accuracy", "FitSeconds"], errors="ignore")))
+                f.write("\n\n## 🎯 Accuracy vs Latency Pareto Front\n\n")
+                f.write("Models not beaten on both F1 and p99 single-ticket latency.\n\n")
+                f.write(markdown_table(pareto_front(results)[["Task", "Model", "F1", "P99Ms_b1", "SizeKB"]]))
+            f.write("\n\n## 🔎 Confusion Matrices & Reports\n")
+            f.write("Confusion matrices (`.png`) and detailed classification reports (`.txt`) "
+                    f"for each model are saved in the `{self.reports_dir}/` directory.\n")
+            f.write("\n## 📈 F1 Score Comparison Chart\n")
+            f.write(f"![F1 Score Comparison](../{f1_chart_path})\n")
+        print(f"💾 Saved evaluation report → {report_path}")
+
+    def search(self, task_names: List[str] = None, budget_seconds: float = 600) -> pd.DataFrame:
+        """Hyperband search per task on the training split (the test split stays untouched)"""
+        task_names = task_names or list(TASKS)
+        df = load_training_data(self.input_file)
+        print(f"✅ Dataset loaded with {len(df)} valid rows")
+        groups = cluster_ids(df["ticket_text"].astype(str))
+        searcher = HyperbandSearch(self.candidates, VECTORIZER_PARAMS, cache_dir=self.cache_dir,
+                                   budget_seconds=budget_seconds / len(task_names),
+                                   n_jobs=self.n_jobs, random_state=self.random_state)
+
+        all_trials = []
+        for task_name in task_names:
+            target_col = TASKS[task_name]
+            train_idx, _ = self.split_indices(df, target_col, groups)
+            train = df.iloc[train_idx]
+            key = self._fingerprint(train["ticket_text"], train[target_col], VECTORIZER_PARAMS)
+            fold_dirs = searcher.cached_folds(train["ticket_text"], train[target_col],
+                                              groups[train_idx], f"{target_col}_{key}")
+            print(f"🔎 Searching {task_name} ({len(fold_dirs)} cached folds)...")
+            all_trials.append(searcher.search(task_name, fold_dirs))
+
+        trials = pd.concat(all_trials, ignore_index=True)
+        os.makedirs(self.models_dir, exist_ok=True)
+        trials.to_csv(os.path.join(self.models_dir, "search_results.csv"), index=False)
+        best = HyperbandSearch.best_params(trials)
+        params_path = os.path.join(self.models_dir, "best_hyperparameters.json")
+        with open(params_path, "w") as f:
+            json.dump(best, f, indent=2)
+        tuned = sum(len(models) for models in best.values())
+        print(f"💾 Saved {len(trials)} trials and {tuned} tuned configurations that beat the defaults "
+              f"on all the data → {params_path}")
+        return trials
+
+    def run(self, task_names: List[str] = None) -> pd.DataFrame:
+        """Run the full benchmark and save results and best models"""
+        task_names = task_names or list(TASKS)
+        start_time = time.time()
+
+        df = load_training_data(self.input_file)
+        print(f"✅ Dataset loaded with {len(df)} valid rows")
+
+        results = self.benchmark(df, task_names)
+        if results.empty:
+            print("❌ Nothing to train")
+            return results
+
+        os.makedirs(self.models_dir, exist_ok=True)
+        results_path = os.path.join(self.models_dir, "benchmark_results.csv")
+        results.drop(columns=["FitSeconds"]).to_csv(results_path, index=False)
+        print(f"💾 Saved benchmark results → {results_path}")
+        pareto_path = os.path.join(self.models_dir, "pareto_table.csv")
+        pareto_front(results).drop(columns=["FitSeconds"]).to_csv(pareto_path, index=False)
+        print(f"💾 Saved accuracy-vs-latency Pareto table → {pareto_path}")
+
+        self.save_best_models(df, results)
+        if self.make_reports:
+            self.write_evaluation_report(results)
+
+        print(f"\n⏱️  Total training time: {time.time() - start_time:.1f}s")
+        return results
+
+
+def main():
+    """Main function to train the ticket classifiers"""
+    parser = argparse.ArgumentParser(description="Benchmark and train ticket classifiers")
+    parser.add_argument('--input', default='analyzed_tickets.csv')
+    parser.add_argument('--tasks', default=','.join(TASKS), help="Comma-separated subset of tasks")
+    parser.add_argument('--n-jobs', type=int, default=-1)
+    parser.add_argument('--models-dir', default='Models')
+    parser.add_argument('--cache-dir', default='.cache/features')
+    parser.add_argument('--no-reports', action='store_true', help="Skip confusion matrices and reports")
+    parser.add_argument('--f1-tolerance', type=float, default=DEFAULT_F1_TOLERANCE,
+                        help="Pick the fastest model within this F1 of the best (0 = highest F1)")
+    parser.add_argument('--pure-f1', action='store_true',
+                        help="Select on F1 alone, ignoring serving cost and --max-latency-ms")
+    parser.add_argument('--max-latency-ms', type=float, default=None,
+                        help="Prefer models whose p99 single-ticket latency is under this budget")
+    parser.add_argument('--search', action='store_true',
+                        help="Hyperband hyperparameter search; writes Models/best_hyperparameters.json")
+    parser.add_argument('--budget-seconds', type=float, default=600,
+                        help="Wall-clock budget for --search")
+    parser.add_argument('--tuned-params', default=None,
+                        help="JSON from --search to apply to the candidates")
+    parser.add_argument('--streaming', action='store_true',
+                        help="Out-of-core mode: chunked reads, hashed features, partial_fit models")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Update the latest versioned model with new rows only (partial_fit)")
+    parser.add_argument('--full-scan', action='store_true',
+                        help="With --incremental: re-hash the whole corpus (catches tickets relabeled in place)")
+    parser.add_argument('--chunk-size', type=int, default=50_000)
+    parser.add_argument('--epochs', type=int, default=1)
+    args = parser.parse_args()
+    if args.pure_f1:
+        args.f1_tolerance, args.max_latency_ms = 0.0, None
+
+    print("=" * 60)
+    print("🤖 Ticket Classifier Training")
+    print("=" * 60)
+
+    if args.incremental:
+        retrainer = IncrementalRetrainer(input_file=args.input, models_dir=args.models_dir,
+                                         chunk_size=args.chunk_size, full_scan=args.full_scan)
+        version = retrainer.run()
+        print(f"\n{'✅ Current model: ' + version if version else '⚠️ No new version published'}")
+        return
+    elif args.streaming:
+        trainer = StreamingTrainer(input_file=args.input, models_dir=args.models_dir,
+                                   chunk_size=args.chunk_size, epochs=args.epochs)
+        results = trainer.run()
+    else:
+        tuned_params = None
+        if args.tuned_params:
+            with open(args.tuned_params) as f:
+                tuned_params = json.load(f)
+        trainer = ModelTrainer(input_file=args.input, models_dir=args.models_dir,
+                               cache_dir=args.cache_dir, n_jobs=args.n_jobs,
+                               make_reports=not args.no_reports,
+                               f1_tolerance=args.f1_tolerance, max_latency_ms=args.max_latency_ms,
+                               tuned_params=tuned_params)
+        known = {task.lower(): task for task in TASKS}
+        task_names = [known.get(t.strip().lower()) for t in args.tasks.split(',')]
+        if None in task_names:
+            parser.error(f"--tasks must be a subset of {', '.join(TASKS)} (got {args.tasks!r})")
+        if args.search:
+            results = trainer.search(task_names, args.budget_seconds)
+        else:
+            results = trainer.run(task_names)
+
+    if not results.empty:
+        print("\n✅ Training completed successfully!")
+    else:
+        print("\n❌ Training failed!")
+
+
+if __name__ == "__main__":
+    main()
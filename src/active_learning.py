@@ -0,0 +1,260 @@
+import argparse
+import importlib
+import os
+import time
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import f1_score
+
+from streaming_training import StreamingTrainer, TASK_LABELS
+
+LABEL_COLUMNS = ["sentiment", "urgency", "category", "summary"]
+STRATEGIES = ["margin", "entropy", "random"]
+VECTORIZER_PARAMS = {"stop_words": "english", "max_features": 5000}
+
+
+def uncertainty_scores(proba: np.ndarray, strategy: str) -> np.ndarray:
+    """Per-row informativeness in [0, 1] from class probabilities (higher = more informative)"""
+    if proba.shape[1] < 2:
+        return np.zeros(len(proba))
+    if strategy == "margin":
+        top2 = np.partition(proba, -2, axis=1)[:, -2:]
+        return 1.0 - (top2[:, 1] - top2[:, 0])
+    if strategy == "entropy":
+        entropy = -(proba * np.log(np.clip(proba, 1e-12, None))).sum(axis=1)
+        return entropy / np.log(proba.shape[1])
+    raise ValueError(f"Unknown strategy: {strategy}")
+
+
+def simulated_oracle(labeled_file: str) -> Callable[[pd.Series], Dict[str, str]]:
+    """Labeler that replays existing analyzer output instead of calling the LLM"""
+    labels = pd.read_csv(labeled_file, usecols=["ticket_id"] + LABEL_COLUMNS).set_index("ticket_id")
+    labels = labels[~labels.index.duplicated()]
+
+    def label(row: pd.Series) -> Dict[str, str]:
+        return labels.loc[row["ticket_id"]].to_dict()
+    return label
+
+
+def llm_oracle() -> Callable[[pd.Series], Dict[str, str]]:
+    """Labeler backed by the TicketAnalyzer (one LLM call per ticket, near-duplicates reused)"""
+    analyzer = importlib.import_module('02_analyze_data').TicketAnalyzer()
+    if not analyzer.check_ollama_connection():
+        raise ConnectionError(f"Ollama is not reachable at {analyzer.ollama_host}")
+    return analyzer.analyze_with_dedup
+
+
+class ActiveLabelingLoop:
+    def __init__(self, pool: pd.DataFrame, oracle: Callable[[pd.Series], Dict[str, str]],
+                 evaluation: Optional[pd.DataFrame] = None, strategy: str = "margin",
+                 seed_size: int = 50, batch_size: int = 50, max_calls: int = 500,
+                 target_f1: float = None, random_state: int = 42):
+        """Label only the tickets the current models are least sure about"""
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy: {strategy}")
+        self.pool = pool.reset_index(drop=True)
+        self.oracle = oracle
+        self.evaluation = evaluation
+        self.strategy = strategy
+        self.seed_size = seed_size
+        self.batch_size = batch_size
+        self.max_calls = max_calls
+        self.target_f1 = target_f1
+        self.rng = np.random.RandomState(random_state)
+        self.random_state = random_state
+
+        # The pool text is known up front: vectorize it once, score it in one pass per round
+        self.vectorizer = TfidfVectorizer(**VECTORIZER_PARAMS)
+        self.X_pool = self.vectorizer.fit_transform(self.pool["ticket_text"].astype(str))
+        self.X_eval = (self.vectorizer.transform(evaluation["ticket_text"].astype(str))
+                       if evaluation is not None else None)
+        self.labels = {}  # pool position -> analyzer output
+        self.llm_calls = 0
+
+    def label(self, positions: np.ndarray):
+        """Send the selected tickets to the labeler, counting only the LLM calls it actually made"""
+        # llm_oracle() hands over TicketAnalyzer.analyze_with_dedup: near-duplicates reuse an
+        # earlier answer and retries or failures label nothing, so the analyzer's own count of
+        # labeled tickets is the budget; other labelers cost 1 each
+        analyzer = getattr(self.oracle, "__self__", None)
+        counter = analyzer if hasattr(analyzer, "llm_calls") else None
+        before = counter.llm_calls if counter is not None else 0
+        for position in positions:
+            self.labels[int(position)] = self.oracle(self.pool.iloc[position])
+            if counter is None:
+                self.llm_calls += 1
+        if counter is not None:
+            self.llm_calls += counter.llm_calls - before
+
+    def fit(self) -> Dict[str, LogisticRegression]:
+        """One classifier per task on the valid labels collected so far"""
+        positions = np.fromiter(self.labels, dtype=int)
+        labeled = pd.DataFrame([self.labels[p] for p in positions])
+        models = {}
+        for task, (column, _) in TASK_LABELS.items():
+            y = StreamingTrainer.encode_labels(labeled[column], task)
+            keep = y >= 0
+            if len(np.unique(y[keep])) < 2:
+                continue
+            models[task] = LogisticRegression(max_iter=1000, class_weight="balanced").fit(
+                self.X_pool[positions[keep]], y[keep])
+        return models
+
+    def select(self, models: Dict[str, LogisticRegression]) -> np.ndarray:
+        """Top-K unlabeled tickets by uncertainty averaged across the tasks"""
+        unlabeled = np.setdiff1d(np.arange(len(self.pool)), np.fromiter(self.labels, dtype=int))
+        k = min(self.batch_size, len(unlabeled), self.max_calls - self.llm_calls)
+        if k <= 0:
+            return unlabeled[:0]
+        if self.strategy == "random":
+            return self.rng.choice(unlabeled, k, replace=False)
+
+        X = self.X_pool[unlabeled]
+        # A task without a model yet is maximally uncertain everywhere
+        scores = np.full(len(unlabeled), float(len(TASK_LABELS) - len(models)))
+        for model in models.values():
+            scores += uncertainty_scores(model.predict_proba(X), self.strategy)
+        top = np.argpartition(-scores, k - 1)[:k]
+        return unlabeled[top[np.argsort(-scores[top])]]
+
+    def evaluate(self, models: Dict[str, LogisticRegression]) -> Dict[str, float]:
+        """Weighted F1 per task on the fixed evaluation tickets"""
+        scores = {}
+        for task, (column, _) in TASK_LABELS.items():
+            y = StreamingTrainer.encode_labels(self.evaluation[column], task)
+            keep = y >= 0
+            if task not in models or not keep.any():
+                scores[task] = 0.0
+                continue
+            predicted = models[task].predict(self.X_eval[keep])
+            scores[task] = round(f1_score(y[keep], predicted, average="weighted"), 4)
+        return scores
+
+    def labeled_frame(self) -> pd.DataFrame:
+        """Labeled tickets in the analyzed_tickets.csv layout"""
+        positions = sorted(self.labels)
+        labels = pd.DataFrame([self.labels[p] for p in positions])[LABEL_COLUMNS]
+        return pd.concat([self.pool.iloc[positions].reset_index(drop=True), labels], axis=1)
+
+    def run(self, output_file: str = None) -> pd.DataFrame:
+        """Label → train → score the pool → label the top-K, until the call budget runs out"""
+        history = []
+        seed = self.rng.choice(len(self.pool), min(self.seed_size, len(self.pool), self.max_calls),
+                               replace=False)
+        batch = seed
+        while len(batch):
+            start = time.time()
+            self.label(batch)
+            if all(self.labels[int(p)].get("sentiment") == "Error" for p in batch):
+                print(f"   ❌ No ticket in round {len(history)} was labeled (LLM unavailable?) - stopping")
+                break
+            models = self.fit()
+            record = {"Strategy": self.strategy, "Round": len(history), "LLMCalls": self.llm_calls,
+                      "PoolFraction": round(self.llm_calls / len(self.pool), 4)}
+            if self.evaluation is not None:
+                scores = self.evaluate(models)
+                record.update({f"F1_{task}": score for task, score in scores.items()})
+                record["MeanF1"] = round(float(np.mean(list(scores.values()))), 4)
+            history.append(record)
+            print(f"   🔁 {self.strategy} round {record['Round']}: {self.llm_calls} LLM calls"
+                  + (f", mean F1 {record['MeanF1']:.3f}" if "MeanF1" in record else "")
+                  + f" ({time.time() - start:.1f}s)")
+
+            if output_file:
+                # Rewritten every round so an interrupted run keeps its labels
+                self.labeled_frame().to_csv(output_file, index=False)
+            if self.target_f1 is not None and record.get("MeanF1", 0) >= self.target_f1:
+                print(f"🎯 Target mean F1 {self.target_f1:.3f} reached after {self.llm_calls} calls")
+                break
+            batch = self.select(models)
+        return pd.DataFrame(history)
+
+
+def plot_learning_curves(history: pd.DataFrame, output_file: str):
+    """Mean F1 against LLM calls spent, one line per strategy"""
+    plt.figure(figsize=(8, 5))
+    for strategy, rows in history.groupby("Strategy", sort=False):
+        plt.plot(rows["LLMCalls"], rows["MeanF1"], marker="o", label=strategy)
+    plt.xlabel("LLM calls spent")
+    plt.ylabel("Mean weighted F1 (sentiment, urgency, category)")
+    plt.title("Active Labeling: F1 vs LLM Calls")
+    plt.legend()
+    plt.grid(alpha=0.3)
+    plt.tight_layout()
+    os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+    plt.savefig(output_file, dpi=300)
+    plt.close()
+
+
+def main():
+    """Active labeling with the LLM, or a replay of existing labels to compare strategies"""
+    parser = argparse.ArgumentParser(description="Uncertainty-driven active labeling queue")
+    parser.add_argument('--pool', default='generated_tickets.csv',
+                        help="Unlabeled tickets (ticket_id, ticket_text, ...)")
+    parser.add_argument('--output', default='active_labeled_tickets.csv')
+    parser.add_argument('--simulate', metavar='LABELED_CSV', default=None,
+                        help="Replay labels from an analyzed CSV instead of calling the LLM")
+    parser.add_argument('--eval-file', default=None,
+                        help="Labeled tickets to score F1 on (default: held out of --simulate)")
+    parser.add_argument('--eval-size', type=float, default=0.2)
+    parser.add_argument('--strategy', default='margin', choices=STRATEGIES + ['all'])
+    parser.add_argument('--seed-size', type=int, default=50)
+    parser.add_argument('--batch-size', type=int, default=50)
+    parser.add_argument('--max-calls', type=int, default=500)
+    parser.add_argument('--target-f1', type=float, default=None)
+    parser.add_argument('--report', default='reports/active_learning.csv')
+    args = parser.parse_args()
+
+    evaluation = pd.read_csv(args.eval_file) if args.eval_file else None
+    if args.simulate:
+        pool = pd.read_csv(args.simulate)
+        if evaluation is None:
+            held_out = pool.sample(frac=args.eval_size, random_state=42).index
+            evaluation, pool = pool.loc[held_out], pool.drop(held_out)
+        pool = pool.drop(columns=[c for c in LABEL_COLUMNS if c in pool])
+        make_oracle = lambda: simulated_oracle(args.simulate)
+    else:
+        pool = pd.read_csv(args.pool)
+        if evaluation is not None:
+            pool = pool[~pool["ticket_id"].isin(evaluation["ticket_id"])]
+        make_oracle = llm_oracle
+
+    strategies = STRATEGIES if args.strategy == 'all' else [args.strategy]
+    print(f"📖 Pool: {len(pool)} tickets, budget {args.max_calls} LLM calls, "
+          f"strategies: {', '.join(strategies)}")
+    if evaluation is None:
+        print("ℹ️ No --eval-file: no F1 is reported and --target-f1 is ignored; "
+              "the curve records LLM calls only")
+
+    histories = []
+    for strategy in strategies:
+        # A fresh analyzer per strategy: its dedup cache must not hand later strategies free labels
+        loop = ActiveLabelingLoop(pool, make_oracle(), evaluation, strategy=strategy,
+                                  seed_size=args.seed_size, batch_size=args.batch_size,
+                                  max_calls=args.max_calls, target_f1=args.target_f1)
+        # Only the LLM run's labels are worth keeping as training data
+        histories.append(loop.run(None if args.simulate else args.output))
+    history = pd.concat(histories, ignore_index=True)
+
+    os.makedirs(os.path.dirname(args.report) or '.', exist_ok=True)
+    history.to_csv(args.report, index=False)
+    print(f"\n💾 Saved learning curve → {args.report}")
+    if "MeanF1" in history:
+        print(history.groupby("Strategy", sort=False).tail(1).to_string(index=False))
+        plot_learning_curves(history, 'figures/active_learning_curve.png')
+        print("📈 Saved figures/active_learning_curve.png")
+    else:
+        print("ℹ️ No F1 reported (pass --eval-file with labeled tickets to score the rounds)")
+    if not args.simulate:
+        print(f"💾 Labeled {len(loop.labels)} tickets with {loop.llm_calls} LLM calls → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
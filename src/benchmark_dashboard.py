@@ -0,0 +1,248 @@
+import argparse
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+import requests
+
+from synthetic_generator import SyntheticTicketGenerator
+from ticket_store import TicketStore
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENDPOINTS = ['/', '/data', '/health']
+
+
+def dataset(rows: int, workdir: str, seed: int = 42) -> str:
+    """Synthetic analyzed_tickets.csv of the given size, generated once and reused"""
+    path = os.path.join(workdir, 'data', f'tickets_{rows}.csv')
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        print(f"🧪 Generating {rows:,} synthetic tickets → {path}")
+        SyntheticTicketGenerator(seed=seed, error_rate=0.02).write_csv(rows, path + '.tmp')
+        os.replace(path + '.tmp', path)
+    return path
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def rss_mb(pid: int) -> float:
+    """Resident set size of one process from /proc (0 if it is gone)"""
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def child_pids(pid: int) -> List[int]:
+    try:
+        with open(f'/proc/{pid}/task/{pid}/children') as f:
+            return [int(p) for p in f.read().split()]
+    except OSError:
+        return []
+
+
+class RssSampler:
+    def __init__(self, master_pid: int, interval: float = 0.05):
+        """Background sampling of gunicorn worker RSS; peak values since the last reset"""
+        self.master_pid = master_pid
+        self.interval = interval
+        self.stop_event = threading.Event()
+        self.reset()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def reset(self):
+        self.peak_worker = 0.0
+        self.peak_total = 0.0
+
+    def _run(self):
+        while not self.stop_event.is_set():
+            workers = [rss_mb(pid) for pid in child_pids(self.master_pid)]
+            if workers:
+                self.peak_worker = max(self.peak_worker, max(workers))
+                self.peak_total = max(self.peak_total, sum(workers) + rss_mb(self.master_pid))
+            time.sleep(self.interval)
+
+    def stop(self):
+        self.stop_event.set()
+        self.thread.join()
+
+
+class DashboardServer:
+    def __init__(self, data_file: str, workers: int, threads: int, workdir: str,
+                 backend: str = 'csv', timeout: int = 300):
+        """app.py under gunicorn in a scratch directory holding one dataset"""
+        self.run_dir = os.path.join(workdir, 'run')
+        self.workers = workers
+        self.threads = threads
+        self.backend = backend
+        self.timeout = timeout
+        self.port = free_port()
+        self.url = f'http://127.0.0.1:{self.port}'
+        self.process = None
+
+        shutil.rmtree(self.run_dir, ignore_errors=True)
+        os.makedirs(self.run_dir)
+        os.symlink(os.path.abspath(data_file), os.path.join(self.run_dir, 'analyzed_tickets.csv'))
+
+    def start(self, ready_timeout: float = 60.0) -> 'DashboardServer':
+        env = {k: v for k, v in os.environ.items() if k != 'TICKET_DB'}
+        env['LABEL_STREAM_FILE'] = os.path.join(self.run_dir, 'labels.ndjson')
+        if self.backend == 'store':
+            env['TICKET_DB'] = os.path.join(self.run_dir, 'tickets.db')
+            with TicketStore(env['TICKET_DB']) as store:
+                store.import_csv(os.path.join(self.run_dir, 'analyzed_tickets.csv'))
+        command = [sys.executable, '-m', 'gunicorn', 'app:app', '--pythonpath', ROOT_DIR,
+                   '--chdir', self.run_dir, '--bind', f'127.0.0.1:{self.port}',
+                   '--workers', str(self.workers), '--threads', str(self.threads),
+                   '--timeout', str(self.timeout), '--log-level', 'warning']
+        self.log = open(os.path.join(self.run_dir, 'gunicorn.log'), 'w')
+        self.process = subprocess.Popen(command, stdout=self.log, stderr=subprocess.STDOUT, env=env)
+
+        deadline = time.time() + ready_timeout
+        while time.time() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"gunicorn exited with code {self.process.returncode} "
+                                   f"(see {self.log.name})")
+            try:
+                if requests.get(f'{self.url}/health', timeout=1).status_code == 200:
+                    return self
+            except requests.RequestException:
+                time.sleep(0.2)
+        self.stop()
+        raise RuntimeError(f"gunicorn did not become ready within {ready_timeout:.0f}s")
+
+    def stop(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.send_signal(signal.SIGTERM)
+            try:
+                self.process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        self.log.close()
+
+
+def drive(url: str, concurrency: int, duration: float, request_timeout: float) -> Dict:
+    """Closed-loop load: each client sends its next request as soon as the last one returns"""
+    deadline = time.perf_counter() + duration
+
+    def client(_):
+        latencies, errors = [], 0
+        with requests.Session() as session:  # Keep-alive, like a browser
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    ok = session.get(url, timeout=request_timeout).status_code == 200
+                except requests.RequestException:
+                    ok = False
+                if ok:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors += 1
+        return latencies, errors
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(client, range(concurrency)))
+    wall = time.perf_counter() - start
+
+    latencies = np.concatenate([np.array(r[0]) for r in results]) * 1000
+    errors = sum(r[1] for r in results)
+    stats = {'Requests': len(latencies) + errors, 'Errors': errors,
+             'RPS': round(len(latencies) / wall, 2), 'WallS': round(wall, 2)}
+    for p in (50, 95, 99):
+        stats[f'P{p}Ms'] = round(float(np.percentile(latencies, p)), 1) if len(latencies) else None
+    return stats
+
+
+def run_configuration(data_file: str, rows: int, workers: int, threads: int, args) -> List[Dict]:
+    """One dataset size x gunicorn configuration, every endpoint at every concurrency level"""
+    server = DashboardServer(data_file, workers, threads, args.workdir, args.backend, args.worker_timeout)
+    server.start()
+    sampler = RssSampler(server.process.pid)
+    results = []
+    try:
+        # First dashboard request in a worker pays the label aggregation
+        start = time.perf_counter()
+        requests.get(server.url + '/', timeout=args.worker_timeout)
+        cold_ms = (time.perf_counter() - start) * 1000
+        drive(server.url + '/', workers, args.warmup, args.worker_timeout)  # Warm every worker
+        base = {'Backend': args.backend, 'Rows': rows, 'Workers': workers, 'Threads': threads,
+                'ColdStartMs': round(cold_ms, 1)}
+
+        for endpoint in args.endpoints.split(','):
+            for concurrency in [int(c) for c in args.concurrency.split(',')]:
+                sampler.reset()
+                stats = drive(server.url + endpoint, concurrency, args.duration, args.worker_timeout)
+                row = dict(base, Endpoint=endpoint, Concurrency=concurrency, **stats,
+                           PeakWorkerRssMB=round(sampler.peak_worker, 1),
+                           PeakTotalRssMB=round(sampler.peak_total, 1))
+                print(f"   {endpoint:<8} x{concurrency:<3} {row['RPS']:>8.1f} req/s  "
+                      f"p50 {row['P50Ms']} ms  p99 {row['P99Ms']} ms  "
+                      f"errors {row['Errors']}  worker RSS {row['PeakWorkerRssMB']} MB")
+                results.append(row)
+    finally:
+        sampler.stop()
+        server.stop()
+    return results
+
+
+def main():
+    """Load-test app.py under gunicorn across dataset sizes and worker/thread configurations"""
+    parser = argparse.ArgumentParser(description="Dashboard load and scaling benchmark")
+    parser.add_argument('--rows', default='1000,100000,1000000',
+                        help="Comma-separated dataset sizes")
+    parser.add_argument('--configs', default='1x8,2x4,4x2',
+                        help="Comma-separated gunicorn WORKERSxTHREADS configurations")
+    parser.add_argument('--endpoints', default=','.join(ENDPOINTS))
+    parser.add_argument('--concurrency', default='1,8,32')
+    parser.add_argument('--duration', type=float, default=10.0, help="Seconds per load level")
+    parser.add_argument('--warmup', type=float, default=3.0)
+    parser.add_argument('--backend', choices=['csv', 'store'], default='csv',
+                        help="Serve from the CSV file or from the SQLite ticket store (TICKET_DB)")
+    parser.add_argument('--worker-timeout', type=int, default=300)
+    parser.add_argument('--workdir', default='.cache/dashboard_benchmark')
+    parser.add_argument('--output', default='reports/benchmarks/dashboard_load.csv')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("⏱️  Dashboard Load Benchmark (gunicorn)")
+    print(f"🧪 Backend: {args.backend} | Configs: {args.configs} | Concurrency: {args.concurrency} "
+          f"| {args.duration:.0f}s per level")
+    print("=" * 60)
+
+    rows = []
+    for size in [int(r) for r in args.rows.split(',')]:
+        data_file = dataset(size, args.workdir)
+        for config in args.configs.split(','):
+            workers, threads = (int(n) for n in config.lower().split('x'))
+            print(f"🚀 {size:,} rows | {workers} workers x {threads} threads")
+            rows.extend(run_configuration(data_file, size, workers, threads, args))
+
+    results = pd.DataFrame(rows)
+    print("\n📊 Results:")
+    print(results.to_string(index=False))
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    results.to_csv(args.output, index=False)
+    print(f"💾 Saved benchmark results → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
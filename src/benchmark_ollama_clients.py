@@ -0,0 +1,133 @@
+import argparse
+import importlib
+import json
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import requests
+
+from mock_ollama import MockOllamaConfig, MockOllamaServer
+
+SAMPLE_TICKET = ("I was charged twice for my CloudSync Pro subscription this month "
+                 "(invoice INV-20931). Please refund the duplicate payment.")
+
+
+class ClientBenchmark:
+    def __init__(self, base_url: str, request_timeout: float = 10.0):
+        """Drive the pipeline's Ollama clients against a server and time them"""
+        self.base_url = base_url
+        os.environ['OLLAMA_HOST'] = base_url
+        generate_module = importlib.import_module('01_generate_data')
+        analyze_module = importlib.import_module('02_analyze_data')
+
+        self.generator = generate_module.DataGenerator()
+        self.analyzer = analyze_module.TicketAnalyzer(dedup=False)
+        self.generator.request_timeout = request_timeout
+        self.analyzer.request_timeout = request_timeout
+
+    def _generate(self):
+        ticket, _ = self.generator.generate_single_ticket()
+        return ticket is not None
+
+    def _analyze(self):
+        analysis = self.analyzer.analyze_ticket(SAMPLE_TICKET)
+        return analysis['sentiment'] != 'Error'
+
+    def _stream(self):
+        """Raw streaming /api/generate call, read to the final chunk"""
+        payload = {"model": self.analyzer.model_name, "prompt": SAMPLE_TICKET, "stream": True}
+        with requests.post(f"{self.base_url}/api/generate", json=payload, stream=True,
+                           timeout=self.analyzer.request_timeout) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if line and json.loads(line).get('done'):
+                    return True
+        return False
+
+    def run_mode(self, mode: str, num_requests: int, concurrency: int) -> dict:
+        """Run one client mode and return throughput / latency stats"""
+        call = {'generate': self._generate, 'analyze': self._analyze, 'stream': self._stream}[mode]
+
+        def timed(_):
+            start = time.perf_counter()
+            try:
+                ok = call()
+            except Exception:
+                ok = False
+            return time.perf_counter() - start, ok
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(timed, range(num_requests)))
+        wall = time.perf_counter() - start
+
+        latencies = np.array([r[0] for r in results])
+        successes = sum(r[1] for r in results)
+        return {
+            'mode': mode,
+            'concurrency': concurrency,
+            'requests': num_requests,
+            'success_rate': round(successes / num_requests, 4),
+            'tickets_per_sec': round(successes / wall, 3),
+            'p50_ms': round(np.percentile(latencies, 50) * 1000, 1),
+            'p95_ms': round(np.percentile(latencies, 95) * 1000, 1),
+            'p99_ms': round(np.percentile(latencies, 99) * 1000, 1),
+            'max_ms': round(latencies.max() * 1000, 1),
+            'wall_s': round(wall, 3)
+        }
+
+
+def main():
+    """Benchmark the Ollama clients against the bundled mock server"""
+    parser = argparse.ArgumentParser(description="Offline throughput benchmark for the LLM clients")
+    parser.add_argument('--modes', default='generate,analyze,stream')
+    parser.add_argument('--concurrency', default='1,4')
+    parser.add_argument('--requests', type=int, default=50)
+    parser.add_argument('--latency', default='lognormal:-3.0,0.5')
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--timeout-rate', type=float, default=0.0)
+    parser.add_argument('--malformed-rate', type=float, default=0.0)
+    parser.add_argument('--max-concurrency', type=int, default=4)
+    parser.add_argument('--request-timeout', type=float, default=2.0)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='reports/benchmarks/ollama_clients.csv')
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    config = MockOllamaConfig(latency=args.latency, error_rate=args.error_rate,
+                              timeout_rate=args.timeout_rate,
+                              hang_seconds=args.request_timeout * 2,
+                              malformed_rate=args.malformed_rate,
+                              max_concurrency=args.max_concurrency, seed=args.seed)
+    server = MockOllamaServer(config, port=0).start()
+    print("=" * 60)
+    print("⏱️  Ollama Client Benchmark (mock server)")
+    print(f"🧪 {server.url} | Latency: {config.latency} | Parallel slots: {config.max_concurrency}")
+    print("=" * 60)
+
+    try:
+        bench = ClientBenchmark(server.url, request_timeout=args.request_timeout)
+        rows = []
+        for mode in args.modes.split(','):
+            for concurrency in [int(c) for c in args.concurrency.split(',')]:
+                print(f"🚀 {mode} x{concurrency} ({args.requests} requests)...")
+                rows.append(bench.run_mode(mode, args.requests, concurrency))
+    finally:
+        server.stop()
+
+    results = pd.DataFrame(rows)
+    print("\n📊 Results:")
+    print(results.to_string(index=False))
+    print(f"\n🧪 Server stats: {server.stats}")
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    results.to_csv(args.output, index=False)
+    print(f"💾 Saved benchmark results → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+import zipfile
+from typing import Dict, List
+
+import numpy as np
+
+# Must match TfidfVectorizer defaults used by the training stage
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+FORMAT_VERSION = 1
+
+
+def export_linear_pipeline(pipeline, path: str) -> str:
+    """Export a fitted TF-IDF + linear classifier pipeline to a compact .npz"""
+    vectorizer, clf = pipeline.steps[0][1], pipeline.steps[-1][1]
+    classes = np.asarray(clf.classes_)
+    clf = getattr(clf, 'estimator', clf)  # LabelDecodedClassifier: export the fitted model inside
+    if not hasattr(vectorizer, 'vocabulary_') or not hasattr(vectorizer, 'idf_'):
+        raise ValueError("Only vocabulary-based TF-IDF pipelines can be exported")
+    if not hasattr(clf, 'coef_') or not hasattr(clf, 'intercept_'):
+        raise ValueError(f"{type(clf).__name__} is not a linear model")
+    if vectorizer.ngram_range != (1, 1) or not vectorizer.lowercase or vectorizer.strip_accents:
+        raise ValueError("Only lowercase unigram TF-IDF without accent stripping is supported")
+
+    # Sorted UTF-8 vocabulary: lookup becomes np.searchsorted, no Python dict to unpickle
+    encoded = sorted((term.encode('utf-8'), column) for term, column in vectorizer.vocabulary_.items())
+    terms = np.array([term for term, _ in encoded], dtype=bytes)
+    columns = np.array([column for _, column in encoded])
+    label_classes = getattr(pipeline, 'label_classes_', None)  # Artifacts saved before the wrapper
+    if label_classes is not None:
+        classes = np.asarray(label_classes)[classes.astype(int)]
+
+    meta = {"format_version": FORMAT_VERSION, "model": type(clf).__name__,
+            "norm": vectorizer.norm, "sublinear_tf": bool(vectorizer.sublinear_tf)}
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    # Uncompressed so every member can be memory-mapped in place
+    np.savez(path,
+             terms=terms,
+             idf=vectorizer.idf_[columns].astype(np.float64),
+             coef=np.ascontiguousarray(clf.coef_[:, columns].T, dtype=np.float64),
+             intercept=np.asarray(clf.intercept_, dtype=np.float64),
+             classes=classes.astype(str),
+             meta=np.array(json.dumps(meta)))
+    return path
+
+
+def _mmap_npz(path: str) -> Dict[str, np.ndarray]:
+    """Memory-map each member of an uncompressed .npz instead of reading it"""
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, 'rb') as raw:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                return dict(np.load(path))
+            # Local file header: 30 fixed bytes + name + extra field
+            raw.seek(info.header_offset + 26)
+            name_len, extra_len = np.frombuffer(raw.read(4), dtype='<u2')
+            raw.seek(info.header_offset + 30 + int(name_len) + int(extra_len))
+            version = np.lib.format.read_magic(raw)
+            if version == (1, 0):
+                shape, fortran, dtype = np.lib.format.read_array_header_1_0(raw)
+            else:
+                shape, fortran, dtype = np.lib.format.read_array_header_2_0(raw)
+            name = info.filename[:-4]
+            if dtype.hasobject or 0 in shape:
+                arrays[name] = np.lib.format.read_array(raw)
+            else:
+                arrays[name] = np.memmap(path, dtype=dtype, mode='r', offset=raw.tell(),
+                                         shape=shape, order='F' if fortran else 'C')
+    return arrays
+
+
+class CompactLinearModel:
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        """Pure-NumPy TF-IDF + linear classifier predictor"""
+        self.terms = arrays['terms']
+        self.idf = arrays['idf']
+        self.coef = arrays['coef']  # (n_features, n_classes)
+        self.intercept = arrays['intercept']
+        self.classes = arrays['classes']
+        self.meta = json.loads(str(arrays['meta']))
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> 'CompactLinearModel':
+        """Load an exported model, memory-mapped by default"""
+        return cls(_mmap_npz(path) if mmap else dict(np.load(path)))
+
+    def _features(self, text: str):
+        """Column indices and L2-normalized TF-IDF weights for one document"""
+        tokens = [token.encode('utf-8') for token in TOKEN_PATTERN.findall(str(text).lower())]
+        if not tokens:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float64)
+        tokens = np.array(tokens, dtype=bytes)
+        idx = np.searchsorted(self.terms, tokens)
+        idx[idx >= len(self.terms)] = 0
+        idx = idx[self.terms[idx] == tokens]
+        columns, counts = np.unique(idx, return_counts=True)
+        tf = np.log(counts) + 1 if self.meta['sublinear_tf'] else counts
+        weights = tf * self.idf[columns]
+        if self.meta['norm'] == 'l2':
+            norm = np.sqrt(np.dot(weights, weights))
+            weights = weights / norm if norm > 0 else weights
+        elif self.meta['norm'] == 'l1':
+            total = np.abs(weights).sum()
+            weights = weights / total if total > 0 else weights
+        return columns, weights
+
+    def decision_function(self, texts: List[str]) -> np.ndarray:
+        """Linear scores per class (n_texts, n_classes) - or (n_texts,) for binary"""
+        scores = np.empty((len(texts), self.coef.shape[1]), dtype=np.float64)
+        for row, text in enumerate(texts):
+            columns, weights = self._features(text)
+            scores[row] = weights @ self.coef[columns] + self.intercept
+        return scores[:, 0] if self.coef.shape[1] == 1 else scores
+
+    def predict(self, texts: List[str]) -> np.ndarray:
+        """Predicted label names"""
+        scores = self.decision_function(texts)
+        if scores.ndim == 1:
+            return self.classes[(scores > 0).astype(int)]
+        return self.classes[scores.argmax(axis=1)]
+
+
+def _cold_load_seconds(code: str) -> float:
+    """Time imports + load in a fresh interpreter, as a new web worker would"""
+    script = f"import time; _t = time.perf_counter(); {code}; print(time.perf_counter() - _t)"
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True,
+                            check=True, env=env)
+    return float(output.stdout.strip().splitlines()[-1])
+
+
+def _latency_ms(predict, texts: List[str], batch_size: int) -> float:
+    start = time.perf_counter()
+    for i in range(0, len(texts), batch_size):
+        predict(texts[i:i + batch_size])
+    return (time.perf_counter() - start) * 1000 / len(texts)
+
+
+def main():
+    """Export linear *_best.joblib winners and compare against the pickles"""
+    import joblib
+    import pandas as pd
+
+    parser = argparse.ArgumentParser(description="Export linear models to a compact NumPy format")
+    parser.add_argument('--models-dir', default='Models')
+    parser.add_argument('--input', default='analyzed_tickets.csv')
+    parser.add_argument('--num-texts', type=int, default=1000)
+    parser.add_argument('--output', default='reports/benchmarks/compact_models.csv')
+    args = parser.parse_args()
+
+    texts = pd.read_csv(args.input, usecols=['ticket_text'], nrows=args.num_texts)['ticket_text']
+    texts = texts.fillna('').astype(str).tolist()
+
+    rows = []
+    for task in ["sentiment", "urgency", "category"]:
+        joblib_path = os.path.join(args.models_dir, f"{task}_best.joblib")
+        if not os.path.exists(joblib_path):
+            continue
+        pipeline = joblib.load(joblib_path)
+        npz_path = joblib_path.replace('.joblib', '.npz')
+        try:
+            export_linear_pipeline(pipeline, npz_path)
+        except ValueError as e:
+            print(f"⚠️ Skipping {task}: {e}")
+            continue
+
+        compact = CompactLinearModel.load(npz_path)
+        expected = np.asarray(pipeline.predict(texts))
+        label_classes = getattr(pipeline, 'label_classes_', None)
+        if label_classes is not None:
+            expected = np.asarray(label_classes)[expected.astype(int)]
+        matches = np.mean(compact.predict(texts) == expected.astype(str))
+        print(f"✅ Exported {task} ({compact.meta['model']}) → {npz_path} "
+              f"(prediction agreement {matches:.2%})")
+
+        for fmt, path, load_code, predict in [
+            ('joblib', joblib_path, f"import joblib; joblib.load({joblib_path!r})", pipeline.predict),
+            ('npz', npz_path,
+             f"from compact_model import CompactLinearModel; CompactLinearModel.load({npz_path!r})",
+             compact.predict),
+        ]:
+            rows.append({
+                'task': task,
+                'format': fmt,
+                'size_kb': round(os.path.getsize(path) / 1024, 1),
+                'cold_load_ms': round(_cold_load_seconds(load_code) * 1000, 1),
+                'single_ms': round(_latency_ms(predict, texts[:200], 1), 4),
+                'batch64_per_ticket_ms': round(_latency_ms(predict, texts, 64), 4),
+                'agreement': round(matches, 4)
+            })
+
+    if not rows:
+        print("❌ No linear models to export")
+        return
+
+    results = pd.DataFrame(rows)
+    print("\n📊 Compact format vs joblib pickle:")
+    print(results.to_string(index=False))
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    results.to_csv(args.output, index=False)
+    print(f"💾 Saved comparison → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
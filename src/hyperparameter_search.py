@@ -0,0 +1,207 @@
+import itertools
+import json
+import math
+import os
+import time
+import warnings
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from scipy import sparse
+from sklearn.base import clone
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics import f1_score
+from sklearn.model_selection import StratifiedGroupKFold
+from sklearn.preprocessing import LabelEncoder
+
+# Sampled per configuration; lists are choices, tuples are log-uniform (low, high) ranges
+SEARCH_SPACES = {
+    "LogReg": {"C": (1e-2, 1e2)},
+    "LinearSVC": {"C": (1e-3, 1e1)},
+    "NaiveBayes": {"alpha": (1e-3, 1.0)},
+    "RandomForest": {"n_estimators": [100, 200, 400], "max_depth": [None, 20, 50],
+                     "min_samples_leaf": [1, 2, 4], "max_features": ["sqrt", "log2"]},
+    "XGBoost": {"learning_rate": (0.03, 0.3), "max_depth": [3, 6, 9], "n_estimators": [100, 200, 400],
+                "subsample": [0.7, 0.85, 1.0]},
+    "CatBoost": {"learning_rate": (0.03, 0.3), "depth": [4, 6, 8], "iterations": [200, 500]},
+}
+
+
+def sample_config(space: Dict[str, object], rng: np.random.RandomState) -> Dict[str, object]:
+    """Draw one configuration from a search space"""
+    config = {}
+    for name, values in space.items():
+        if isinstance(values, tuple):
+            low, high = np.log(values[0]), np.log(values[1])
+            config[name] = float(np.exp(rng.uniform(low, high)))
+        else:
+            config[name] = values[rng.randint(len(values))]
+    return config
+
+
+def _fit_before(estimator, X, y, deadline: float, step: int = 50) -> bool:
+    """Fit, growing tree ensembles in steps so a slow configuration stops at the deadline"""
+    params = estimator.get_params()
+    if "warm_start" in params and isinstance(params.get("n_estimators"), int):
+        total = params["n_estimators"]
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)  # class_weight + warm_start advisory
+            for n in range(min(step, total), total + step, step):
+                if time.time() > deadline:
+                    return False
+                estimator.set_params(n_estimators=min(n, total), warm_start=True).fit(X, y)
+        return True
+    estimator.fit(X, y)
+    return time.time() <= deadline
+
+
+def _run_trial(model, params: Dict[str, object], fold_dirs: List[str], fraction: float,
+               deadline: float, seed: int) -> Optional[float]:
+    """Mean weighted F1 over the cached folds using a fraction of each fold's training rows
+
+    None if the budget ran out before every fold was scored.
+    """
+    scores = []
+    for fold_dir in fold_dirs:
+        if time.time() > deadline:
+            return None
+        X_train = sparse.load_npz(os.path.join(fold_dir, 'X_train.npz'))
+        y_train = np.load(os.path.join(fold_dir, 'y_train.npy'))
+        X_valid = sparse.load_npz(os.path.join(fold_dir, 'X_valid.npz'))
+        y_valid = np.load(os.path.join(fold_dir, 'y_valid.npy'))
+
+        if fraction < 1.0:
+            rng = np.random.RandomState(seed)
+            rows = rng.choice(X_train.shape[0], max(10, int(X_train.shape[0] * fraction)), replace=False)
+            X_train, y_train = X_train[rows], y_train[rows]
+        if len(np.unique(y_train)) < 2:
+            return None
+
+        estimator = clone(model).set_params(**params)
+        try:
+            if not _fit_before(estimator, X_train, y_train, deadline):
+                return None
+        except ValueError:
+            # e.g. XGBoost needs every class present in the subsample
+            return None
+        y_pred = np.asarray(estimator.predict(X_valid)).ravel().astype(int)
+        scores.append(f1_score(y_valid, y_pred, average="weighted"))
+    return float(np.mean(scores))
+
+
+class HyperbandSearch:
+    def __init__(self, candidates: Dict[str, object], vectorizer_params: Dict[str, object],
+                 cache_dir: str = '.cache/features', n_folds: int = 3, eta: int = 3,
+                 min_fraction: float = 1 / 9, budget_seconds: float = 600, n_jobs: int = -1,
+                 random_state: int = 42):
+        """Hyperband over model configurations with per-fold features cached and reused"""
+        self.candidates = candidates
+        self.vectorizer_params = vectorizer_params
+        self.cache_dir = cache_dir
+        self.n_folds = n_folds
+        self.eta = eta
+        self.min_fraction = min_fraction
+        self.budget_seconds = budget_seconds
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+
+    def cached_folds(self, texts: pd.Series, labels: pd.Series, groups: np.ndarray, key: str) -> List[str]:
+        """Vectorize each CV fold once; every trial reuses the matrices from disk"""
+        y = LabelEncoder().fit_transform(labels)
+        splitter = StratifiedGroupKFold(n_splits=self.n_folds, shuffle=True, random_state=self.random_state)
+        fold_dirs = []
+        for fold, (train_idx, valid_idx) in enumerate(splitter.split(texts, y, groups)):
+            fold_dir = os.path.join(self.cache_dir, f"cv_{key}", f"fold{fold}")
+            fold_dirs.append(fold_dir)
+            if os.path.exists(os.path.join(fold_dir, 'y_valid.npy')):
+                continue
+            vectorizer = TfidfVectorizer(**self.vectorizer_params)
+            os.makedirs(fold_dir, exist_ok=True)
+            sparse.save_npz(os.path.join(fold_dir, 'X_train.npz'),
+                            vectorizer.fit_transform(texts.iloc[train_idx]))
+            sparse.save_npz(os.path.join(fold_dir, 'X_valid.npz'),
+                            vectorizer.transform(texts.iloc[valid_idx]))
+            np.save(os.path.join(fold_dir, 'y_train.npy'), y[train_idx])
+            # Written last: marks the fold as complete
+            np.save(os.path.join(fold_dir, 'y_valid.npy'), y[valid_idx])
+        return fold_dirs
+
+    def _run_rung(self, parallel, trials: List[Dict], task_name: str, configs, fold_dirs: List[str],
+                  fraction: float, deadline: float, bracket: int) -> List:
+        """Score configs in parallel and record the finished ones as trials"""
+        scores = parallel(
+            delayed(_run_trial)(self.candidates[name], params, fold_dirs, fraction,
+                                deadline, self.random_state)
+            for name, params in configs
+        )
+        finished = [(c, s) for c, s in zip(configs, scores) if s is not None]
+        for (name, params), score in finished:
+            trials.append({"Task": task_name, "Model": name, "Bracket": bracket,
+                                "Fraction": round(fraction, 4), "F1": round(score, 4),
+                                "Params": json.dumps(params, default=str)})
+        return finished
+
+    def search(self, task_name: str, fold_dirs: List[str]) -> pd.DataFrame:
+        """Run Hyperband brackets for every candidate until the budget runs out
+
+        Every candidate is first scored with its default parameters on all the data
+        (bracket -1): best_params only reports configurations that beat it.
+        """
+        deadline = time.time() + self.budget_seconds
+        rng = np.random.RandomState(self.random_state)
+        s_max = int(round(math.log(1 / self.min_fraction, self.eta)))
+        trials = []
+
+        with Parallel(n_jobs=self.n_jobs) as parallel:
+            baseline = self._run_rung(parallel, trials, task_name, [(name, {}) for name in self.candidates],
+                                      fold_dirs, 1.0, deadline, -1)
+            print(f"   📏 {task_name} defaults: " + ", ".join(f"{name} {score:.3f}"
+                                                         for (name, _), score in baseline))
+            for bracket in range(s_max, -1, -1):
+                n_configs = int(math.ceil((s_max + 1) / (bracket + 1) * self.eta ** bracket))
+                # Interleaved by model, so a budget cut-off mid-rung costs every model alike
+                configs = [(name, sample_config(SEARCH_SPACES.get(name, {}), rng))
+                           for _ in range(n_configs) for name in self.candidates]
+
+                for rung in range(bracket + 1):
+                    if time.time() > deadline or not configs:
+                        break
+                    fraction = self.eta ** (rung - bracket)
+                    finished = self._run_rung(parallel, trials, task_name, configs, fold_dirs, fraction,
+                                              deadline, bracket)
+                    print(f"   🎯 {task_name} bracket {bracket} rung {rung}: {len(finished)} trials "
+                          f"at {fraction:.0%} data, best F1 "
+                          f"{max((s for _, s in finished), default=float('nan')):.3f}")
+
+                    # Keep the top 1/eta per model so every candidate gets a fair race
+                    survivors = {}
+                    for name in self.candidates:
+                        ranked = sorted((s, i) for i, ((n, _), s) in enumerate(finished) if n == name)
+                        keep = max(1, len(ranked) // self.eta) if ranked else 0
+                        survivors[name] = [finished[i][0] for _, i in ranked[::-1][:keep]]
+                    configs = [config for group in itertools.zip_longest(*survivors.values())
+                               for config in group if config is not None]
+                if time.time() > deadline:
+                    print(f"   ⏰ Budget of {self.budget_seconds:.0f}s used up")
+                    break
+        return pd.DataFrame(trials)
+
+    @staticmethod
+    def best_params(trials: pd.DataFrame) -> Dict[str, Dict[str, Dict[str, object]]]:
+        """Best full-data configuration per task and model, only where it beats the defaults
+
+        Scores on a data slice are not comparable with the defaults, so they never count.
+        """
+        best = {}
+        full = trials[trials["Fraction"] >= 1.0]
+        for (task, model), rows in full.groupby(["Task", "Model"]):
+            default = rows.loc[rows["Bracket"] == -1, "F1"]
+            tuned = rows[rows["Bracket"] >= 0]
+            if default.empty or tuned.empty:
+                continue
+            top = tuned.sort_values("F1", ascending=False).iloc[0]
+            if top["F1"] > default.iloc[0]:
+                best.setdefault(task, {})[model] = json.loads(top["Params"])
+        return best
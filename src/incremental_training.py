@@ -0,0 +1,303 @@
+import copy
+import io
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.metrics import f1_score
+
+from multitask_model import MultiTaskTicketClassifier
+from streaming_training import StreamingTrainer, TASK_LABELS, is_holdout
+from ticket_aggregates import complete_records, tail_digest
+
+HASH_COLUMNS = ["ticket_text", "sentiment", "urgency", "category"]
+
+
+def row_hashes(df: pd.DataFrame) -> np.ndarray:
+    """Content hash per row: relabeled tickets count as new rows"""
+    return pd.util.hash_pandas_object(df[HASH_COLUMNS].astype(str), index=False).values
+
+
+def is_seen(hashes: np.ndarray, seen: np.ndarray) -> np.ndarray:
+    """Membership in a sorted, unique hash array by binary search"""
+    if not len(seen):
+        return np.zeros(len(hashes), dtype=bool)
+    positions = np.minimum(np.searchsorted(seen, hashes), len(seen) - 1)
+    return seen[positions] == hashes
+
+
+def bottom_k(sample: Optional[pd.DataFrame], part: pd.DataFrame, k: int) -> pd.DataFrame:
+    """Keep the k rows with the smallest sort keys: a uniform sample of everything offered"""
+    merged = part if sample is None else pd.concat([sample, part], ignore_index=True)
+    return merged.nsmallest(k, "_key") if len(merged) > k else merged
+
+
+class ModelRegistry:
+    def __init__(self, root: str = 'Models/versions'):
+        """Versioned multi-task artifacts with the row hashes each was trained on"""
+        self.root = root
+        self.latest_file = os.path.join(root, 'LATEST')
+
+    def latest_version(self) -> Optional[str]:
+        if not os.path.exists(self.latest_file):
+            return None
+        with open(self.latest_file) as f:
+            return f.read().strip() or None
+
+    def load(self, version: str):
+        """Return (model, manifest, seen_hashes) for a version"""
+        version_dir = os.path.join(self.root, version)
+        with open(os.path.join(version_dir, 'manifest.json')) as f:
+            manifest = json.load(f)
+        model = joblib.load(os.path.join(version_dir, 'multitask.joblib'))
+        seen = np.load(os.path.join(version_dir, 'seen_hashes.npy'))
+        return model, manifest, seen
+
+    def load_validation(self, version: str) -> Optional[pd.DataFrame]:
+        """The version's validation reservoir (holdout rows with their sample keys), if it has one"""
+        path = os.path.join(self.root, version, 'validation.csv')
+        return pd.read_csv(path) if os.path.exists(path) else None
+
+    def publish(self, model: MultiTaskTicketClassifier, seen: np.ndarray, manifest: Dict,
+                validation: Optional[pd.DataFrame] = None) -> str:
+        """Write a new version and move the LATEST pointer to it
+
+        rows_seen is always the number of distinct rows (training and holdout) in seen.
+        """
+        previous = self.latest_version()
+        number = int(previous[1:]) + 1 if previous else 1
+        version = f"v{number:04d}"
+        version_dir = os.path.join(self.root, version)
+        os.makedirs(version_dir, exist_ok=True)
+
+        seen = np.unique(seen)
+        joblib.dump(model, os.path.join(version_dir, 'multitask.joblib'))
+        np.save(os.path.join(version_dir, 'seen_hashes.npy'), seen)
+        if validation is not None:
+            validation.to_csv(os.path.join(version_dir, 'validation.csv'), index=False)
+        manifest = dict(manifest, version=version, parent=previous, rows_seen=int(len(seen)),
+                        created=datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        with open(os.path.join(version_dir, 'manifest.json'), 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+        # Pointer is updated last so readers never see a half-written version
+        tmp = self.latest_file + '.tmp'
+        with open(tmp, 'w') as f:
+            f.write(version)
+        os.replace(tmp, self.latest_file)
+        return version
+
+
+class IncrementalRetrainer(StreamingTrainer):
+    def __init__(self, input_file: str = 'analyzed_tickets.csv', models_dir: str = 'Models',
+                 chunk_size: int = 50_000, holdout_pct: int = 20, validation_rows: int = 20_000,
+                 tolerance: float = 0.005, epochs: int = 3, random_state: int = 42,
+                 full_scan: bool = False):
+        """Update the latest model with only the rows added since it was trained"""
+        super().__init__(input_file=input_file, models_dir=models_dir, chunk_size=chunk_size,
+                         holdout_pct=holdout_pct, epochs=epochs, random_state=random_state)
+        self.registry = ModelRegistry(os.path.join(models_dir, 'versions'))
+        self.validation_rows = validation_rows
+        self.tolerance = tolerance
+        self.full_scan = full_scan
+
+    def source_state(self) -> Dict:
+        """Where the corpus currently ends: the next update reads only what comes after"""
+        header = pd.read_csv(self.input_file, nrows=0).columns.tolist()
+        with open(self.input_file, 'rb') as f:
+            offset = f.seek(0, os.SEEK_END)
+            return {"path": os.path.abspath(self.input_file), "header": header,
+                    "offset": offset, "tail_sha256": tail_digest(f, offset)}
+
+    def appended_chunks(self, source: Optional[Dict]):
+        """(chunks of the complete rows appended since source, advanced source), or (None, None)
+        when the file was rewritten rather than appended to"""
+        if source is None or source["path"] != os.path.abspath(self.input_file):
+            return None, None
+        header = pd.read_csv(self.input_file, nrows=0).columns.tolist()
+        with open(self.input_file, 'rb') as f:
+            size = f.seek(0, os.SEEK_END)
+            if header != source["header"] or size < source["offset"] \
+                    or tail_digest(f, source["offset"]) != source["tail_sha256"]:
+                return None, None
+            f.seek(source["offset"])
+            # Only complete records; a row still being written is picked up next time
+            appended = complete_records(f.read())
+            offset = source["offset"] + len(appended)
+            source = dict(source, offset=offset, tail_sha256=tail_digest(f, offset))
+        if not appended.strip():
+            return [], source
+        columns = ["ticket_id", "ticket_text"] + [col for col, _ in TASK_LABELS.values()]
+        try:
+            chunks = list(pd.read_csv(io.BytesIO(appended), header=None, names=header, usecols=columns,
+                                      chunksize=self.chunk_size,
+                                      dtype={col: 'category' for col, _ in TASK_LABELS.values()}))
+        except (ValueError, pd.errors.ParserError):
+            return None, None
+        return chunks, source
+
+    def holdout_keys(self, chunk: pd.DataFrame, holdout: np.ndarray, rng) -> pd.DataFrame:
+        """Holdout rows with a random sort key: bottom-k over the keys is a uniform sample"""
+        return chunk[holdout].assign(_key=rng.random_sample(int(holdout.sum())))
+
+    def scan(self, seen: np.ndarray, reservoir: Optional[pd.DataFrame], source: Optional[Dict],
+             full_scan: bool = False):
+        """Collect unseen rows and the validation set
+
+        Normally only the rows appended since the last version are read; the whole
+        corpus is re-read (and re-hashed) when the file was rewritten, the version
+        has no validation reservoir, or full_scan is set - e.g. to pick up tickets
+        relabeled in place. Validation is up to half new holdout rows, the rest from
+        the persisted uniform sample of older holdout rows.
+
+        Returns (new training rows, validation, next reservoir, unseen hashes, next source).
+        """
+        rng = np.random.RandomState(self.random_state + len(seen))
+        chunks = None
+        if not full_scan and reservoir is not None:
+            chunks, next_source = self.appended_chunks(source)
+        rescan = chunks is None
+        if rescan:
+            print("🔁 Corpus rewritten or no resume point - scanning every row")
+            next_source = self.source_state()
+            chunks = self.iter_chunks()
+            reservoir = None
+
+        new_parts, unseen_hashes = [], []
+        new_sample, old_sample = None, reservoir
+        for chunk in chunks:
+            chunk = chunk.dropna(subset=["ticket_text"])
+            hashes = row_hashes(chunk)
+            holdout = is_holdout(chunk["ticket_id"], self.holdout_pct)
+            unseen = ~is_seen(hashes, seen)
+            unseen_hashes.append(hashes[unseen])
+
+            if self.validation_rows > 0 and holdout.any():
+                keyed = self.holdout_keys(chunk, holdout, rng)
+                if unseen[holdout].any():
+                    new_sample = bottom_k(new_sample, keyed[unseen[holdout]], self.validation_rows)
+                if rescan and (~unseen[holdout]).any():
+                    old_sample = bottom_k(old_sample, keyed[~unseen[holdout]], self.validation_rows)
+
+            new = unseen & ~holdout
+            if new.any():
+                new_parts.append(chunk[new])
+
+        new_sample, old_sample = (sample if sample is not None else pd.DataFrame(columns=["_key"])
+                                  for sample in (new_sample, old_sample))
+        take_new = min(len(new_sample), max(self.validation_rows // 2, self.validation_rows - len(old_sample)))
+        validation_parts = [part.sort_values("_key").iloc[:count].drop(columns="_key")
+                            for part, count in ((new_sample, take_new),
+                                                (old_sample, self.validation_rows - take_new))
+                            if count > 0 and not part.empty]
+        reservoir = bottom_k(old_sample, new_sample, self.validation_rows)
+
+        new_rows = pd.concat(new_parts, ignore_index=True) if new_parts else pd.DataFrame()
+        validation = pd.concat(validation_parts, ignore_index=True) if validation_parts else pd.DataFrame()
+        hashes = np.concatenate(unseen_hashes) if unseen_hashes else np.empty(0, dtype=np.uint64)
+        return new_rows, validation, reservoir, hashes, next_source
+
+    def update(self, model: MultiTaskTicketClassifier, new_rows: pd.DataFrame) -> MultiTaskTicketClassifier:
+        """partial_fit a copy of each head on the new rows"""
+        candidate = copy.deepcopy(model)
+        for _ in range(self.epochs):
+            for start in range(0, len(new_rows), self.chunk_size):
+                batch = new_rows.iloc[start:start + self.chunk_size]
+                X = candidate.vectorizer.transform(batch["ticket_text"].astype(str))
+                for task, head in candidate.heads.items():
+                    y = self.encode_labels(batch[TASK_LABELS[task][0]], task)
+                    keep = y >= 0
+                    if keep.any():
+                        head.partial_fit(X[keep], y[keep],
+                                         classes=np.arange(len(TASK_LABELS[task][1])))
+        return candidate
+
+    def validate(self, models: Dict[str, MultiTaskTicketClassifier], validation: pd.DataFrame) -> pd.DataFrame:
+        """Weighted F1 per task for each model on the same validation rows"""
+        rows = []
+        for name, model in models.items():
+            predictions = model.predict(validation["ticket_text"].astype(str))
+            for task, (column, labels) in TASK_LABELS.items():
+                if column not in predictions:
+                    continue
+                y = self.encode_labels(validation[column], task)
+                keep = y >= 0
+                if not keep.any():
+                    continue
+                truth = np.asarray(labels, dtype=object)[y[keep]]
+                predicted = predictions[column].values[keep]
+                rows.append({"Model": name, "Task": task,
+                             "F1": round(f1_score(truth, predicted, average="weighted"), 4)})
+        return pd.DataFrame(rows)
+
+    def bootstrap(self) -> str:
+        """First version: a full streaming training run"""
+        print("🆕 No previous model version - training from scratch")
+        models = self.train()
+        results = self.evaluate(models)
+        heads, classes, metrics = {}, {}, {}
+        for task, task_results in results.groupby("Task", sort=False):
+            best = task_results.sort_values("F1", ascending=False).iloc[0]
+            heads[task] = models[task][best["Model"]]
+            classes[task] = np.array(TASK_LABELS[task][1], dtype=object)
+            metrics[task] = float(best["F1"])
+        model = MultiTaskTicketClassifier(self.vectorizer, heads, classes)
+
+        source = self.source_state()
+        rng = np.random.RandomState(self.random_state)
+        seen, reservoir = [], None
+        for chunk in self.iter_chunks():
+            chunk = chunk.dropna(subset=["ticket_text"])
+            seen.append(row_hashes(chunk))
+            holdout = is_holdout(chunk["ticket_id"], self.holdout_pct)
+            if self.validation_rows > 0 and holdout.any():
+                reservoir = bottom_k(reservoir, self.holdout_keys(chunk, holdout, rng), self.validation_rows)
+        seen = np.concatenate(seen) if seen else np.empty(0, dtype=np.uint64)
+        return self.registry.publish(model, seen, {"new_rows": int(len(seen)), "metrics": metrics,
+                                                   "source": source}, reservoir)
+
+    def run(self) -> Optional[str]:
+        """Retrain on the delta and publish only if validation F1 holds"""
+        start_time = time.time()
+        latest = self.registry.latest_version()
+        if latest is None:
+            version = self.bootstrap()
+            print(f"📦 Published {version} in {time.time() - start_time:.1f}s")
+            return version
+
+        model, manifest, seen = self.registry.load(latest)
+        print(f"📂 Latest version {latest}: {manifest['rows_seen']:,} rows seen")
+        new_rows, validation, reservoir, unseen, source = self.scan(
+            seen, self.registry.load_validation(latest), manifest.get("source"), self.full_scan)
+        print(f"🔍 Found {len(new_rows):,} new training rows ({len(validation):,} validation rows)")
+        if new_rows.empty:
+            print("✅ Model is up to date - nothing to retrain")
+            return latest
+
+        candidate = self.update(model, new_rows)
+        scores = (self.validate({"previous": model, "candidate": candidate}, validation)
+                  if not validation.empty else pd.DataFrame())
+        if scores.empty:
+            print(f"❌ No labeled validation rows to compare against - keeping {latest}")
+            return None
+        table = scores.pivot(index="Task", columns="Model", values="F1")
+        print(table.to_string())
+
+        regressed = table[table["candidate"] < table["previous"] - self.tolerance]
+        if not regressed.empty:
+            print(f"❌ F1 dropped for {', '.join(regressed.index)} - keeping {latest}")
+            return None
+
+        # New holdout rows are recorded as seen too, so they only ever count as new once
+        version = self.registry.publish(candidate, np.concatenate([seen, unseen]), {
+            "new_rows": int(len(new_rows)),
+            "metrics": table["candidate"].to_dict(),
+            "source": source
+        }, reservoir)
+        print(f"📦 Published {version} ({len(new_rows):,} new rows) in {time.time() - start_time:.1f}s")
+        return version
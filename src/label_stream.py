@@ -0,0 +1,211 @@
+import json
+import os
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from typing import Dict, Optional, Tuple
+
+STREAM_FILE = os.environ.get("LABEL_STREAM_FILE", ".cache/stream/labels.ndjson")
+LABEL_FIELDS = ["sentiment", "urgency", "category"]
+# A running analyzer writes at least one event this often, even while an LLM call is slow
+HEARTBEAT_SECONDS = 10
+# A run with no event for this long is reported as stalled (e.g. the analyzer was killed)
+STALL_SECONDS = 3 * HEARTBEAT_SECONDS
+
+
+class LabelPublisher:
+    def __init__(self, path: str = STREAM_FILE, heartbeat_seconds: float = HEARTBEAT_SECONDS):
+        """Append-only NDJSON log of labeling events, one line per ticket"""
+        self.path = path
+        self.heartbeat_seconds = heartbeat_seconds
+        self.seq = 0
+        self.file = None
+        self.lock = threading.RLock()  # the heartbeat thread writes too
+        self.stopped = threading.Event()
+        self.heartbeat = None
+
+    def start_run(self, total: int, resumed: int = 0):
+        """Begin a new run; the previous run's log is replaced so the file stays bounded"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        # Replaced (new inode) rather than truncated, so followers can tell runs apart
+        tmp = self.path + '.tmp'
+        with self.lock:
+            self.file = open(tmp, 'w', encoding='utf-8')
+            self._write({"event": "run_started", "run_id": uuid.uuid4().hex, "total": total, "resumed": resumed})
+            self.file.close()
+            os.replace(tmp, self.path)
+            self.file = open(self.path, 'a', encoding='utf-8')
+        # Liveness: followers mark the run stalled once these stop (the process died)
+        self.stopped.clear()
+        if self.heartbeat is None:
+            self.heartbeat = threading.Thread(target=self._beat, name="label-heartbeat", daemon=True)
+            self.heartbeat.start()
+
+    def publish(self, ticket_id, analysis: Dict, duplicate: bool = False):
+        """One labeled ticket"""
+        if hasattr(ticket_id, 'item'):
+            ticket_id = ticket_id.item()  # NumPy scalar from a DataFrame row
+        event = {"event": "labeled", "ticket_id": ticket_id, "duplicate": bool(duplicate)}
+        event.update({field: analysis.get(field) for field in LABEL_FIELDS})
+        self._write(event)
+
+    def finish_run(self, status: str = "completed"):
+        self.stopped.set()
+        if self.heartbeat is not None:
+            self.heartbeat.join()
+            self.heartbeat = None
+        with self.lock:
+            if self.file is not None:
+                self._write({"event": "run_finished", "status": status})
+                self.file.close()
+                self.file = None
+
+    def _beat(self):
+        while not self.stopped.wait(self.heartbeat_seconds):
+            self._write({"event": "heartbeat"})
+
+    def _write(self, event: Dict):
+        with self.lock:
+            if self.file is None:
+                return
+            self.seq += 1
+            event.update(seq=self.seq, ts=time.time())
+            # One write + flush per line: readers never see half an event
+            self.file.write(json.dumps(event, default=str) + "\n")
+            self.file.flush()
+
+
+class RollingAggregates:
+    def __init__(self, window_seconds: int = 60, latest: int = 5, stall_seconds: float = STALL_SECONDS):
+        """Live counts for the current run, folded in one event at a time"""
+        self.window_seconds = window_seconds
+        self.latest_size = latest
+        self.stall_seconds = stall_seconds
+        self.reset()
+
+    def reset(self, total: int = 0, resumed: int = 0, run_id: str = None):
+        self.run_id = run_id
+        self.counts = {field: Counter() for field in LABEL_FIELDS}
+        self.labeled = 0
+        self.duplicates = 0
+        self.total = total
+        self.resumed = resumed
+        self.status = "running" if total else "idle"
+        self.last_event = time.time()
+        self.recent = deque()
+        self.latest = deque(maxlen=self.latest_size)
+
+    def apply(self, event: Dict) -> bool:
+        """Fold in one event; False for heartbeats, which only prove the analyzer is alive"""
+        kind = event.get("event")
+        if kind == "run_started":
+            self.reset(event.get("total", 0), event.get("resumed", 0), event.get("run_id"))
+        elif kind == "run_finished":
+            self.status = event.get("status", "completed")
+        elif kind == "labeled":
+            self.labeled += 1
+            self.duplicates += bool(event.get("duplicate"))
+            for field in LABEL_FIELDS:
+                self.counts[field][str(event.get(field))] += 1
+            self.recent.append(event.get("ts", time.time()))
+            self.latest.append({k: event.get(k) for k in ["ticket_id"] + LABEL_FIELDS})
+        self.last_event = event.get("ts", time.time())
+        return kind != "heartbeat"
+
+    def snapshot(self) -> Dict:
+        """Small JSON-ready summary (sizes depend on label cardinality, not ticket count)"""
+        now = time.time()
+        while self.recent and self.recent[0] < now - self.window_seconds:
+            self.recent.popleft()
+        done = self.resumed + self.labeled
+        status = self.status
+        if status == "running" and now - self.last_event > self.stall_seconds:
+            # No events, not even heartbeats: the analyzer died without finishing the run
+            status = "stalled"
+        return {
+            "run_id": self.run_id,
+            "status": status,
+            "labeled": self.labeled,
+            "duplicates": self.duplicates,
+            "progress": round(done / self.total, 4) if self.total else None,
+            "total": self.total,
+            "per_minute": round(len(self.recent) * 60 / self.window_seconds, 1),
+            "counts": {field: dict(counter) for field, counter in self.counts.items()},
+            "latest": list(self.latest)
+        }
+
+
+class LabelStreamFollower:
+    def __init__(self, path: str = STREAM_FILE, poll_seconds: float = 0.5):
+        """Tail the label log from a byte offset and keep RollingAggregates up to date"""
+        self.path = path
+        self.poll_seconds = poll_seconds
+        self.aggregates = RollingAggregates()
+        self.offset = 0
+        self.inode = None
+        self.version = 0
+        self.changed = threading.Condition()
+        self.thread = None
+
+    def start(self) -> 'LabelStreamFollower':
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._follow, name="label-stream", daemon=True)
+            self.thread.start()
+        return self
+
+    def poll(self) -> int:
+        """Fold in the events appended since the last poll; returns how many"""
+        try:
+            f = open(self.path, 'rb')
+        except OSError:
+            return 0
+        with f:
+            stat = os.fstat(f.fileno())
+            if stat.st_ino != self.inode or stat.st_size < self.offset:
+                # A new run replaced the log: its run_started event resets the aggregates
+                self.inode = stat.st_ino
+                self.offset = 0
+            if stat.st_size == self.offset:
+                return 0
+            f.seek(self.offset)
+            data = f.read(stat.st_size - self.offset)
+
+        complete = data[:data.rfind(b"\n") + 1]
+        events = changed = 0
+        with self.changed:
+            for line in complete.splitlines():
+                try:
+                    changed += self.aggregates.apply(json.loads(line))
+                    events += 1
+                except ValueError:
+                    continue
+            self.offset += len(complete)
+            if changed:
+                self.version += 1
+                self.changed.notify_all()
+        return events
+
+    def _follow(self):
+        while True:
+            self.poll()
+            time.sleep(self.poll_seconds)
+
+    def current(self) -> Tuple[int, Dict]:
+        with self.changed:
+            return self.version, self.aggregates.snapshot()
+
+    def wait(self, version: int, timeout: float = 15.0) -> Optional[Tuple[int, Dict]]:
+        """Block until there is something newer than version; None on timeout"""
+        with self.changed:
+            self.changed.wait_for(lambda: self.version != version, timeout=timeout)
+            if self.version == version:
+                return None
+            return self.version, self.aggregates.snapshot()
+
+
+def count_deltas(previous: Dict, current: Dict) -> Dict:
+    """Only the counts that changed since the last message sent to a client"""
+    return {field: {label: n for label, n in counts.items()
+                    if previous.get(field, {}).get(label) != n}
+            for field, counts in current.items()}
@@ -0,0 +1,250 @@
+import argparse
+import json
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any
+
+from ticket_vocabulary import PRODUCTS, ISSUES, SENTIMENT_LABELS, URGENCY_LABELS, CATEGORY_LABELS
+
+MODEL_NAME = "deepseek-r1:8b"
+
+
+class LatencyModel:
+    def __init__(self, spec: str = "fixed:0.05"):
+        """Parse a latency spec such as 'fixed:0.5', 'uniform:0.2,1.0' or 'lognormal:-1,0.5'"""
+        kind, _, params = spec.partition(':')
+        self.kind = kind
+        self.params = [float(p) for p in params.split(',')] if params else []
+        if kind not in {'fixed', 'uniform', 'normal', 'lognormal', 'exponential'}:
+            raise ValueError(f"Unknown latency distribution: {kind}")
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one latency in seconds"""
+        p = self.params
+        if self.kind == 'fixed':
+            value = p[0] if p else 0.0
+        elif self.kind == 'uniform':
+            value = rng.uniform(p[0], p[1])
+        elif self.kind == 'normal':
+            value = rng.gauss(p[0], p[1])
+        elif self.kind == 'lognormal':
+            value = rng.lognormvariate(p[0], p[1])
+        else:
+            value = rng.expovariate(1.0 / p[0])
+        return max(value, 0.0)
+
+    def __str__(self):
+        return f"{self.kind}:{','.join(str(p) for p in self.params)}"
+
+
+class MockOllamaConfig:
+    def __init__(self, latency: str = "fixed:0.05", error_rate: float = 0.0,
+                 timeout_rate: float = 0.0, hang_seconds: float = 30.0,
+                 malformed_rate: float = 0.0, max_concurrency: int = 1,
+                 stream_chunks: int = 8, seed: int = 42):
+        """Behaviour knobs for the mock server"""
+        self.latency = LatencyModel(latency)
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.hang_seconds = hang_seconds
+        self.malformed_rate = malformed_rate
+        self.max_concurrency = max_concurrency
+        self.stream_chunks = stream_chunks
+        self.seed = seed
+
+
+class MockOllamaServer:
+    def __init__(self, config: MockOllamaConfig = None, host: str = '127.0.0.1', port: int = 11434):
+        """Local stand-in for the Ollama HTTP API (/api/tags and /api/generate)"""
+        self.config = config or MockOllamaConfig()
+        self.rng = random.Random(self.config.seed)
+        self.rng_lock = threading.Lock()
+        # Ollama serves a fixed number of requests in parallel and queues the rest
+        self.slots = threading.Semaphore(self.config.max_concurrency)
+        self.stats = {'requests': 0, 'errors': 0, 'timeouts': 0, 'malformed': 0}
+        self.stats_lock = threading.Lock()
+
+        handler = self._make_handler()
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'MockOllamaServer':
+        """Serve in a background thread"""
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Shut the server down"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _count(self, key: str):
+        with self.stats_lock:
+            self.stats[key] += 1
+
+    def _draw(self):
+        """Sample the fate of one request: (latency, outcome)"""
+        with self.rng_lock:
+            latency = self.config.latency.sample(self.rng)
+            roll = self.rng.random()
+            seed = self.rng.randint(1, 10**9)
+        cfg = self.config
+        if roll < cfg.error_rate:
+            return latency, 'error', seed
+        if roll < cfg.error_rate + cfg.timeout_rate:
+            return latency, 'timeout', seed
+        if roll < cfg.error_rate + cfg.timeout_rate + cfg.malformed_rate:
+            return latency, 'malformed', seed
+        return latency, 'ok', seed
+
+    @staticmethod
+    def _response_text(prompt: str, malformed: bool, rng: random.Random) -> str:
+        """Fake model output shaped like what the pipeline prompts expect"""
+        if 'Analyze this customer support ticket' in prompt:
+            analysis = {
+                "sentiment": rng.choice(SENTIMENT_LABELS),
+                "urgency": rng.choice(URGENCY_LABELS),
+                "category": rng.choice(CATEGORY_LABELS),
+                "summary": "Customer reports an issue with their account."
+            }
+            text = f"<think>Classifying ticket.</think>\n```json\n{json.dumps(analysis)}\n```"
+            if malformed:
+                text = text.replace('"urgency"', 'urgency').replace('}', '')
+            return text
+
+        if malformed:
+            return ""
+        product, issue = rng.choice(PRODUCTS), rng.choice(ISSUES)
+        return (f"My {product} account (ID ACC-{rng.randint(100000, 999999)}) has {issue} "
+                f"since {rng.randint(1, 12)}:{rng.randint(10, 59)} PM with error E{rng.randint(1000, 9999)}. "
+                f"Please help me resolve this as soon as possible.")
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass  # Keep benchmark output clean
+
+            def _send_json(self, status: int, body: Dict[str, Any]):
+                payload = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                if self.path != '/api/tags':
+                    return self._send_json(404, {'error': 'not found'})
+                self._send_json(200, {'models': [{
+                    'name': MODEL_NAME, 'model': MODEL_NAME,
+                    'modified_at': datetime.now(timezone.utc).isoformat(), 'size': 4920753328
+                }]})
+
+            def do_POST(self):
+                if self.path != '/api/generate':
+                    return self._send_json(404, {'error': 'not found'})
+                length = int(self.headers.get('Content-Length', 0))
+                try:
+                    body = json.loads(self.rfile.read(length) or b'{}')
+                except json.JSONDecodeError:
+                    return self._send_json(400, {'error': 'invalid request body'})
+
+                server._count('requests')
+                latency, outcome, seed = server._draw()
+                with server.slots:
+                    if outcome == 'timeout':
+                        server._count('timeouts')
+                        time.sleep(server.config.hang_seconds)
+                    else:
+                        time.sleep(latency)
+                    if outcome == 'error':
+                        server._count('errors')
+                        return self._send_json(500, {'error': 'model runner has unexpectedly stopped'})
+                    if outcome == 'malformed':
+                        server._count('malformed')
+
+                    text = server._response_text(body.get('prompt', ''), outcome == 'malformed',
+                                                 random.Random(seed))
+                    stats = {
+                        'model': body.get('model', MODEL_NAME),
+                        'created_at': datetime.now(timezone.utc).isoformat(),
+                        'total_duration': int(latency * 1e9),
+                        'eval_count': len(text.split())
+                    }
+                    if body.get('stream', True):
+                        self._stream(text, stats, latency)
+                    else:
+                        self._send_json(200, dict(stats, response=text, done=True))
+
+            def _stream(self, text: str, stats: Dict[str, Any], latency: float):
+                """Send NDJSON chunks like Ollama's streaming mode"""
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/x-ndjson')
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+
+                words = text.split(' ')
+                n = max(1, min(server.config.stream_chunks, len(words)))
+                step = -(-len(words) // n)
+                for i in range(0, len(words), step):
+                    piece = ' '.join(words[i:i + step]) + (' ' if i + step < len(words) else '')
+                    self._write_chunk(dict(model=stats['model'], created_at=stats['created_at'],
+                                           response=piece, done=False))
+                self._write_chunk(dict(stats, response='', done=True))
+                self.wfile.write(b'0\r\n\r\n')
+
+            def _write_chunk(self, body: Dict[str, Any]):
+                data = (json.dumps(body) + '\n').encode('utf-8')
+                self.wfile.write(f"{len(data):X}\r\n".encode('ascii') + data + b'\r\n')
+
+        return Handler
+
+
+def main():
+    """Run the mock Ollama server in the foreground"""
+    parser = argparse.ArgumentParser(description="Local Ollama stand-in for reproducible benchmarks")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=11434)
+    parser.add_argument('--latency', default='lognormal:-1.0,0.5',
+                        help="fixed:S | uniform:A,B | normal:MU,SD | lognormal:MU,SIGMA | exponential:MEAN")
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--timeout-rate', type=float, default=0.0)
+    parser.add_argument('--hang-seconds', type=float, default=30.0)
+    parser.add_argument('--malformed-rate', type=float, default=0.0)
+    parser.add_argument('--max-concurrency', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    config = MockOllamaConfig(latency=args.latency, error_rate=args.error_rate,
+                              timeout_rate=args.timeout_rate, hang_seconds=args.hang_seconds,
+                              malformed_rate=args.malformed_rate,
+                              max_concurrency=args.max_concurrency, seed=args.seed)
+    server = MockOllamaServer(config, host=args.host, port=args.port)
+    print(f"🧪 Mock Ollama serving {MODEL_NAME} at {server.url}")
+    print(f"   Latency: {config.latency} | Errors: {config.error_rate:.0%} | "
+          f"Timeouts: {config.timeout_rate:.0%} | Malformed: {config.malformed_rate:.0%} | "
+          f"Parallel: {config.max_concurrency}")
+    print("💡 Point the pipeline at it with OLLAMA_HOST=" + server.url)
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⏹️  Stopped")
+        print(f"📊 Stats: {server.stats}")
+
+
+if __name__ == "__main__":
+    main()
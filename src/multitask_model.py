@@ -0,0 +1,204 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Dict, List
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.exceptions import NotFittedError
+from sklearn.utils.metaestimators import available_if
+from sklearn.utils.validation import check_is_fitted
+
+TASK_COLUMNS = {"Sentiment": "sentiment", "Urgency": "urgency", "Category": "category"}
+
+
+class LabelDecodedClassifier(ClassifierMixin, BaseEstimator):
+    def __init__(self, estimator=None, classes=None):
+        """A classifier fitted on encoded labels (0..k-1) that predicts the label names
+
+        Wrapped as the last step of the saved *_best.joblib pipelines, so .predict
+        returns 'High'/'Negative'/... whichever model won (XGBoost needs int targets).
+        """
+        self.estimator = estimator
+        self.classes = classes
+
+    @property
+    def classes_(self) -> np.ndarray:
+        return np.asarray(self.classes)
+
+    def fit(self, X, y):
+        """Encode y against classes and fit the wrapped estimator on the codes"""
+        codes = pd.Categorical(np.asarray(y), categories=self.classes_).codes
+        self.estimator.fit(X, codes)
+        return self
+
+    def __sklearn_is_fitted__(self) -> bool:
+        try:
+            check_is_fitted(self.estimator)
+        except NotFittedError:
+            return False
+        return True
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_[np.asarray(self.estimator.predict(X)).ravel().astype(int)]
+
+    @available_if(lambda self: hasattr(self.estimator, 'predict_proba'))
+    def predict_proba(self, X) -> np.ndarray:
+        return self.estimator.predict_proba(X)
+
+    @available_if(lambda self: hasattr(self.estimator, 'decision_function'))
+    def decision_function(self, X) -> np.ndarray:
+        return self.estimator.decision_function(X)
+
+
+class MultiTaskTicketClassifier:
+    def __init__(self, vectorizer, heads: Dict[str, object], classes: Dict[str, np.ndarray]):
+        """One shared text vectorization feeding a classifier head per task"""
+        self.vectorizer = vectorizer
+        self.heads = heads
+        self.classes = {task: np.asarray(labels) for task, labels in classes.items()}
+
+    @property
+    def tasks(self) -> List[str]:
+        return list(self.heads)
+
+    def predict(self, texts) -> pd.DataFrame:
+        """Vectorize the texts once and predict every task's label"""
+        X = self.vectorizer.transform(texts)
+        return pd.DataFrame({
+            TASK_COLUMNS.get(task, task.lower()):
+                self.classes[task][np.asarray(head.predict(X)).ravel().astype(int)]
+            for task, head in self.heads.items()
+        })
+
+    def predict_one(self, text: str) -> Dict[str, str]:
+        """Predict all labels for a single ticket"""
+        return self.predict([text]).iloc[0].to_dict()
+
+    def save(self, path: str):
+        """Persist the artifact with joblib"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        joblib.dump(self, path)
+
+    @staticmethod
+    def load(path: str) -> 'MultiTaskTicketClassifier':
+        """Load a persisted multi-task artifact"""
+        return joblib.load(path)
+
+
+def _load_with_memory(path: str):
+    """Load a joblib artifact and return (object, seconds, peak Python heap bytes)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    obj = joblib.load(path)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, seconds, peak
+
+
+_COLD_LOAD = """
+import json, sys, time
+start = time.perf_counter()
+import joblib
+for path in sys.argv[1:]:
+    joblib.load(path)
+print(json.dumps(time.perf_counter() - start))
+"""
+
+
+def _cold_load_seconds(paths: List[str], repeats: int = 3) -> float:
+    """Median time to import joblib/sklearn and load the artifacts in a fresh interpreter"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(
+        [os.path.dirname(os.path.abspath(__file__))] + [p for p in [os.environ.get('PYTHONPATH')] if p]))
+    timings = [json.loads(subprocess.run([sys.executable, '-c', _COLD_LOAD, *paths], env=env, check=True,
+                                         capture_output=True, text=True).stdout)
+               for _ in range(repeats)]
+    return float(np.median(timings))
+
+
+def _latency_ms(predict, texts: List[str], batch_size: int) -> np.ndarray:
+    """Per-ticket latency for predicting texts in batches of batch_size"""
+    timings = []
+    for start in range(0, len(texts), batch_size):
+        batch = texts[start:start + batch_size]
+        t0 = time.perf_counter()
+        predict(batch)
+        timings.append((time.perf_counter() - t0) * 1000 / len(batch))
+    return np.array(timings)
+
+
+def benchmark(models_dir: str = 'Models', input_file: str = 'analyzed_tickets.csv',
+              num_texts: int = 500) -> pd.DataFrame:
+    """Compare the multi-task artifact against the separate per-task pipelines"""
+    texts = pd.read_csv(input_file, usecols=['ticket_text'], nrows=num_texts)['ticket_text']
+    texts = texts.fillna('').astype(str).tolist()
+
+    separate_paths = [os.path.join(models_dir, f"{task.lower()}_best.joblib") for task in TASK_COLUMNS]
+    separate_paths = [p for p in separate_paths if os.path.exists(p)]
+    multitask_path = os.path.join(models_dir, 'multitask_best.joblib')
+
+    # Cold: a fresh process per measurement, so both sides pay the sklearn import
+    cold_s = _cold_load_seconds(separate_paths)
+    mt_cold_s = _cold_load_seconds([multitask_path])
+
+    # Warm: imports already done, so load_ms is the artifact alone
+    for path in separate_paths + [multitask_path]:
+        joblib.load(path)
+    pipelines, load_s, load_peak = [], 0.0, 0
+    for path in separate_paths:
+        pipeline, seconds, peak = _load_with_memory(path)
+        pipelines.append(pipeline)
+        load_s += seconds
+        load_peak += peak
+    multitask, mt_load_s, mt_peak = _load_with_memory(multitask_path)
+
+    def predict_separate(batch):
+        return [pipeline.predict(batch) for pipeline in pipelines]
+
+    rows = []
+    for name, predict, paths, cold, seconds, peak in [
+        (f"separate ({len(pipelines)} pipelines)", predict_separate, separate_paths, cold_s, load_s, load_peak),
+        ("multitask", multitask.predict, [multitask_path], mt_cold_s, mt_load_s, mt_peak),
+    ]:
+        single = _latency_ms(predict, texts, 1)
+        batched = _latency_ms(predict, texts, 64)
+        rows.append({
+            'artifact': name,
+            'size_mb': round(sum(os.path.getsize(p) for p in paths) / 1e6, 2),
+            'cold_load_ms': round(cold * 1000, 1),
+            'load_ms': round(seconds * 1000, 1),
+            'load_peak_mb': round(peak / 1e6, 2),
+            'single_p50_ms': round(np.percentile(single, 50), 3),
+            'single_p99_ms': round(np.percentile(single, 99), 3),
+            'batch64_per_ticket_ms': round(batched.mean(), 4)
+        })
+    return pd.DataFrame(rows)
+
+
+def main():
+    """Benchmark per-ticket latency and memory: multi-task artifact vs separate pipelines"""
+    parser = argparse.ArgumentParser(description="Multi-task vs separate pipeline benchmark")
+    parser.add_argument('--models-dir', default='Models')
+    parser.add_argument('--input', default='analyzed_tickets.csv')
+    parser.add_argument('--num-texts', type=int, default=500)
+    parser.add_argument('--output', default='reports/benchmarks/multitask.csv')
+    args = parser.parse_args()
+
+    results = benchmark(args.models_dir, args.input, args.num_texts)
+    print("\n📊 Multi-task vs separate pipelines:")
+    print(results.to_string(index=False))
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    results.to_csv(args.output, index=False)
+    print(f"💾 Saved benchmark results → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
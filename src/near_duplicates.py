@@ -0,0 +1,209 @@
+import re
+import sys
+import zlib
+import pickle
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Mersenne prime modulus of the universal hash family: 2**61 = 1 (mod p), so products
+# can be reduced with shifts and masks without ever overflowing uint64
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+
+def _mod_mersenne(x: np.ndarray) -> np.ndarray:
+    """x mod 2**61 - 1 for any uint64 x"""
+    x = (x & np.uint64(MERSENNE_PRIME)) + (x >> np.uint64(61))
+    return np.where(x >= np.uint64(MERSENNE_PRIME), x - np.uint64(MERSENNE_PRIME), x)
+
+
+def _mul_mod_mersenne(x: np.ndarray, a: np.ndarray) -> np.ndarray:
+    """outer(x, a) mod 2**61 - 1 for 32-bit x and 61-bit a
+
+    a is split into 29 high and 32 low bits so every partial product fits in
+    uint64; the high part is shifted by 2**32 and folded (2**61 = 1 mod p).
+    """
+    a_hi, a_lo = a >> np.uint64(32), a & np.uint64(MAX_HASH)
+    lo = _mod_mersenne(np.outer(x, a_lo))
+    hi = np.outer(x, a_hi)  # < 2**61
+    hi = ((hi & np.uint64((1 << 29) - 1)) << np.uint64(32)) + (hi >> np.uint64(29))
+    return _mod_mersenne(_mod_mersenne(hi) + lo)
+
+
+class NearDuplicateIndex:
+    def __init__(self, num_perm: int = 128, threshold: float = 0.8,
+                 shingle_size: int = 3, seed: int = 42):
+        """MinHash/LSH index over ticket texts, built incrementally"""
+        self.num_perm = num_perm
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.seed = seed
+        self.bands, self.rows = self._choose_bands(num_perm, threshold)
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+        self.buckets = [defaultdict(list) for _ in range(self.bands)]
+        self.signatures: Dict[object, np.ndarray] = {}
+        self.cluster_of: Dict[object, object] = {}  # ticket_id -> representative ticket_id
+        self.members: Dict[object, List[object]] = defaultdict(list)  # representative -> ticket_ids
+
+    @staticmethod
+    def _choose_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+        """Pick (bands, rows) with the S-curve midpoint just below the threshold
+
+        Erring low favours recall; candidates are verified against the
+        threshold in lookup(), so false positives are cheap.
+        """
+        best, best_midpoint = (num_perm, 1), -1.0
+        for rows in range(1, num_perm + 1):
+            if num_perm % rows:
+                continue
+            bands = num_perm // rows
+            midpoint = (1.0 / bands) ** (1.0 / rows)
+            if best_midpoint < midpoint <= threshold:
+                best, best_midpoint = (bands, rows), midpoint
+        return best
+
+    def _shingles(self, text: str) -> np.ndarray:
+        """Hash word n-gram shingles of the normalized text to uint32"""
+        words = re.findall(r'\w+', str(text).lower())
+        k = self.shingle_size
+        if len(words) < k:
+            grams = [' '.join(words)] if words else ['']
+        else:
+            grams = [' '.join(words[i:i + k]) for i in range(len(words) - k + 1)]
+        return np.unique(np.fromiter((zlib.crc32(g.encode('utf-8')) for g in grams),
+                                     dtype=np.uint64, count=len(grams)))
+
+    def signature(self, text: str) -> np.ndarray:
+        """Compute the MinHash signature of a text (vectorized over permutations)"""
+        shingles = self._shingles(text)
+        hashed = _mod_mersenne(_mul_mod_mersenne(shingles, self._a) + self._b)
+        return (hashed & MAX_HASH).min(axis=0).astype(np.uint32)
+
+    def _band_keys(self, sig: np.ndarray):
+        for band in range(self.bands):
+            yield band, sig[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    @staticmethod
+    def jaccard(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+        """Estimate Jaccard similarity from two MinHash signatures"""
+        return float(np.mean(sig_a == sig_b))
+
+    def lookup(self, text: str, sig: Optional[np.ndarray] = None) -> List[Tuple[object, float]]:
+        """Return indexed tickets similar to text, best match first"""
+        if sig is None:
+            sig = self.signature(text)
+        candidates = set()
+        for band, key in self._band_keys(sig):
+            candidates.update(self.buckets[band].get(key, ()))
+
+        matches = []
+        for ticket_id in candidates:
+            similarity = self.jaccard(sig, self.signatures[ticket_id])
+            if similarity >= self.threshold:
+                matches.append((ticket_id, similarity))
+        matches.sort(key=lambda m: m[1], reverse=True)
+        return matches
+
+    def add(self, ticket_id, text: str, sig: Optional[np.ndarray] = None) -> object:
+        """Index a ticket and return the representative of its cluster"""
+        if ticket_id in self.cluster_of:
+            return self.cluster_of[ticket_id]
+
+        if sig is None:
+            sig = self.signature(text)
+        matches = self.lookup(text, sig)
+        representative = self.cluster_of[matches[0][0]] if matches else ticket_id
+
+        self.signatures[ticket_id] = sig
+        for band, key in self._band_keys(sig):
+            self.buckets[band][key].append(ticket_id)
+        self.cluster_of[ticket_id] = representative
+        self.members[representative].append(ticket_id)
+        return representative
+
+    def add_many(self, ticket_ids, texts) -> List[object]:
+        """Index several tickets, returning the representative of each"""
+        return [self.add(ticket_id, text) for ticket_id, text in zip(ticket_ids, texts)]
+
+    def representative(self, ticket_id) -> Optional[object]:
+        """Return the cluster representative for an indexed ticket"""
+        return self.cluster_of.get(ticket_id)
+
+    def clusters(self, min_size: int = 2) -> Dict[object, List[object]]:
+        """Return clusters with at least min_size members keyed by representative"""
+        return {rep: ids for rep, ids in self.members.items() if len(ids) >= min_size}
+
+    def dedup_report(self) -> Dict[str, object]:
+        """Summarize duplication in the indexed corpus"""
+        total = len(self.cluster_of)
+        unique = len(self.members)
+        duplicate_clusters = self.clusters()
+        largest = sorted(duplicate_clusters.items(), key=lambda c: len(c[1]), reverse=True)[:10]
+        return {
+            'total_tickets': total,
+            'unique_clusters': unique,
+            'duplicate_tickets': total - unique,
+            'duplication_rate': (total - unique) / total if total else 0.0,
+            'duplicate_clusters': len(duplicate_clusters),
+            'largest_clusters': [(rep, len(ids)) for rep, ids in largest],
+            'threshold': self.threshold,
+            'bands': self.bands,
+            'rows': self.rows
+        }
+
+    def print_report(self):
+        """Print the dedup report"""
+        report = self.dedup_report()
+        print("\n" + "=" * 60)
+        print("🧬 NEAR-DUPLICATE REPORT")
+        print("=" * 60)
+        print(f"   Total Tickets: {report['total_tickets']}")
+        print(f"   Unique Clusters: {report['unique_clusters']}")
+        print(f"   Duplicate Tickets: {report['duplicate_tickets']} "
+              f"({report['duplication_rate']*100:.1f}%)")
+        print(f"   LSH: {report['bands']} bands x {report['rows']} rows "
+              f"(Jaccard ≥ {report['threshold']})")
+        for rep, size in report['largest_clusters']:
+            print(f"   Cluster {rep}: {size} tickets")
+
+    def save(self, path: str):
+        """Persist the index to disk"""
+        with open(path, 'wb') as f:
+            pickle.dump(self, f)
+
+    @staticmethod
+    def load(path: str) -> 'NearDuplicateIndex':
+        """Load a persisted index"""
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+
+def cluster_ids(texts, ticket_ids=None, **index_kwargs) -> np.ndarray:
+    """Group label per text, for leak-free train/test splits (e.g. GroupShuffleSplit)"""
+    texts = list(texts)
+    if ticket_ids is None:
+        ticket_ids = range(len(texts))
+    index = NearDuplicateIndex(**index_kwargs)
+    return np.asarray(index.add_many(list(ticket_ids), texts))
+
+
+def main():
+    """Build an index over a ticket CSV and print the dedup report"""
+    input_file = sys.argv[1] if len(sys.argv) > 1 else 'analyzed_tickets.csv'
+    df = pd.read_csv(input_file, usecols=['ticket_id', 'ticket_text'])
+    print(f"✅ Loaded {len(df)} tickets from {input_file}")
+
+    index = NearDuplicateIndex()
+    index.add_many(df['ticket_id'].tolist(), df['ticket_text'].fillna('').tolist())
+    index.print_report()
+
+
+if __name__ == "__main__":
+    main()
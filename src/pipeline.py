@@ -0,0 +1,253 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List
+
+import pandas as pd
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+STATE_DIR = '.cache/pipeline'
+IMPORT_PATTERN = re.compile(r"^\s*(?:from|import)\s+(\w+)", re.MULTILINE)
+IMPORT_MODULE_PATTERN = re.compile(r"import_module\('(\w+)'\)")
+SYNTHETIC_DIR = 'data/synthetic'
+# Listed one by one: train also writes into figures/ while visualize runs
+CHART_FILES = ['figures/sentiment_analysis.png', 'figures/category_distribution.png',
+               'figures/urgency_analysis.png', 'figures/product_analysis.png',
+               'figures/correlation_heatmap.png', 'figures/executive_summary.png']
+_print_lock = threading.Lock()
+
+
+def log(message: str):
+    """print() from concurrent stages without interleaved lines"""
+    with _print_lock:
+        sys.stdout.write(message + "\n")
+        sys.stdout.flush()
+
+
+class Stage:
+    def __init__(self, name: str, script: str, inputs: List[str], outputs: List[str],
+                 args: List[str] = None, cwd: str = None):
+        """One pipeline step: a src/ script with declared input and output files
+
+        The scripts read and write fixed names relative to their working directory;
+        cwd runs one elsewhere (inputs and outputs are still given from the repo root).
+        """
+        self.name = name
+        self.script = script
+        self.inputs = inputs
+        self.outputs = outputs
+        self.args = args or []
+        self.cwd = cwd
+
+    def command(self) -> List[str]:
+        return [sys.executable, os.path.join(SRC_DIR, self.script)] + self.args
+
+
+def build_stages(synthetic_rows: int = None, train_args: List[str] = None,
+                 visualize_args: List[str] = None) -> List[Stage]:
+    """The four numbered scripts as a DAG (or a synthetic corpus in place of the LLM stages)
+
+    Synthetic runs live entirely under data/synthetic/, so the LLM-labeled
+    analyzed_tickets.csv, its charts and the trained models are never overwritten.
+    """
+    if synthetic_rows:
+        workdir = SYNTHETIC_DIR
+        data_file = os.path.join(workdir, 'analyzed_tickets.csv')
+        source = [Stage('synthetic', 'synthetic_generator.py', [], [data_file],
+                        ['--rows', str(synthetic_rows), '--output', data_file])]
+    else:
+        workdir = None
+        data_file = 'analyzed_tickets.csv'
+        source = [Stage('generate', '01_generate_data.py', [], ['generated_tickets.csv']),
+                  Stage('analyze', '02_analyze_data.py', ['generated_tickets.csv'], [data_file])]
+    at = lambda path: os.path.join(workdir, path) if workdir else path
+    return source + [
+        Stage('visualize', '03_visualize_results.py', [data_file],
+              [at(p) for p in ['analysis_report.md'] + CHART_FILES], visualize_args, cwd=workdir),
+        Stage('train', '04_train_ml_model.py', [data_file],
+              [at('Models/*_best.joblib'), at('Models/benchmark_results.csv')], train_args, cwd=workdir),
+    ]
+
+
+def code_files(script: str) -> List[str]:
+    """The script plus every sibling module it imports, transitively"""
+    seen, pending = set(), [script]
+    while pending:
+        name = pending.pop()
+        path = os.path.join(SRC_DIR, name)
+        if name in seen or not os.path.exists(path):
+            continue
+        seen.add(name)
+        with open(path, encoding='utf-8') as f:
+            source = f.read()
+        pending += [f"{module}.py" for module in IMPORT_PATTERN.findall(source)]
+        # Numbered stages load siblings with importlib.import_module('02_analyze_data')
+        pending += [f"{module}.py" for module in IMPORT_MODULE_PATTERN.findall(source)]
+    return sorted(seen)
+
+
+class PipelineRunner:
+    def __init__(self, stages: List[Stage], jobs: int = 2, force: bool = False,
+                 state_dir: str = STATE_DIR):
+        """Run stages in dependency order, concurrently where independent, skipping unchanged ones"""
+        self.stages = {stage.name: stage for stage in stages}
+        self.jobs = jobs
+        self.force = force
+        self.state_dir = state_dir
+        self.state_file = os.path.join(state_dir, 'state.json')
+        self.lock = threading.Lock()  # Stages run in threads and share the state
+        self.state = {'stages': {}, 'file_hashes': {}}
+        if os.path.exists(self.state_file):
+            with open(self.state_file) as f:
+                self.state = json.load(f)
+
+        producers = {output: stage.name for stage in stages for output in stage.outputs}
+        self.dependencies = {stage.name: {producers[i] for i in stage.inputs if i in producers}
+                             for stage in stages}
+
+    def file_hash(self, path: str) -> str:
+        """Content hash, reused while the file's size and mtime are unchanged"""
+        stat = os.stat(path)
+        with self.lock:
+            cached = self.state['file_hashes'].get(path)
+        if cached and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+            return cached['sha256']
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        with self.lock:
+            self.state['file_hashes'][path] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                                               'sha256': digest.hexdigest()}
+        return digest.hexdigest()
+
+    def fingerprint(self, stage: Stage) -> str:
+        """Hash of input contents, code (script + imported src modules) and parameters"""
+        digest = hashlib.sha256(json.dumps({'script': stage.script, 'args': stage.args}).encode())
+        for path in stage.inputs:
+            digest.update(f"input:{path}:{self.file_hash(path) if os.path.exists(path) else '-'}".encode())
+        for name in code_files(stage.script):
+            digest.update(f"code:{name}:{self.file_hash(os.path.join(SRC_DIR, name))}".encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def outputs_exist(stage: Stage) -> bool:
+        return all(glob.glob(pattern) for pattern in stage.outputs)
+
+    def run_stage(self, stage: Stage) -> Dict:
+        """Run one stage as a subprocess with its output captured to a log file"""
+        fingerprint = self.fingerprint(stage)
+        previous = self.state['stages'].get(stage.name, {})
+        if not self.force and previous.get('fingerprint') == fingerprint and self.outputs_exist(stage):
+            log(f"⏭️  {stage.name}: unchanged, skipping")
+            return {'Stage': stage.name, 'Status': 'skipped', 'Seconds': 0.0,
+                    'Fingerprint': fingerprint[:12]}
+
+        log_path = os.path.join(self.state_dir, 'logs', f"{stage.name}.log")
+        os.makedirs(os.path.dirname(log_path), exist_ok=True)
+        log(f"▶️  {stage.name}: {' '.join(stage.command()[1:])} (log: {log_path})")
+        start = time.time()
+        with open(log_path, 'w') as log_file:
+            if stage.cwd:
+                os.makedirs(stage.cwd, exist_ok=True)
+            code = subprocess.run(stage.command(), stdout=log_file, stderr=subprocess.STDOUT,
+                                  cwd=stage.cwd).returncode
+        seconds = time.time() - start
+
+        # The numbered scripts report most failures by printing, not by exit code:
+        # also require every output to exist and at least one to have been written
+        written = [p for pattern in stage.outputs for p in glob.glob(pattern)
+                   if os.path.getmtime(p) >= start - 1]
+        ok = code == 0 and self.outputs_exist(stage) and written
+        if ok:
+            with self.lock:
+                self.state['stages'][stage.name] = {'fingerprint': fingerprint,
+                                                    'finished': time.strftime('%Y-%m-%d %H:%M:%S')}
+            log(f"✅ {stage.name}: done in {seconds:.1f}s")
+        else:
+            with open(log_path) as log_file:
+                tail = log_file.read().splitlines()[-10:]
+            log(f"❌ {stage.name}: failed (exit code {code}) - last log lines:\n"
+                + "\n".join(f"      {line}" for line in tail))
+        return {'Stage': stage.name, 'Status': 'ran' if ok else 'failed',
+                'Seconds': round(seconds, 2), 'Fingerprint': fingerprint[:12]}
+
+    def save_state(self):
+        os.makedirs(self.state_dir, exist_ok=True)
+        tmp = self.state_file + '.tmp'
+        with self.lock, open(tmp, 'w') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp, self.state_file)
+
+    def run(self) -> pd.DataFrame:
+        """Schedule every stage as soon as the stages producing its inputs have finished"""
+        start = time.time()
+        results, pending, running = {}, dict(self.stages), {}
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            while pending or running:
+                for name, stage in list(pending.items()):
+                    upstream = self.dependencies[name]
+                    if any(results.get(dep, {}).get('Status') in ('failed', 'blocked') for dep in upstream):
+                        log(f"⛔ {name}: blocked by a failed upstream stage")
+                        results[name] = {'Stage': name, 'Status': 'blocked', 'Seconds': 0.0,
+                                         'Fingerprint': ''}
+                        del pending[name]
+                    elif all(dep in results for dep in upstream):
+                        running[pool.submit(self.run_stage, stage)] = name
+                        del pending[name]
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[running.pop(future)] = future.result()
+                self.save_state()
+
+        table = pd.DataFrame([results[name] for name in self.stages])
+        log(f"\n⏱️  Pipeline finished in {time.time() - start:.1f}s wall "
+              f"({table['Seconds'].sum():.1f}s of stage time, {self.jobs} concurrent):")
+        log(table.to_string(index=False))
+        return table
+
+
+def main():
+    """Run the whole pipeline, re-running only stages whose inputs, code or parameters changed"""
+    parser = argparse.ArgumentParser(description="SmartDesk AI pipeline runner")
+    parser.add_argument('--stages', default=None,
+                        help="Comma-separated subset of stages (default: all)")
+    parser.add_argument('--synthetic-rows', type=int, default=None,
+                        help="Replace generate/analyze with an LLM-free synthetic corpus of this size")
+    parser.add_argument('--jobs', type=int, default=2, help="Stages allowed to run at once")
+    parser.add_argument('--force', action='store_true', help="Run stages even if unchanged")
+    parser.add_argument('--train-args', default='',
+                        help="Extra arguments for 04_train_ml_model.py, e.g. --train-args='--n-jobs 2'")
+    parser.add_argument('--visualize-args', default='',
+                        help="Extra arguments for 03_visualize_results.py")
+    args = parser.parse_args()
+
+    stages = build_stages(args.synthetic_rows, args.train_args.split(), args.visualize_args.split())
+    if args.stages:
+        wanted = {s.strip() for s in args.stages.split(',')}
+        unknown = wanted - {stage.name for stage in stages}
+        if unknown:
+            parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+        stages = [stage for stage in stages if stage.name in wanted]
+
+    print("=" * 60)
+    print("🚀 SmartDesk AI Pipeline")
+    print("=" * 60)
+    results = PipelineRunner(stages, jobs=args.jobs, force=args.force).run()
+    os.makedirs('reports', exist_ok=True)
+    results.to_csv('reports/pipeline_timings.csv', index=False)
+    sys.exit(1 if results['Status'].isin(['failed', 'blocked']).any() else 0)
+
+
+if __name__ == "__main__":
+    main()
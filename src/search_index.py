@@ -0,0 +1,445 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+from functools import lru_cache
+from itertools import chain
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ticket_store import TicketStore
+
+INDEX_DIR = '.cache/search'
+TEXT_FIELDS = ["ticket_text", "summary"]
+FILTER_FIELDS = ["sentiment", "urgency", "category", "product"]
+# Words, plus whole hyphenated/underscored identifiers such as err-500 or acc_1042
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+COMPOUND_PATTERN = re.compile(r"\b[a-z0-9]+(?:[-_][a-z0-9]+)+")  # \b: no retries mid-word
+STOPWORDS = {"a", "an", "and", "are", "as", "at", "be", "but", "by", "for", "from", "has", "have",
+             "i", "in", "is", "it", "its", "me", "my", "of", "on", "or", "our", "so", "that", "the",
+             "this", "to", "was", "we", "were", "with", "you", "your"}
+MAX_TERM_LENGTH = 32
+K1, B = 1.2, 0.75
+FORMAT_VERSION = 2
+VOWELS = set("aeiouy")
+
+
+@lru_cache(maxsize=1 << 18)
+def stem(word: str) -> str:
+    """Light suffix stripping so refund/refunds/refunded/refunding share one term
+
+    Only alphabetic words of 4+ letters are touched; identifiers and numbers are kept as is.
+    """
+    if len(word) < 4 or not word.isalpha():
+        return word
+    if word.endswith("ies") and len(word) > 4:
+        word = word[:-3] + "y"
+    elif word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        word = word[:-1]
+    for suffix in ("ing", "ed"):
+        stem_part = word[:-len(suffix)]
+        if word.endswith(suffix) and len(stem_part) >= 3 and VOWELS & set(stem_part) \
+                and not stem_part.endswith("e"):
+            word = stem_part
+            if word[-1] == word[-2] and word[-1] not in "lsz" and word[-1] not in VOWELS:
+                word = word[:-1]  # stopped → stop
+            break
+    if word.endswith("e") and len(word) >= 4:
+        word = word[:-1]  # charge/charges/charged → charg
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    """Index terms: every word (stemmed), plus each compound identifier as a whole"""
+    text = str(text).lower()
+    return [stem(w) for w in WORD_PATTERN.findall(text)] + COMPOUND_PATTERN.findall(text)
+
+
+def query_terms(query: str) -> List[str]:
+    """Search terms: a compound such as ERR-500 matches as a whole, not as 'err' OR '500'"""
+    query = str(query).lower()
+    compounds = COMPOUND_PATTERN.findall(query)
+    words = [w for w in WORD_PATTERN.findall(COMPOUND_PATTERN.sub(' ', query)) if w not in STOPWORDS]
+    return [t for t in dict.fromkeys([stem(w) for w in words] + compounds) if t not in STOPWORDS]
+
+
+def source_path(version: str) -> str:
+    """The 'csv:<path>' / 'store:<path>' part of a source version (size/count fields stripped)"""
+    return version.rsplit(':', 2)[0]
+
+
+def vbyte_encode(values: np.ndarray) -> np.ndarray:
+    """Variable-byte code: 7 bits per byte, low groups first, high bit set on all but the last byte"""
+    values = np.asarray(values, dtype=np.int64)
+    nbytes = np.ones(len(values), dtype=np.int64)
+    for k in range(1, 9):
+        nbytes += values >= (1 << (7 * k))
+    starts = np.cumsum(nbytes) - nbytes
+    out = np.empty(int(nbytes.sum()), dtype=np.uint8)
+    for k in range(int(nbytes.max()) if len(values) else 0):
+        has = nbytes > k
+        out[starts[has] + k] = ((values[has] >> (7 * k)) & 0x7F) | ((nbytes[has] - 1 > k) * 0x80)
+    return out
+
+
+def vbyte_decode(data: np.ndarray) -> np.ndarray:
+    data = np.asarray(data, dtype=np.uint8)
+    if not len(data):
+        return np.empty(0, dtype=np.int64)
+    ends = np.flatnonzero((data & 0x80) == 0)
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    shift = np.arange(len(data)) - np.repeat(starts, ends - starts + 1)
+    return np.add.reduceat((data & 0x7F).astype(np.int64) << (7 * shift), starts)
+
+
+class CsvSource:
+    def __init__(self, path: str = 'analyzed_tickets.csv', chunksize: int = 100_000):
+        """Tickets to index from a CSV; its version changes whenever the file does"""
+        self.path = path
+        self.chunksize = chunksize
+
+    def version(self) -> str:
+        stat = os.stat(self.path)
+        return f"csv:{os.path.abspath(self.path)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    def chunks(self) -> Iterator[pd.DataFrame]:
+        wanted = set(["ticket_id"] + TEXT_FIELDS + FILTER_FIELDS)
+        usecols = [c for c in pd.read_csv(self.path, nrows=0).columns if c in wanted]
+        yield from pd.read_csv(self.path, usecols=usecols, chunksize=self.chunksize)
+
+
+class StoreSource:
+    def __init__(self, store: TicketStore, chunksize: int = 100_000):
+        """Tickets to index from the SQLite store (TICKET_DB)"""
+        self.store = store
+        self.chunksize = chunksize
+
+    def version(self) -> str:
+        return f"store:{os.path.abspath(self.store.path)}:{self.store.change_key()}"
+
+    def chunks(self) -> Iterator[pd.DataFrame]:
+        offset = 0
+        while True:
+            chunk = self.store.query(["ticket_id"] + TEXT_FIELDS + FILTER_FIELDS,
+                                     limit=self.chunksize, offset=offset)
+            if chunk.empty:
+                return
+            yield chunk
+            offset += len(chunk)
+
+
+class SearchIndex:
+    def __init__(self, directory: str):
+        """BM25 inverted index over ticket_text + summary, memory-mapped from disk
+
+        Postings are per-term doc-id gaps in variable-byte code with one byte of
+        term frequency each; terms are a sorted array looked up by binary search.
+        Label filters and the stored text are per-document arrays.
+        """
+        self.directory = directory
+        with open(os.path.join(directory, 'meta.json')) as f:
+            self.meta = json.load(f)
+        load = lambda name: np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r')
+        self.terms = load('terms')
+        self.byte_starts = load('byte_starts')
+        self.posting_starts = load('posting_starts')
+        self.postings = load('postings')
+        self.tfs = load('tfs')
+        self.doc_lengths = load('doc_lengths')
+        self.ticket_ids = load('ticket_ids')
+        self.labels = {field: load(f'label_{field}') for field in self.meta['label_values']}
+        self.text = {field: (load(f'text_{field}'), load(f'text_{field}_offsets')) for field in TEXT_FIELDS
+                     if os.path.exists(os.path.join(directory, f'text_{field}.npy'))}
+        self.num_docs = self.meta['documents']
+        self.avg_length = self.meta['avg_length']
+
+    @staticmethod
+    def directory_for(version: str, root: str = INDEX_DIR) -> str:
+        return os.path.join(root, hashlib.sha256(f"{FORMAT_VERSION}:{version}".encode()).hexdigest()[:16])
+
+    @classmethod
+    def open(cls, source, root: str = INDEX_DIR) -> 'SearchIndex':
+        """The index for the source's current version, built on first use and reused after"""
+        for attempt in range(3):
+            version = source.version()
+            directory = cls.directory_for(version, root)
+            if not os.path.exists(os.path.join(directory, 'meta.json')):
+                cls.build(source, directory, version)
+            try:
+                return cls(directory)
+            except FileNotFoundError:
+                if attempt == 2:  # A newer build of the same source removed it while loading
+                    raise
+
+    @classmethod
+    def build(cls, source, directory: str, version: str) -> str:
+        """Tokenize every ticket once, invert, compress and write the index directory"""
+        start = time.time()
+        vocabulary, label_values = {}, {}
+        term_parts, doc_parts, tf_parts, lengths, ids = [], [], [], [], []
+        texts = {field: ([], []) for field in TEXT_FIELDS}
+        labels = {}
+        num_docs = 0
+        for chunk in source.chunks():
+            chunk = chunk.reset_index(drop=True)
+            fields = [f for f in TEXT_FIELDS if f in chunk]
+            combined = pd.Series('', index=chunk.index)
+            for field in fields:
+                combined = combined + ' ' + chunk[field].fillna('').astype(str)
+            tokens = [tokenize(text) for text in combined]
+            counts = np.fromiter((len(t) for t in tokens), dtype=np.int64, count=len(tokens))
+            flat = np.fromiter(chain.from_iterable(tokens), dtype=object, count=int(counts.sum()))
+            docs = np.repeat(np.arange(num_docs, num_docs + len(chunk), dtype=np.int64), counts)
+
+            # Local codes → global term ids; stopwords and overlong tokens are dropped
+            codes, uniques = pd.factorize(flat)
+            mapping = np.array([-1 if (u in STOPWORDS or len(u) > MAX_TERM_LENGTH)
+                                else vocabulary.setdefault(u, len(vocabulary)) for u in uniques],
+                               dtype=np.int64)
+            term_ids = mapping[codes] if len(codes) else np.empty(0, dtype=np.int64)
+            keep = term_ids >= 0
+            pairs, tf = np.unique((term_ids[keep] << 32) | docs[keep], return_counts=True)
+            term_parts.append((pairs >> 32).astype(np.int32))
+            doc_parts.append((pairs & 0xFFFFFFFF).astype(np.int32))
+            tf_parts.append(np.minimum(tf, 255).astype(np.uint8))
+            lengths.append(np.bincount(docs[keep] - num_docs, minlength=len(chunk)).astype(np.int32))
+            ids.append(chunk['ticket_id'].to_numpy(dtype=np.int64))
+
+            for field in FILTER_FIELDS:
+                if field in chunk:
+                    values = label_values.setdefault(field, {})
+                    column = chunk[field].astype(object)
+                    label_codes = [-1 if pd.isna(v) else values.setdefault(str(v), len(values)) for v in column]
+                    labels.setdefault(field, []).append(np.array(label_codes, dtype=np.int16))
+            for field in fields:
+                encoded = [b'' if pd.isna(v) else str(v).encode('utf-8') for v in chunk[field]]
+                texts[field][0].append(np.frombuffer(b''.join(encoded), dtype=np.uint8))
+                texts[field][1].append(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)))
+            num_docs += len(chunk)
+
+        # Postings sorted by term (in sorted-string order), then by doc within each term
+        sorted_terms = sorted(vocabulary)
+        terms = np.array(sorted_terms, dtype=f'<U{MAX_TERM_LENGTH}')
+        rank = np.empty(len(vocabulary), dtype=np.int64)
+        rank[[vocabulary[t] for t in sorted_terms]] = np.arange(len(terms))
+        term_ids = rank[np.concatenate(term_parts)] if term_parts else np.empty(0, dtype=np.int64)
+        order = np.argsort(term_ids, kind='stable')  # Docs already ascend within each term
+        term_ids = term_ids[order]
+        docs = np.concatenate(doc_parts)[order].astype(np.int64) if doc_parts else term_ids
+        tfs = np.concatenate(tf_parts)[order] if tf_parts else np.empty(0, dtype=np.uint8)
+        posting_starts = np.searchsorted(term_ids, np.arange(len(terms) + 1))
+
+        gaps = np.diff(docs, prepend=0)
+        firsts = posting_starts[:-1][np.diff(posting_starts) > 0]
+        gaps[firsts] = docs[firsts]  # Each term's list restarts from doc 0
+        postings = vbyte_encode(gaps)
+        value_ends = np.flatnonzero((postings & 0x80) == 0) + 1
+        byte_starts = np.concatenate(([0], value_ends))[posting_starts]
+
+        doc_lengths = np.concatenate(lengths) if lengths else np.empty(0, dtype=np.int32)
+        tmp = f"{directory}.tmp{os.getpid()}"
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        save = lambda name, array: np.save(os.path.join(tmp, f'{name}.npy'), array)
+        save('terms', terms)
+        save('byte_starts', byte_starts.astype(np.int64))
+        save('posting_starts', posting_starts.astype(np.int64))
+        save('postings', postings)
+        save('tfs', tfs)
+        save('doc_lengths', doc_lengths)
+        save('ticket_ids', np.concatenate(ids) if ids else np.empty(0, dtype=np.int64))
+        for field, parts in labels.items():
+            save(f'label_{field}', np.concatenate(parts))
+        for field, (blobs, sizes) in texts.items():
+            if blobs:
+                save(f'text_{field}', np.concatenate(blobs))
+                save(f'text_{field}_offsets', np.concatenate(([0], np.cumsum(np.concatenate(sizes)))))
+        meta = {'format': FORMAT_VERSION, 'source_version': version, 'documents': num_docs,
+                'terms': len(terms), 'postings': int(len(docs)),
+                'avg_length': float(doc_lengths.mean()) if num_docs else 0.0,
+                'label_values': {field: list(values) for field, values in label_values.items()},
+                'postings_bytes': int(postings.nbytes), 'build_seconds': round(time.time() - start, 2),
+                'built_at': time.strftime('%Y-%m-%d %H:%M:%S')}
+        with open(os.path.join(tmp, 'meta.json'), 'w') as f:
+            json.dump(meta, f, indent=2)
+
+        try:
+            os.rename(tmp, directory)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)  # Another worker finished the same version first
+        cls.remove_stale(directory, version)
+        print(f"🔎 Indexed {num_docs:,} tickets: {len(terms):,} terms, {len(docs):,} postings "
+              f"in {postings.nbytes / 1024 ** 2:.1f} MB ({meta['build_seconds']}s)")
+        return directory
+
+    @staticmethod
+    def remove_stale(directory: str, version: str):
+        """Delete older indexes of the same source; other sources' indexes are left alone
+
+        Open memory maps survive the unlink, and open() retries if a reader loses the race.
+        """
+        root = os.path.dirname(directory)
+        built = os.path.getmtime(os.path.join(directory, 'meta.json'))
+        for name in os.listdir(root):
+            path = os.path.join(root, name)
+            if path == directory or '.tmp' in name:
+                continue
+            try:
+                with open(os.path.join(path, 'meta.json')) as f:
+                    other = json.load(f)['source_version']
+                older = os.path.getmtime(os.path.join(path, 'meta.json')) <= built
+            except (OSError, ValueError, KeyError):
+                continue  # Not an index directory, or one still being replaced
+            if older and source_path(other) == source_path(version):
+                shutil.rmtree(path, ignore_errors=True)
+
+    def term_postings(self, term: str):
+        """(doc ids, term frequencies) for one term, or None if it is not indexed"""
+        position = int(np.searchsorted(self.terms, term))
+        if position >= len(self.terms) or self.terms[position] != term:
+            return None
+        gaps = vbyte_decode(self.postings[self.byte_starts[position]:self.byte_starts[position + 1]])
+        tfs = self.tfs[self.posting_starts[position]:self.posting_starts[position + 1]]
+        return np.cumsum(gaps), np.asarray(tfs, dtype=np.float64)
+
+    def filter_mask(self, docs: Optional[np.ndarray], filters: Dict[str, str]) -> Optional[np.ndarray]:
+        """Which docs (all when docs is None) carry every requested label; None if a label is unknown"""
+        mask = np.ones(self.num_docs if docs is None else len(docs), dtype=bool)
+        for field, value in filters.items():
+            values = self.meta['label_values'].get(field, [])
+            if value not in values:
+                return None
+            codes = self.labels[field] if docs is None else self.labels[field][docs]
+            mask &= np.asarray(codes) == values.index(value)
+        return mask
+
+    def document_text(self, doc: int, field: str) -> Optional[str]:
+        if field not in self.text:
+            return None
+        blob, offsets = self.text[field]
+        return bytes(blob[offsets[doc]:offsets[doc + 1]]).decode('utf-8')
+
+    def search(self, query: str = '', filters: Dict[str, str] = None, limit: int = 20,
+               offset: int = 0, match_all: bool = False) -> Dict:
+        """BM25-ranked tickets containing any (or, with match_all, every) query term,
+        restricted by exact label filters"""
+        start = time.perf_counter()
+        filters = {field: value for field, value in (filters or {}).items() if value}
+        unknown = set(filters) - set(FILTER_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown filters: {', '.join(sorted(unknown))}")
+        terms = query_terms(query)
+
+        if terms:
+            doc_parts, score_parts = [], []
+            for term in terms:
+                found = self.term_postings(term)
+                if found is None:
+                    if match_all:
+                        doc_parts, score_parts = [], []
+                        break
+                    continue
+                docs, tf = found
+                idf = np.log(1 + (self.num_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+                norm = K1 * (1 - B + B * self.doc_lengths[docs] / self.avg_length)
+                doc_parts.append(docs)
+                score_parts.append(idf * tf * (K1 + 1) / (tf + norm))
+            if doc_parts:
+                docs, inverse, hits = np.unique(np.concatenate(doc_parts), return_inverse=True,
+                                                return_counts=True)
+                scores = np.bincount(inverse, weights=np.concatenate(score_parts))
+                if match_all:
+                    docs, scores = docs[hits == len(terms)], scores[hits == len(terms)]
+            else:
+                docs, scores = np.empty(0, dtype=np.int64), np.empty(0)
+            mask = self.filter_mask(docs, filters)
+        else:
+            mask = self.filter_mask(None, filters) if filters else None
+            docs = np.flatnonzero(mask) if mask is not None else np.empty(0, dtype=np.int64)
+            scores, mask = np.zeros(len(docs)), np.ones(len(docs), dtype=bool)
+
+        if mask is None:
+            docs, scores = np.empty(0, dtype=np.int64), np.empty(0)
+        else:
+            docs, scores = docs[mask], scores[mask]
+        total = len(docs)
+        # Only the requested page is fully sorted (ties: lower doc first)
+        wanted = min(len(docs), offset + limit)
+        if wanted < len(docs):
+            top = np.argpartition(-scores, wanted - 1)[:wanted]
+            docs, scores = docs[top], scores[top]
+        order = np.lexsort((docs, -scores))[offset:offset + limit]
+
+        results = []
+        for doc, score in zip(docs[order], scores[order]):
+            result = {'ticket_id': int(self.ticket_ids[doc]), 'score': round(float(score), 4)}
+            for field in FILTER_FIELDS:
+                if field in self.labels:
+                    code = int(self.labels[field][doc])
+                    result[field] = self.meta['label_values'][field][code] if code >= 0 else None
+            for field in TEXT_FIELDS:
+                result[field] = self.document_text(doc, field)
+            results.append(result)
+        return {'query': query, 'terms': terms, 'filters': filters, 'total_matches': total, 'results': results, 'took_ms': round((time.perf_counter() - start) * 1000, 2)}
+
+
+def benchmark(index: SearchIndex, csv_path: str, queries: List[str]) -> pd.DataFrame:
+    """Index lookups vs a str.contains scan over the loaded text columns"""
+    df = pd.read_csv(csv_path, usecols=lambda c: c in TEXT_FIELDS)
+    text = (df[TEXT_FIELDS[0]].fillna('').astype(str) + ' ' + df[TEXT_FIELDS[1]].fillna('').astype(str)).str.lower()
+    rows = []
+    for query in queries:
+        start = time.perf_counter()
+        scan_matches = int(text.str.contains(query.lower(), regex=False).sum())
+        scan_ms = (time.perf_counter() - start) * 1000
+        timings = []
+        for _ in range(5):
+            result = index.search(query)
+            timings.append(result['took_ms'])
+        rows.append({'Query': query, 'ScanMatches': scan_matches, 'ScanMs': round(scan_ms, 1),
+                     'IndexMatches': result['total_matches'], 'IndexMs': round(min(timings), 2)})
+    return pd.DataFrame(rows)
+
+
+def main():
+    """Build, query or benchmark the full-text search index"""
+    parser = argparse.ArgumentParser(description="Full-text ticket search (BM25 inverted index)")
+    parser.add_argument('command', choices=['build', 'query', 'benchmark'])
+    parser.add_argument('query', nargs='?', default='')
+    parser.add_argument('--csv', default='analyzed_tickets.csv')
+    parser.add_argument('--index-dir', default=INDEX_DIR)
+    parser.add_argument('--limit', type=int, default=10)
+    for field in FILTER_FIELDS:
+        parser.add_argument(f'--{field}', default=None)
+    parser.add_argument('--queries', default='err-500,login,refund,payment failure,timeout')
+    parser.add_argument('--output', default='reports/benchmarks/search_index.csv')
+    args = parser.parse_args()
+
+    source = StoreSource(TicketStore()) if os.environ.get("TICKET_DB") else CsvSource(args.csv)
+    if args.command == 'build':
+        version = source.version()
+        SearchIndex.build(source, SearchIndex.directory_for(version, args.index_dir), version)
+        return
+
+    index = SearchIndex.open(source, args.index_dir)
+    if args.command == 'query':
+        result = index.search(args.query, {f: getattr(args, f) for f in FILTER_FIELDS}, args.limit)
+        print(f"🔎 {result['total_matches']:,} matches for {args.query!r} in {result['took_ms']} ms")
+        for hit in result['results']:
+            print(f"   #{hit['ticket_id']} ({hit['score']:.2f}) [{hit.get('urgency')}/{hit.get('category')}] "
+                  f"{(hit.get('summary') or hit.get('ticket_text') or '')[:100]}")
+    else:
+        results = benchmark(index, args.csv, args.queries.split(','))
+        print(results.to_string(index=False))
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        results.to_csv(args.output, index=False)
+        print(f"💾 Saved benchmark → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import os
+import time
+from typing import Dict, List, Optional, Sequence
+
+import joblib
+import numpy as np
+import pandas as pd
+
+BATCH_SIZES = (1, 32, 1024)
+# F1 a model may give up for being cheaper to serve; 0.0 selects on F1 alone
+DEFAULT_F1_TOLERANCE = 0.01
+
+
+def measure_serving_cost(artifact_path: str, texts: Sequence[str], batch_sizes=BATCH_SIZES,
+                         repeats: int = 50, seed: int = 42) -> Dict[str, float]:
+    """Artifact size, load time and per-call prediction latency (p50/p99) by batch size"""
+    start = time.perf_counter()
+    pipeline = joblib.load(artifact_path)
+    load_ms = (time.perf_counter() - start) * 1000
+
+    rng = np.random.RandomState(seed)
+    texts = np.asarray(texts, dtype=object)
+    pipeline.predict(texts[:1])  # Warm-up: first call pays lazy initialisation
+
+    stats = {
+        "SizeKB": round(os.path.getsize(artifact_path) / 1024, 1),
+        "LoadMs": round(load_ms, 2)
+    }
+    for batch_size in batch_sizes:
+        # Fewer repeats for big batches keeps the total work per candidate similar
+        calls = max(5, repeats // max(1, int(np.log2(batch_size)) or 1))
+        timings = []
+        for _ in range(calls):
+            batch = texts[rng.randint(0, len(texts), size=batch_size)]
+            t0 = time.perf_counter()
+            pipeline.predict(batch)
+            timings.append((time.perf_counter() - t0) * 1000)
+        stats[f"P50Ms_b{batch_size}"] = round(float(np.percentile(timings, 50)), 3)
+        stats[f"P99Ms_b{batch_size}"] = round(float(np.percentile(timings, 99)), 3)
+    return stats
+
+
+def pareto_front(results: pd.DataFrame, quality: str = "F1", cost: str = "P99Ms_b1",
+                 group: str = "Task") -> pd.DataFrame:
+    """Rows not dominated on (higher quality, lower cost) within each group"""
+    fronts = []
+    for _, rows in results.groupby(group, sort=False):
+        rows = rows.sort_values([cost, quality], ascending=[True, False])
+        best_quality = -np.inf
+        keep = []
+        for index, row in rows.iterrows():
+            if row[quality] > best_quality:
+                keep.append(index)
+                best_quality = row[quality]
+        fronts.append(rows.loc[keep])
+    return pd.concat(fronts) if fronts else results.iloc[0:0]
+
+
+def select_model(task_results: pd.DataFrame, f1_tolerance: float = DEFAULT_F1_TOLERANCE,
+                 max_latency_ms: Optional[float] = None, cost: str = "P99Ms_b1") -> pd.Series:
+    """Fastest model within f1_tolerance of the best F1 (and under the latency budget)
+
+    f1_tolerance=0.0 without a latency budget is pure highest-F1 selection.
+    """
+    eligible = task_results
+    if max_latency_ms is not None and cost in eligible:
+        under_budget = eligible[eligible[cost] <= max_latency_ms]
+        if not under_budget.empty:
+            eligible = under_budget
+    top_f1 = eligible["F1"].max()
+    eligible = eligible[eligible["F1"] >= top_f1 - f1_tolerance]
+    if cost in eligible and f1_tolerance > 0:
+        return eligible.sort_values([cost, "F1"], ascending=[True, False]).iloc[0]
+    return eligible.sort_values("F1", ascending=False).iloc[0]
+
+
+def markdown_table(df: pd.DataFrame) -> str:
+    """Minimal markdown table (avoids the optional tabulate dependency)"""
+    columns: List[str] = list(df.columns)
+    lines = ["| " + " | ".join(columns) + " |", "|" + "|".join(":---" for _ in columns) + "|"]
+    for _, row in df.iterrows():
+        lines.append("| " + " | ".join(str(row[c]) for c in columns) + " |")
+    return "\n".join(lines)
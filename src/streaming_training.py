@@ -0,0 +1,196 @@
+import os
+import time
+import zlib
+from typing import Dict, Iterator
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import confusion_matrix
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.pipeline import Pipeline
+
+from multitask_model import LabelDecodedClassifier, MultiTaskTicketClassifier
+from ticket_vocabulary import SENTIMENT_LABELS, URGENCY_LABELS, CATEGORY_LABELS
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+TASK_LABELS = {
+    "Sentiment": ("sentiment", SENTIMENT_LABELS),
+    "Urgency": ("urgency", URGENCY_LABELS),
+    "Category": ("category", CATEGORY_LABELS)
+}
+# Stateless feature space: no vocabulary to fit or hold in memory; model
+# memory is fixed by n_features x classes, independent of dataset size
+HASHING_PARAMS = {"n_features": 2 ** 18, "stop_words": "english", "alternate_sign": False,
+                  "norm": "l2"}
+
+
+def build_streaming_candidates(random_state: int = 42) -> Dict[str, object]:
+    """partial_fit-capable counterparts of the batch candidates"""
+    return {
+        "SGD-LogReg": SGDClassifier(loss="log_loss", alpha=1e-5, random_state=random_state),
+        "SGD-LinearSVC": SGDClassifier(loss="hinge", alpha=1e-5, random_state=random_state),
+        "NaiveBayes": MultinomialNB(alpha=0.1),
+    }
+
+
+def is_holdout(ticket_ids: pd.Series, holdout_pct: int = 20) -> np.ndarray:
+    """Deterministic holdout membership by hashed ticket_id, stable across passes"""
+    return np.fromiter((zlib.crc32(str(t).encode()) % 100 < holdout_pct for t in ticket_ids),
+                       dtype=bool, count=len(ticket_ids))
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (NaN where unsupported)"""
+    if resource is None:
+        return float('nan')
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class StreamingTrainer:
+    def __init__(self, input_file: str = 'analyzed_tickets.csv', models_dir: str = 'Models',
+                 chunk_size: int = 50_000, holdout_pct: int = 20, epochs: int = 1,
+                 random_state: int = 42):
+        """Out-of-core training: chunked reads, hashed features and partial_fit"""
+        self.input_file = input_file
+        self.models_dir = models_dir
+        self.chunk_size = chunk_size
+        self.holdout_pct = holdout_pct
+        self.epochs = epochs
+        self.random_state = random_state
+        self.vectorizer = HashingVectorizer(**HASHING_PARAMS)
+
+    def iter_chunks(self) -> Iterator[pd.DataFrame]:
+        """Stream the analyzed tickets, reading only the columns training needs"""
+        columns = ["ticket_id", "ticket_text"] + [col for col, _ in TASK_LABELS.values()]
+        yield from pd.read_csv(self.input_file, usecols=columns, chunksize=self.chunk_size,
+                               dtype={col: 'category' for col, _ in TASK_LABELS.values()})
+
+    @staticmethod
+    def encode_labels(values: pd.Series, task_name: str) -> np.ndarray:
+        """Map labels to fixed class indices; -1 marks rows to skip for this task"""
+        _, labels = TASK_LABELS[task_name]
+        codes = pd.Categorical(values.astype(object), categories=labels).codes.astype(int)
+        if task_name == "Category":
+            # Unknown free-text categories from the LLM are merged into "Other"
+            known_invalid = values.isin(["Error", "No category detected"]).values | values.isna().values
+            codes = np.where((codes < 0) & ~known_invalid, labels.index("Other"), codes)
+        return codes
+
+    def train(self) -> Dict[str, Dict[str, object]]:
+        """Train every candidate for every task in a single pass per epoch"""
+        models = {task: {name: clone(model) for name, model in
+                         build_streaming_candidates(self.random_state).items()}
+                  for task in TASK_LABELS}
+        class_ids = {task: np.arange(len(labels)) for task, (_, labels) in TASK_LABELS.items()}
+
+        rows, start = 0, time.perf_counter()
+        for epoch in range(self.epochs):
+            for chunk in self.iter_chunks():
+                chunk = chunk.dropna(subset=["ticket_text"])
+                train = chunk[~is_holdout(chunk["ticket_id"], self.holdout_pct)]
+                if train.empty:
+                    continue
+                X = self.vectorizer.transform(train["ticket_text"].astype(str))
+                for task, (column, _) in TASK_LABELS.items():
+                    y = self.encode_labels(train[column], task)
+                    keep = y >= 0
+                    if not keep.any():
+                        continue
+                    for model in models[task].values():
+                        model.partial_fit(X[keep], y[keep], classes=class_ids[task])
+                rows += len(chunk)
+                elapsed = time.perf_counter() - start
+                print(f"   📦 epoch {epoch + 1}: {rows:,} rows - {rows / elapsed:,.0f} rows/s - "
+                      f"peak RSS {peak_rss_mb():.0f} MB")
+
+        self.train_rows_per_sec = rows / max(time.perf_counter() - start, 1e-9)
+        return models
+
+    def evaluate(self, models: Dict[str, Dict[str, object]]) -> pd.DataFrame:
+        """Score the models on the holdout rows with a second streaming pass"""
+        confusions = {(task, name): np.zeros((len(labels), len(labels)), dtype=np.int64)
+                      for task, (_, labels) in TASK_LABELS.items() for name in models[task]}
+        for chunk in self.iter_chunks():
+            chunk = chunk.dropna(subset=["ticket_text"])
+            test = chunk[is_holdout(chunk["ticket_id"], self.holdout_pct)]
+            if test.empty:
+                continue
+            X = self.vectorizer.transform(test["ticket_text"].astype(str))
+            for task, (column, labels) in TASK_LABELS.items():
+                y = self.encode_labels(test[column], task)
+                keep = y >= 0
+                if not keep.any():
+                    continue
+                for name, model in models[task].items():
+                    confusions[(task, name)] += confusion_matrix(
+                        y[keep], model.predict(X[keep]), labels=np.arange(len(labels)))
+
+        results = []
+        for (task, name), cm in confusions.items():
+            support = cm.sum(axis=1)
+            total = support.sum()
+            if total == 0:
+                continue
+            precision = np.divide(np.diag(cm), cm.sum(axis=0), out=np.zeros(len(cm)),
+                                  where=cm.sum(axis=0) > 0)
+            recall = np.divide(np.diag(cm), support, out=np.zeros(len(cm)), where=support > 0)
+            f1 = np.divide(2 * precision * recall, precision + recall, out=np.zeros(len(cm)),
+                           where=(precision + recall) > 0)
+            results.append({
+                "Task": task,
+                "Model": name,
+                "Accuracy": round(np.trace(cm) / total, 4),
+                "F1": round(float((f1 * support).sum() / total), 4)
+            })
+        return pd.DataFrame(results)
+
+    def save_best_models(self, models: Dict[str, Dict[str, object]], results: pd.DataFrame):
+        """Save each task's best streaming model in the same artifact layout as batch mode"""
+        os.makedirs(self.models_dir, exist_ok=True)
+        heads, classes = {}, {}
+        for task, task_results in results.groupby("Task", sort=False):
+            best_row = task_results.sort_values("F1", ascending=False).iloc[0]
+            print(f"🏆 Best streaming model for {task}: {best_row['Model']} (F1={best_row['F1']:.3f})")
+            heads[task] = models[task][best_row["Model"]]
+            classes[task] = np.array(TASK_LABELS[task][1], dtype=object)
+
+            pipeline = Pipeline([("hashing", self.vectorizer),
+                                 ("clf", LabelDecodedClassifier(heads[task], classes[task]))])
+            model_path = os.path.join(self.models_dir, f"{task.lower()}_best.joblib")
+            joblib.dump(pipeline, model_path)
+            print(f"💾 Saved best {task} model → {model_path}")
+
+        multitask_path = os.path.join(self.models_dir, "multitask_best.joblib")
+        MultiTaskTicketClassifier(self.vectorizer, heads, classes).save(multitask_path)
+        print(f"💾 Saved multi-task model → {multitask_path}")
+
+    def run(self) -> pd.DataFrame:
+        """Train, evaluate and save with memory bounded by the chunk size"""
+        start_time = time.time()
+        print(f"🌊 Streaming {self.input_file} in chunks of {self.chunk_size:,} rows")
+        models = self.train()
+        print(f"⚡ Training throughput: {self.train_rows_per_sec:,.0f} rows/s")
+
+        results = self.evaluate(models)
+        if results.empty:
+            print("❌ No holdout rows to evaluate")
+            return results
+
+        results_path = os.path.join(self.models_dir, "benchmark_results.csv")
+        os.makedirs(self.models_dir, exist_ok=True)
+        results.to_csv(results_path, index=False)
+        print(results.to_string(index=False))
+        print(f"💾 Saved benchmark results → {results_path}")
+
+        self.save_best_models(models, results)
+        print(f"\n⏱️  Total streaming training time: {time.time() - start_time:.1f}s "
+              f"(peak RSS {peak_rss_mb():.0f} MB)")
+        return results
@@ -0,0 +1,221 @@
+import argparse
+import os
+import time
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+from ticket_vocabulary import (PRODUCTS, ISSUES, TONES, SENTIMENT_LABELS, URGENCY_LABELS,
+                               CATEGORY_LABELS, ANALYZED_COLUMNS, TONE_SENTIMENT, ISSUE_CATEGORY)
+
+# Opening sentence per customer tone
+TONE_OPENERS = {
+    "frustrated": "I'm really frustrated with {product}.",
+    "neutral": "I have a question about {product}.",
+    "happy": "I love using {product}, but I noticed something.",
+    "confused": "I'm a bit confused about {product}.",
+    "angry": "This is unacceptable, {product} keeps failing me.",
+    "urgent": "URGENT: {product} needs attention right now.",
+    "satisfied": "{product} has been great so far.",
+    "disappointed": "I'm disappointed with {product} lately."
+}
+
+# Issue sentences; {detail} is filled with an error code, account ID or timestamp
+ISSUE_SENTENCES = [
+    "I ran into {issue} on my account {detail}.",
+    "Since this morning I keep hitting {issue} {detail}.",
+    "Our team is seeing {issue} again {detail}.",
+    "Can you help with {issue}? It happened {detail}.",
+    "There seems to be {issue} affecting us {detail}."
+]
+
+CLOSINGS = {
+    "Negative": ["Please fix this immediately.", "I expect a refund if this continues.",
+                 "This is costing us time."],
+    "Neutral": ["Let me know what to do next.", "Any guidance is appreciated.",
+                "Thanks for looking into it."],
+    "Positive": ["Thanks for the great support!", "Keep up the good work.",
+                 "Happy to provide more details."]
+}
+
+SUMMARY_TEMPLATES = [
+    "Customer reports {issue} with {product}.",
+    "{product} user needs help with {issue}.",
+]
+
+# P(High, Medium, Low) by tone; issues in SEVERE_ISSUES shift mass toward High
+TONE_URGENCY = {
+    "frustrated": [0.45, 0.45, 0.10], "angry": [0.60, 0.35, 0.05], "urgent": [0.85, 0.15, 0.00],
+    "disappointed": [0.30, 0.50, 0.20], "neutral": [0.10, 0.50, 0.40], "confused": [0.15, 0.55, 0.30],
+    "happy": [0.05, 0.35, 0.60], "satisfied": [0.05, 0.30, 0.65]
+}
+SEVERE_ISSUES = {"payment failure", "data sync error", "mobile app crash", "login problems",
+                 "billing dispute", "account deletion"}
+ERROR_CODES = ["ERR-401", "ERR-403", "ERR-500", "ERR-502", "ERR-504", "E1001", "E2043", "TIMEOUT"]
+
+
+class SyntheticTicketGenerator:
+    def __init__(self, seed: int = 42, label_noise: float = 0.1, error_rate: float = 0.0,
+                 start_date: str = '2025-01-01'):
+        """Template-based ticket generator producing fully labeled analyzed tickets"""
+        self.seed = seed
+        self.label_noise = label_noise
+        self.error_rate = error_rate
+        self.start = np.datetime64(start_date, 's')
+        self._build_lookup_tables()
+
+    def _build_lookup_tables(self):
+        """Pre-render every (tone, issue, template) text fragment once"""
+        n_tone, n_issue, n_prod = len(TONES), len(ISSUES), len(PRODUCTS)
+        n_sent = len(ISSUE_SENTENCES)
+
+        self.openers = np.array([TONE_OPENERS[t].format(product=p) + ' '
+                                 for t in TONES for p in PRODUCTS], dtype=object)
+        self.issue_heads = np.array([s.split('{detail}')[0].format(issue=i)
+                                     for i in ISSUES for s in ISSUE_SENTENCES], dtype=object)
+        self.issue_tails = np.array([s.split('{detail}')[1] + ' ' for s in ISSUE_SENTENCES],
+                                    dtype=object)
+        self.closings = {label: np.array(c, dtype=object) for label, c in CLOSINGS.items()}
+        self.summaries = np.array([s.format(issue=i, product=p)
+                                   for s in SUMMARY_TEMPLATES for i in ISSUES for p in PRODUCTS],
+                                  dtype=object)
+        self.products = np.array(PRODUCTS, dtype=object)
+
+        self.tone_sentiment = np.array([SENTIMENT_LABELS.index(TONE_SENTIMENT[t]) for t in TONES])
+        self.issue_category = np.array([CATEGORY_LABELS.index(ISSUE_CATEGORY[i]) for i in ISSUES])
+
+        # Cumulative urgency probabilities per (tone, issue)
+        probs = np.array([TONE_URGENCY[t] for t in TONES], dtype=float)[:, None, :].repeat(n_issue, 1)
+        severe = np.array([i in SEVERE_ISSUES for i in ISSUES])
+        probs[:, severe, 0] += 0.15
+        probs /= probs.sum(axis=2, keepdims=True)
+        self.urgency_cdf = probs.cumsum(axis=2)
+
+        self.shape = (n_tone, n_issue, n_prod, n_sent)
+
+    def _details(self, rng: np.random.RandomState, n: int) -> np.ndarray:
+        """Random error code / account ID / time detail for each ticket"""
+        kind = rng.randint(0, 3, size=n)
+        codes = np.array(ERROR_CODES, dtype=object)[rng.randint(0, len(ERROR_CODES), size=n)]
+        accounts = rng.randint(100000, 999999, size=n).astype(str).astype(object)
+        hours = rng.randint(0, 24, size=n).astype(str).astype(object)
+
+        details = np.empty(n, dtype=object)
+        details[kind == 0] = 'with error ' + codes[kind == 0]
+        details[kind == 1] = '(account ACC-' + accounts[kind == 1] + ')'
+        details[kind == 2] = 'at ' + hours[kind == 2] + ':00 UTC'
+        return details
+
+    def generate_chunk(self, start_id: int, n: int, rng: np.random.RandomState) -> pd.DataFrame:
+        """Generate n labeled tickets with ids starting at start_id"""
+        n_tone, n_issue, n_prod, n_sent = self.shape
+        tone = rng.randint(0, n_tone, size=n)
+        issue = rng.randint(0, n_issue, size=n)
+        product = rng.randint(0, n_prod, size=n)
+        sentence = rng.randint(0, n_sent, size=n)
+
+        sentiment = self.tone_sentiment[tone]
+        category = self.issue_category[issue]
+        u = rng.random_sample(n)
+        urgency = (u[:, None] > self.urgency_cdf[tone, issue]).sum(axis=1).clip(0, 2)
+
+        # The closing sentence follows the clean sentiment, so the noise below is not
+        # visible in the text
+        closing = np.empty(n, dtype=object)
+        for idx, label in enumerate(SENTIMENT_LABELS):
+            mask = sentiment == idx
+            options = self.closings[label]
+            closing[mask] = options[rng.randint(0, len(options), size=mask.sum())]
+
+        # Label noise keeps downstream models from scoring a perfect 1.0
+        if self.label_noise > 0:
+            flip = rng.random_sample(n) < self.label_noise
+            sentiment = np.where(flip, rng.randint(0, len(SENTIMENT_LABELS), size=n), sentiment)
+            flip = rng.random_sample(n) < self.label_noise
+            category = np.where(flip, rng.randint(0, len(CATEGORY_LABELS), size=n), category)
+
+        sentiment_labels = np.array(SENTIMENT_LABELS, dtype=object)[sentiment]
+
+        text = (self.openers[tone * n_prod + product]
+                + self.issue_heads[issue * n_sent + sentence]
+                + self._details(rng, n)
+                + self.issue_tails[sentence]
+                + closing)
+        summary = self.summaries[rng.randint(0, len(SUMMARY_TEMPLATES), size=n) * n_issue * n_prod
+                                 + issue * n_prod + product]
+
+        # Roughly one ticket every 30 seconds, increasing with ticket_id across chunks
+        seconds = (np.arange(start_id, start_id + n, dtype=np.int64) * 30
+                   + rng.randint(0, 30, size=n))
+        timestamps = np.char.replace(np.datetime_as_string(self.start + seconds, unit='s'), 'T', ' ')
+
+        df = pd.DataFrame({
+            'ticket_id': np.arange(start_id, start_id + n, dtype=np.int64),
+            'product': pd.Categorical.from_codes(product, PRODUCTS),
+            'ticket_text': text,
+            'generated_timestamp': timestamps,
+            'sentiment': sentiment_labels,
+            'urgency': np.array(URGENCY_LABELS, dtype=object)[urgency],
+            'category': np.array(CATEGORY_LABELS, dtype=object)[category],
+            'summary': summary,
+            'error': np.nan,
+            'message': np.nan
+        })
+
+        if self.error_rate > 0:
+            failed = rng.random_sample(n) < self.error_rate
+            df.loc[failed, ['sentiment', 'urgency', 'category']] = 'Error'
+            df.loc[failed, 'summary'] = 'Analysis failed'
+
+        return df[ANALYZED_COLUMNS]
+
+    def iter_chunks(self, num_rows: int, chunk_size: int = 250_000) -> Iterator[pd.DataFrame]:
+        """Yield labeled tickets in chunks; the same seed always yields the same rows"""
+        rng = np.random.RandomState(self.seed)
+        for start in range(0, num_rows, chunk_size):
+            yield self.generate_chunk(start + 1, min(chunk_size, num_rows - start), rng)
+
+    def generate(self, num_rows: int) -> pd.DataFrame:
+        """Generate all rows in memory"""
+        return pd.concat(self.iter_chunks(num_rows), ignore_index=True)
+
+    def write_csv(self, num_rows: int, output_file: str, chunk_size: int = 250_000) -> float:
+        """Stream num_rows tickets to CSV and return rows per second"""
+        os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+        start_time = time.time()
+        written = 0
+        for i, chunk in enumerate(self.iter_chunks(num_rows, chunk_size)):
+            chunk.to_csv(output_file, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+            written += len(chunk)
+            elapsed = time.time() - start_time
+            print(f"   ✅ {written}/{num_rows} rows - {written / max(elapsed, 1e-9):,.0f} rows/s")
+        return written / max(time.time() - start_time, 1e-9)
+
+
+def main():
+    """Generate a synthetic analyzed-ticket file without calling the LLM"""
+    parser = argparse.ArgumentParser(description="LLM-free synthetic ticket generator")
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='synthetic_tickets.csv')
+    parser.add_argument('--chunk-size', type=int, default=250_000)
+    parser.add_argument('--label-noise', type=float, default=0.1)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("⚡ Synthetic Ticket Generator (no LLM)")
+    print(f"🎲 Seed: {args.seed} | Rows: {args.rows:,}")
+    print("=" * 60)
+
+    generator = SyntheticTicketGenerator(seed=args.seed, label_noise=args.label_noise,
+                                         error_rate=args.error_rate)
+    rate = generator.write_csv(args.rows, args.output, args.chunk_size)
+
+    print(f"\n🎉 Wrote {args.rows:,} tickets to '{args.output}'")
+    print(f"📊 Throughput: {rate:,.0f} rows/s ({rate * 60 / 1e6:.1f}M rows/min)")
+
+
+if __name__ == "__main__":
+    main()
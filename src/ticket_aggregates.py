@@ -0,0 +1,227 @@
+import hashlib
+import io
+import json
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+DIMENSIONS = ["sentiment", "urgency", "category", "product"]
+# Ordinal encodings used by the correlation heatmap
+SENTIMENT_SCORES = {'Negative': -1, 'Neutral': 0, 'Positive': 1}
+URGENCY_SCORES = {'Low': 0, 'Medium': 1, 'High': 2}
+TAIL_BYTES = 4096
+
+
+def complete_records(data: bytes) -> bytes:
+    """Bytes up to the end of the last complete CSV record
+
+    A newline only ends a record outside quotes: LLM text and summaries are
+    quoted fields that may span lines. Escaped quotes ("") toggle twice, so
+    quote parity alone tells whether a position is inside a field.
+    """
+    raw = np.frombuffer(data, dtype=np.uint8)
+    inside = np.cumsum(raw == ord('"')) % 2 == 1
+    ends = np.flatnonzero((raw == ord('\n')) & ~inside)
+    return data[:ends[-1] + 1] if len(ends) else b''
+
+
+def tail_digest(f, offset: int) -> str:
+    """Hash of the bytes just before the offset: detects a rewritten (not appended) file"""
+    start = max(0, offset - TAIL_BYTES)
+    f.seek(start)
+    return hashlib.sha256(f.read(offset - start)).hexdigest()
+
+
+class SummaryCube:
+    def __init__(self, counts: pd.Series):
+        """Ticket counts per distinct label combination; every chart and metric derives from it"""
+        self.counts = counts[counts > 0]
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, dimensions: List[str] = None) -> 'SummaryCube':
+        """One aggregation pass over the rows"""
+        dimensions = [d for d in (dimensions or DIMENSIONS) if d in df]
+        counts = df.groupby(dimensions, dropna=False, observed=True, sort=False).size()
+        if isinstance(counts.index, pd.MultiIndex):
+            # Plain object levels so cubes built from categorical chunks align when added
+            levels = [level.astype(object) for level in counts.index.levels]
+            counts.index = counts.index.set_levels(levels)
+        return cls(counts.astype(np.int64))
+
+    @property
+    def dimensions(self) -> List[str]:
+        return list(self.counts.index.names)
+
+    @property
+    def total(self) -> int:
+        return int(self.counts.sum())
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def __add__(self, other: 'SummaryCube') -> 'SummaryCube':
+        """Counts are additive: merging cubes equals aggregating the concatenated rows"""
+        # groupby rather than Series.add: label alignment mishandles NaN keys in a MultiIndex
+        combined = pd.concat([self.counts, other.counts])
+        levels = list(range(combined.index.nlevels))
+        counts = combined.groupby(level=levels, dropna=False, sort=False).sum()
+        return SummaryCube(counts.astype(np.int64))
+
+    def marginal(self, dimension: str, top: Optional[int] = None) -> pd.Series:
+        """Same result as df[dimension].value_counts(), ties kept in first-seen order"""
+        counts = self.counts.groupby(level=dimension, observed=True, sort=False).sum()
+        counts = counts.sort_values(ascending=False, kind='stable').rename('count')
+        return counts.head(top) if top else counts
+
+    def crosstab(self, rows: str, columns: str) -> pd.DataFrame:
+        """Same result as pd.crosstab(df[rows], df[columns])"""
+        counts = self.counts.groupby(level=[rows, columns], observed=True).sum()
+        return counts.unstack(columns, fill_value=0).sort_index().sort_index(axis=1)
+
+    def count(self, **filters) -> int:
+        """Tickets matching every dimension=value filter, e.g. count(sentiment='Negative')"""
+        mask = np.ones(len(self.counts), dtype=bool)
+        for dimension, value in filters.items():
+            mask &= self.counts.index.get_level_values(dimension) == value
+        return int(self.counts[mask].sum())
+
+    def encoded(self, top_categories: int = 6) -> pd.DataFrame:
+        """Correlation inputs per combination: ordinal sentiment/urgency and top-category one-hots"""
+        index = self.counts.index
+        encoded = pd.DataFrame({
+            'sentiment_num': index.get_level_values('sentiment').map(SENTIMENT_SCORES),
+            'urgency_num': index.get_level_values('urgency').map(URGENCY_SCORES)
+        })
+        categories = index.get_level_values('category')
+        for category in self.marginal('category', top_categories).index:
+            encoded[f'category_{category}'] = (categories == category).astype(int)
+        return encoded
+
+    def correlation(self, top_categories: int = 6) -> pd.DataFrame:
+        """Pairwise Pearson correlation weighted by combination counts
+
+        Matches encoded_df.corr() on the expanded rows without materializing them.
+        """
+        encoded = self.encoded(top_categories)
+        weights = self.counts.values.astype(np.float64)
+        columns = list(encoded.columns)
+        corr = pd.DataFrame(np.nan, index=columns, columns=columns)
+        for i, a in enumerate(columns):
+            for b in columns[i:]:
+                x, y = encoded[a].values.astype(float), encoded[b].values.astype(float)
+                valid = ~np.isnan(x) & ~np.isnan(y)
+                w, x, y = weights[valid], x[valid], y[valid]
+                if w.sum() < 2:
+                    continue
+                dx, dy = x - np.average(x, weights=w), y - np.average(y, weights=w)
+                denominator = np.sqrt((w * dx * dx).sum() * (w * dy * dy).sum())
+                if denominator > 0:
+                    corr.loc[a, b] = corr.loc[b, a] = (w * dx * dy).sum() / denominator
+        return corr
+
+
+class IncrementalAggregator:
+    def __init__(self, csv_path: str = 'analyzed_tickets.csv', state_dir: str = '.cache/analytics',
+                 chunk_size: int = 200_000):
+        """Persisted SummaryCube over an append-only CSV, advanced by a ticket_id watermark
+
+        The cube counts are sufficient statistics for every chart, the report and
+        the correlation matrix, so folding in new rows never needs the old ones.
+        """
+        self.csv_path = csv_path
+        self.state_dir = state_dir
+        self.chunk_size = chunk_size
+        self.counts_file = os.path.join(state_dir, 'cube_counts.csv')
+        self.state_file = os.path.join(state_dir, 'state.json')
+
+    @staticmethod
+    def _valid(chunk: pd.DataFrame) -> pd.DataFrame:
+        """Same cleaning as DataVisualizer.load_data"""
+        return chunk[chunk['sentiment'] != 'Error']
+
+    def load_state(self):
+        """Return (cube, state) or (None, None) when nothing usable is persisted"""
+        if not (os.path.exists(self.state_file) and os.path.exists(self.counts_file)):
+            return None, None
+        with open(self.state_file) as f:
+            state = json.load(f)
+        frame = pd.read_csv(self.counts_file, dtype={d: object for d in state['dimensions']})
+        counts = frame.set_index(state['dimensions'])['count']
+        return SummaryCube(counts), state
+
+    def save_state(self, cube: SummaryCube, state: Dict):
+        """Write the counts, then the state file that points at them"""
+        os.makedirs(self.state_dir, exist_ok=True)
+        cube.counts.rename('count').reset_index().to_csv(self.counts_file, index=False)
+        tmp = self.state_file + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp, self.state_file)
+
+    def rebuild(self) -> SummaryCube:
+        """Aggregate the whole file in chunks and persist the state"""
+        header = pd.read_csv(self.csv_path, nrows=0).columns.tolist()
+        dimensions = [d for d in DIMENSIONS if d in header]
+        cube, watermark = None, None
+        for chunk in pd.read_csv(self.csv_path, usecols=['ticket_id'] + dimensions,
+                                 chunksize=self.chunk_size):
+            chunk_cube = SummaryCube.from_frame(self._valid(chunk), dimensions)
+            cube = chunk_cube if cube is None else cube + chunk_cube
+            if len(chunk):
+                watermark = max(watermark or chunk['ticket_id'].max(), chunk['ticket_id'].max())
+        cube = cube if cube is not None else SummaryCube.from_frame(
+            pd.DataFrame(columns=dimensions), dimensions)
+
+        with open(self.csv_path, 'rb') as f:
+            offset = f.seek(0, os.SEEK_END)
+            digest = tail_digest(f, offset)
+        self.save_state(cube, {'source': os.path.abspath(self.csv_path), 'header': header,
+                               'dimensions': dimensions, 'offset': offset, 'tail_sha256': digest,
+                               'watermark': None if watermark is None else int(watermark),
+                               'rows': cube.total})
+        print(f"🧮 Full aggregation: {cube.total} tickets → {len(cube)} combinations")
+        return cube
+
+    def update(self, full_refresh: bool = False) -> SummaryCube:
+        """Fold only the rows appended since the last run into the persisted cube"""
+        cube, state = (None, None) if full_refresh else self.load_state()
+        header = pd.read_csv(self.csv_path, nrows=0).columns.tolist()
+        if state is None or state['source'] != os.path.abspath(self.csv_path) or state['header'] != header:
+            return self.rebuild()
+
+        with open(self.csv_path, 'rb') as f:
+            size = f.seek(0, os.SEEK_END)
+            if size < state['offset'] or tail_digest(f, state['offset']) != state['tail_sha256']:
+                print("⚠️ analyzed_tickets.csv was rewritten, not appended - rebuilding aggregates")
+                return self.rebuild()
+            f.seek(state['offset'])
+            appended = f.read()
+
+        # Only complete records; a row still being written is picked up next time
+        appended = complete_records(appended)
+        if not appended.strip():
+            print(f"✅ Aggregates up to date (watermark ticket_id={state['watermark']})")
+            return cube
+
+        try:
+            new_rows = pd.read_csv(io.BytesIO(appended), header=None, names=header,
+                                   usecols=['ticket_id'] + state['dimensions'])
+            new_rows['ticket_id'] = pd.to_numeric(new_rows['ticket_id'], errors='raise')
+        except (ValueError, pd.errors.ParserError) as e:
+            print(f"⚠️ Could not parse the appended rows ({e}) - rebuilding aggregates")
+            return self.rebuild()
+        if state['watermark'] is not None:
+            new_rows = new_rows[new_rows['ticket_id'] > state['watermark']]
+        if len(new_rows):
+            cube = cube + SummaryCube.from_frame(self._valid(new_rows), state['dimensions'])
+            state['watermark'] = int(max(state['watermark'] or 0, new_rows['ticket_id'].max()))
+        state['offset'] += len(appended)
+        with open(self.csv_path, 'rb') as f:
+            state['tail_sha256'] = tail_digest(f, state['offset'])
+        state['rows'] = cube.total
+        self.save_state(cube, state)
+        print(f"➕ Folded {len(new_rows)} new tickets into the aggregates "
+              f"(watermark ticket_id={state['watermark']})")
+        return cube
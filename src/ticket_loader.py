@@ -0,0 +1,128 @@
+import argparse
+import time
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ticket_aggregates import SummaryCube
+
+LABEL_COLUMNS = ["sentiment", "urgency", "category", "product"]
+TEXT_COLUMNS = ["ticket_text", "summary"]
+# What each consumer actually reads; the free-text and the junk error/message columns stay on disk
+PROJECTIONS = {
+    "dashboard": ["ticket_id", "sentiment", "urgency", "category"],
+    "visualizer": ["ticket_id", "sentiment", "urgency", "category", "product"],
+    "preview": ["ticket_id", "product", "ticket_text", "generated_timestamp",
+                "sentiment", "urgency", "category", "summary"],
+}
+CHUNK_SIZE = 100_000
+
+
+def _columns(path: str, consumer: str, columns: Optional[List[str]]) -> List[str]:
+    """Requested columns that exist in the file, in file order"""
+    wanted = set(columns or PROJECTIONS[consumer])
+    return [c for c in pd.read_csv(path, nrows=0).columns if c in wanted]
+
+
+def _dtypes(columns: List[str]) -> Dict[str, str]:
+    return {c: "category" for c in columns if c in LABEL_COLUMNS}
+
+
+def compact_ids(ids: pd.Series) -> pd.Series:
+    """Smallest unsigned integer dtype that holds the ids (unchanged if not clean integers)"""
+    if ids.isna().any() or not pd.api.types.is_integer_dtype(ids) or (len(ids) and ids.min() < 0):
+        return ids
+    return pd.to_numeric(ids, downcast="unsigned")
+
+
+def iter_tickets(path: str, consumer: str = "dashboard", columns: List[str] = None,
+                 chunksize: int = CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """Projected, typed chunks: memory is bounded by the chunk size"""
+    usecols = _columns(path, consumer, columns)
+    for chunk in pd.read_csv(path, usecols=usecols, dtype=_dtypes(usecols), chunksize=chunksize):
+        if "ticket_id" in chunk:
+            chunk["ticket_id"] = compact_ids(chunk["ticket_id"])
+        yield chunk
+
+
+def read_tickets(path: str, consumer: str = "dashboard", columns: List[str] = None,
+                 nrows: int = None) -> pd.DataFrame:
+    """Projected, typed DataFrame: categorical labels and compact integer ids"""
+    usecols = _columns(path, consumer, columns)
+    df = pd.read_csv(path, usecols=usecols, dtype=_dtypes(usecols), nrows=nrows)
+    if "ticket_id" in df:
+        df["ticket_id"] = compact_ids(df["ticket_id"])
+    return df
+
+
+def read_text(path: str, ticket_ids: Iterable[int], columns: List[str] = None,
+              chunksize: int = CHUNK_SIZE) -> pd.DataFrame:
+    """Lazy text: ticket_text/summary for just the requested tickets, streamed from disk"""
+    wanted = np.unique(np.fromiter(ticket_ids, dtype=np.int64))
+    usecols = _columns(path, "preview", ["ticket_id"] + (columns or TEXT_COLUMNS))
+    parts = []
+    for chunk in pd.read_csv(path, usecols=usecols, chunksize=chunksize):
+        match = chunk[chunk["ticket_id"].isin(wanted)]
+        if len(match):
+            parts.append(match)
+    return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=usecols)
+
+
+def aggregate_labels(path: str, consumer: str = "dashboard", chunksize: int = CHUNK_SIZE) -> SummaryCube:
+    """Label counts for the whole file without ever holding more than one chunk"""
+    dimensions = [c for c in _columns(path, consumer, None) if c in LABEL_COLUMNS]
+    cube = None
+    for chunk in iter_tickets(path, consumer, dimensions, chunksize):
+        chunk_cube = SummaryCube.from_frame(chunk, dimensions)
+        cube = chunk_cube if cube is None else cube + chunk_cube
+    return cube if cube is not None else SummaryCube.from_frame(pd.DataFrame(columns=dimensions),
+                                                                dimensions)
+
+
+def memory_report(df: pd.DataFrame, title: str = None) -> pd.DataFrame:
+    """Deep memory use per column (MB)"""
+    usage = df.memory_usage(deep=True, index=False)
+    report = pd.DataFrame({"Column": usage.index, "Dtype": [str(df[c].dtype) for c in usage.index],
+                           "MB": (usage.values / 1024 ** 2).round(3)})
+    report.loc[len(report)] = ["TOTAL", "", round(usage.sum() / 1024 ** 2, 3)]
+    if title:
+        print(f"\n🧠 {title}: {len(df):,} rows")
+        print(report.to_string(index=False))
+    return report
+
+
+def main():
+    """Compare a default full read with the projected, typed loads"""
+    parser = argparse.ArgumentParser(description="Memory footprint of the ticket loaders")
+    parser.add_argument('path', nargs='?', default='analyzed_tickets.csv')
+    args = parser.parse_args()
+
+    rows = []
+    start = time.perf_counter()
+    full = pd.read_csv(args.path)
+    rows.append({"Load": "pd.read_csv (all columns, object dtypes)",
+                 "MB": memory_report(full, "Default read")["MB"].iloc[-1],
+                 "Seconds": round(time.perf_counter() - start, 2)})
+    del full
+
+    for consumer in ["dashboard", "visualizer"]:
+        start = time.perf_counter()
+        df = read_tickets(args.path, consumer)
+        rows.append({"Load": f"read_tickets({consumer!r})",
+                     "MB": memory_report(df, f"Projected read for {consumer}")["MB"].iloc[-1],
+                     "Seconds": round(time.perf_counter() - start, 2)})
+        del df
+
+    start = time.perf_counter()
+    cube = aggregate_labels(args.path)
+    rows.append({"Load": "aggregate_labels (streamed, counts only)",
+                 "MB": round(cube.counts.memory_usage(deep=True) / 1024 ** 2, 3),
+                 "Seconds": round(time.perf_counter() - start, 2)})
+
+    print("\n📊 Memory footprint by loader:")
+    print(pd.DataFrame(rows).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+import argparse
+import os
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from ticket_aggregates import DIMENSIONS, SummaryCube
+from ticket_vocabulary import ANALYZED_COLUMNS
+
+# Set TICKET_DB to make the generator, analyzer, visualizer and dashboard use the store
+DB_PATH = os.environ.get("TICKET_DB", "smartdesk.db")
+COLUMNS = ANALYZED_COLUMNS
+INDEXED = ["sentiment", "urgency", "category", "product"]
+# Analyzer output: only valid for the ticket_text it was produced from
+LABEL_COLUMNS = ["sentiment", "urgency", "category", "summary", "error", "message"]
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tickets (
+    ticket_id INTEGER PRIMARY KEY,
+    product TEXT,
+    ticket_text TEXT,
+    generated_timestamp TEXT,
+    sentiment TEXT,
+    urgency TEXT,
+    category TEXT,
+    summary TEXT,
+    error TEXT,
+    message TEXT,
+    updated_at REAL
+);
+""" + "".join(f"CREATE INDEX IF NOT EXISTS idx_tickets_{c} ON tickets({c});\n" for c in INDEXED) + """
+CREATE INDEX IF NOT EXISTS idx_tickets_urgency_sentiment ON tickets(urgency, sentiment);
+CREATE TABLE IF NOT EXISTS store_meta (key TEXT PRIMARY KEY, value);
+INSERT OR IGNORE INTO store_meta VALUES ('store_id', lower(hex(randomblob(8))));
+INSERT OR IGNORE INTO store_meta VALUES ('changes', 0);
+""" + "".join(f"""CREATE TRIGGER IF NOT EXISTS tickets_{event.lower()} AFTER {event} ON tickets
+BEGIN UPDATE store_meta SET value = value + 1 WHERE key = 'changes'; END;
+""" for event in ["INSERT", "UPDATE", "DELETE"])
+
+
+def store_enabled() -> bool:
+    """Components switch from CSV files to the store when TICKET_DB is set"""
+    return bool(os.environ.get("TICKET_DB"))
+
+
+def _python(value):
+    """SQLite-friendly scalar (NaN → NULL, NumPy → Python)"""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    if hasattr(value, 'item'):
+        return value.item()
+    if isinstance(value, pd.Timestamp):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    return value
+
+
+class TicketStore:
+    def __init__(self, path: str = DB_PATH, timeout: float = 30.0):
+        """Tickets and labels in SQLite (WAL): concurrent readers with one writer, indexed queries"""
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")  # Durable at checkpoints; safe with WAL
+        self.conn.executescript(SCHEMA)
+
+    def data_version(self) -> int:
+        """Changes whenever another connection commits: a cheap cache key for readers"""
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def change_key(self) -> str:
+        """Persistent, monotonic version of the data: the database's id and its count of
+        row changes (kept by triggers, so writes from any connection or process count)"""
+        meta = dict(self.conn.execute(
+            "SELECT key, value FROM store_meta WHERE key IN ('store_id', 'changes')").fetchall())
+        return f"{meta['store_id']}:{meta['changes']}"
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self) -> 'TicketStore':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def upsert(self, rows: Union[pd.DataFrame, Iterable[Dict]], batch_size: int = 5000) -> int:
+        """Insert or update rows by ticket_id; only the columns present are written
+
+        Labels can be upserted onto tickets the generator wrote earlier without
+        touching their text, and vice versa. Writing a different ticket_text without
+        labels clears the old labels, so a regenerated ticket is analyzed again.
+        """
+        frame = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(list(rows))
+        if frame.empty:
+            return 0
+        columns = [c for c in COLUMNS if c in frame.columns]
+        if "ticket_id" not in columns:
+            raise ValueError("upsert needs a ticket_id column")
+        updates = [f"{c}=excluded.{c}" for c in columns if c != "ticket_id"]
+        if "ticket_text" in columns:
+            updates += [f"{c}=CASE WHEN tickets.ticket_text IS excluded.ticket_text THEN tickets.{c} END"
+                        for c in LABEL_COLUMNS if c not in columns]
+        updates = ", ".join(updates)
+        sql = (f"INSERT INTO tickets ({', '.join(columns)}, updated_at) "
+               f"VALUES ({', '.join('?' for _ in columns)}, ?) "
+               f"ON CONFLICT(ticket_id) DO UPDATE SET {updates}, updated_at=excluded.updated_at")
+        now = time.time()
+        values = frame[columns].to_numpy(dtype=object)
+        with self.conn:  # One transaction per call
+            for start in range(0, len(values), batch_size):
+                self.conn.executemany(sql, ([_python(v) for v in row] + [now]
+                                            for row in values[start:start + batch_size]))
+        return len(values)
+
+    def count(self, **filters) -> int:
+        """Tickets matching column=value filters, e.g. count(urgency='High', sentiment='Negative')"""
+        where, params = self._where(filters)
+        return self.conn.execute(f"SELECT COUNT(*) FROM tickets{where}", params).fetchone()[0]
+
+    def label_counts(self, column: str, **filters) -> pd.Series:
+        """Same result as df[column].value_counts(), from the index"""
+        if column not in INDEXED:
+            raise ValueError(f"{column} is not an indexed label column")
+        where, params = self._where(filters)
+        where += (" AND" if where else " WHERE") + f" {column} IS NOT NULL"
+        rows = self.conn.execute(f"SELECT {column}, COUNT(*) AS n FROM tickets{where} "
+                                 f"GROUP BY {column} ORDER BY n DESC", params).fetchall()
+        return pd.Series({label: n for label, n in rows}, name="count", dtype=np.int64).rename_axis(column)
+
+    def cube(self, exclude_errors: bool = True) -> SummaryCube:
+        """Label-combination counts in one GROUP BY - what the charts and the report need"""
+        dims = ", ".join(DIMENSIONS)
+        # Generated-but-unlabeled tickets (sentiment NULL) are never part of the analysis
+        where = " WHERE sentiment IS NOT NULL" + (" AND sentiment != 'Error'" if exclude_errors else "")
+        # Ordered by first ticket so label ties rank as in value_counts() on the CSV
+        frame = pd.read_sql_query(f"SELECT {dims}, COUNT(*) AS n FROM tickets{where} "
+                                  f"GROUP BY {dims} ORDER BY MIN(ticket_id)", self.conn)
+        return SummaryCube(frame.set_index(DIMENSIONS)["n"].astype(np.int64))
+
+    def query(self, columns: List[str] = None, limit: Optional[int] = None, offset: int = 0,
+              **filters) -> pd.DataFrame:
+        """Rows by indexed filters, in ticket_id order"""
+        columns = [c for c in (columns or COLUMNS) if c in COLUMNS]
+        where, params = self._where(filters)
+        sql = f"SELECT {', '.join(columns)} FROM tickets{where} ORDER BY ticket_id"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        return pd.read_sql_query(sql, self.conn, params=params)
+
+    def get(self, ticket_id: int) -> Optional[Dict]:
+        """One ticket by primary key"""
+        frame = self.query(ticket_id=ticket_id)
+        return frame.iloc[0].to_dict() if len(frame) else None
+
+    def unlabeled(self, limit: Optional[int] = None) -> pd.DataFrame:
+        """Generated tickets the analyzer has not labeled yet"""
+        sql = ("SELECT ticket_id, product, ticket_text, generated_timestamp FROM tickets "
+               "WHERE sentiment IS NULL ORDER BY ticket_id")
+        return pd.read_sql_query(sql + (f" LIMIT {int(limit)}" if limit else ""), self.conn)
+
+    def labeled(self) -> pd.DataFrame:
+        """Tickets with analyzer output, for warming caches such as the near-duplicate index"""
+        sql = ("SELECT ticket_id, ticket_text, sentiment, urgency, category, summary FROM tickets "
+               "WHERE sentiment IS NOT NULL ORDER BY ticket_id")
+        return pd.read_sql_query(sql, self.conn)
+
+    def unlabeled_count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM tickets WHERE sentiment IS NULL").fetchone()[0]
+
+    @staticmethod
+    def _where(filters: Dict):
+        unknown = set(filters) - set(COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(sorted(unknown))}")
+        if not filters:
+            return "", []
+        return " WHERE " + " AND ".join(f"{c} = ?" for c in filters), [_python(v) for v in filters.values()]
+
+    def import_csv(self, path: str, chunksize: int = 50_000) -> int:
+        """Load a generated/analyzed CSV (upsert, so re-importing is safe)"""
+        total = 0
+        for chunk in pd.read_csv(path, chunksize=chunksize):
+            total += self.upsert(chunk)
+        return total
+
+    def export_csv(self, path: str, chunksize: int = 50_000) -> int:
+        """Write the analyzed_tickets.csv layout for tools that still read CSV"""
+        total, header = 0, True
+        tmp = path + '.tmp'
+        for chunk in pd.read_sql_query(f"SELECT {', '.join(COLUMNS)} FROM tickets ORDER BY ticket_id",
+                                       self.conn, chunksize=chunksize):
+            chunk.to_csv(tmp, mode='w' if header else 'a', header=header, index=False)
+            header = False
+            total += len(chunk)
+        if header:
+            pd.DataFrame(columns=COLUMNS).to_csv(tmp, index=False)
+        os.replace(tmp, path)
+        return total
+
+
+def _timed(fn, repeats: int = 3) -> float:
+    """Best-of-n wall time in milliseconds"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def benchmark(source_csv: str, workdir: str, update_batch: int = 50) -> pd.DataFrame:
+    """CSV full-file path vs the SQLite store on the same data and the same operations"""
+    os.makedirs(workdir, exist_ok=True)
+    csv_path = os.path.join(workdir, 'bench.csv')
+    db_path = os.path.join(workdir, 'bench.db')
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+    df = pd.read_csv(source_csv)
+    df.to_csv(csv_path, index=False)
+    store = TicketStore(db_path)
+    import_ms = _timed(lambda: store.import_csv(csv_path), repeats=1)
+
+    rng = np.random.RandomState(42)
+    ids = df['ticket_id'].values
+    batch = df.sample(update_batch, random_state=42)[['ticket_id', 'sentiment', 'urgency', 'category']]
+    probe = int(ids[rng.randint(len(ids))])
+
+    def csv_update():
+        # What the checkpoint/final save does today: rewrite the whole file
+        frame = pd.read_csv(csv_path)
+        frame = frame.set_index('ticket_id')
+        frame.update(batch.set_index('ticket_id'))
+        frame.reset_index().to_csv(csv_path, index=False)
+
+    operations = [
+        (f"update {update_batch} labels", csv_update, lambda: store.upsert(batch)),
+        ("label counts (3 columns)",
+         lambda: [pd.read_csv(csv_path, usecols=[c])[c].value_counts() for c in
+                  ('sentiment', 'urgency', 'category')],
+         lambda: [store.label_counts(c) for c in ('sentiment', 'urgency', 'category')]),
+        ("count High & Negative",
+         lambda: len(pd.read_csv(csv_path, usecols=['sentiment', 'urgency']).query(
+             "urgency == 'High' and sentiment == 'Negative'")),
+         lambda: store.count(urgency='High', sentiment='Negative')),
+        ("lookup one ticket_id",
+         lambda: pd.read_csv(csv_path).query(f"ticket_id == {probe}"),
+         lambda: store.get(probe)),
+        ("visualizer cube",
+         lambda: SummaryCube.from_frame(pd.read_csv(csv_path, usecols=DIMENSIONS)),
+         lambda: store.cube()),
+        ("dashboard preview (50 rows)",
+         lambda: pd.read_csv(csv_path).head(50),
+         lambda: store.query(limit=50)),
+    ]
+    rows = [{"Operation": "import CSV", "Rows": len(df), "CsvMs": None, "SqliteMs": round(import_ms, 1),
+             "Speedup": None}]
+    for name, csv_fn, db_fn in operations:
+        csv_ms, db_ms = _timed(csv_fn), _timed(db_fn)
+        rows.append({"Operation": name, "Rows": len(df), "CsvMs": round(csv_ms, 2),
+                     "SqliteMs": round(db_ms, 2), "Speedup": round(csv_ms / max(db_ms, 1e-6), 1)})
+    store.close()
+    return pd.DataFrame(rows)
+
+
+def main():
+    """Import/export between CSV and the store, or benchmark the two paths"""
+    parser = argparse.ArgumentParser(description="SQLite ticket store")
+    parser.add_argument('command', choices=['import', 'export', 'stats', 'benchmark'])
+    parser.add_argument('--db', default=DB_PATH)
+    parser.add_argument('--csv', default='analyzed_tickets.csv')
+    parser.add_argument('--workdir', default='.cache/store_benchmark')
+    parser.add_argument('--output', default='reports/benchmarks/ticket_store.csv')
+    args = parser.parse_args()
+
+    if args.command == 'benchmark':
+        results = benchmark(args.csv, args.workdir)
+        print(results.to_string(index=False))
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        results.to_csv(args.output, index=False)
+        print(f"💾 Saved benchmark → {args.output}")
+        return
+
+    with TicketStore(args.db) as store:
+        if args.command == 'import':
+            start = time.time()
+            print(f"✅ Imported {store.import_csv(args.csv):,} rows from {args.csv} into {args.db} "
+                  f"in {time.time() - start:.1f}s")
+        elif args.command == 'export':
+            print(f"✅ Exported {store.export_csv(args.csv):,} rows from {args.db} to {args.csv}")
+        else:
+            print(f"📊 {store.count():,} tickets, {store.unlabeled_count():,} unlabeled")
+            for column in ('sentiment', 'urgency', 'category'):
+                print(store.label_counts(column).to_string(), "\n")
+
+
+if __name__ == "__main__":
+    main()
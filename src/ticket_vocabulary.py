@@ -0,0 +1,52 @@
+# Shared vocabularies for ticket generation and analysis
+
+PRODUCTS = [
+    "CloudSync Pro",
+    "FinanceManager SaaS",
+    "StreamFlix Subscription",
+    "HomeSecurity Hub",
+    "GymFlow App",
+    "OfficeSuite 365",
+    "DataBackup Pro",
+    "EmailShield Security",
+    "ProjectFlow Manager",
+    "CustomerCRM Platform"
+]
+
+ISSUES = [
+    "login problems", "billing dispute", "feature request",
+    "bug report", "account deletion", "performance issues",
+    "subscription renewal", "data sync error", "mobile app crash",
+    "payment failure", "account setup", "password reset",
+    "invoice discrepancy", "feature not working", "slow performance"
+]
+
+# Customer tones used when prompting the generator
+TONES = ["frustrated", "neutral", "happy", "confused", "angry", "urgent", "satisfied", "disappointed"]
+
+# Labels produced by the analyzer
+SENTIMENT_LABELS = ["Negative", "Neutral", "Positive"]
+URGENCY_LABELS = ["High", "Medium", "Low"]
+CATEGORY_LABELS = ["Billing", "Login Issue", "Feature Request", "Bug Report",
+                   "Technical Issue", "Account Management", "Payment Issue", "Other"]
+
+ANALYZED_COLUMNS = ["ticket_id", "product", "ticket_text", "generated_timestamp",
+                    "sentiment", "urgency", "category", "summary", "error", "message"]
+
+# Most likely analyzer labels for each generator input
+TONE_SENTIMENT = {
+    "frustrated": "Negative", "angry": "Negative", "disappointed": "Negative", "urgent": "Negative",
+    "neutral": "Neutral", "confused": "Neutral",
+    "happy": "Positive", "satisfied": "Positive"
+}
+
+ISSUE_CATEGORY = {
+    "login problems": "Login Issue", "password reset": "Login Issue",
+    "billing dispute": "Billing", "subscription renewal": "Billing", "invoice discrepancy": "Billing",
+    "feature request": "Feature Request",
+    "bug report": "Bug Report", "mobile app crash": "Bug Report", "feature not working": "Bug Report",
+    "performance issues": "Technical Issue", "data sync error": "Technical Issue",
+    "slow performance": "Technical Issue",
+    "account deletion": "Account Management", "account setup": "Account Management",
+    "payment failure": "Payment Issue"
+}
@@ -0,0 +1,211 @@
+import argparse
+import heapq
+import itertools
+import os
+import re
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ticket_vocabulary import URGENCY_LABELS
+
+URGENCY_MODEL = 'Models/urgency_best.joblib'
+# Cue weights for the no-model fallback: urgency/anger and severe issues push up, calm requests down
+URGENCY_KEYWORDS = {
+    r"\burgent(ly)?\b": 2.0, r"\basap\b": 2.0, r"\bimmediately\b": 1.5, r"\bright now\b": 1.5,
+    r"\bemergency\b": 2.0, r"\bcritical\b": 1.5, r"\bunacceptable\b": 1.5, r"\bangry\b": 1.0,
+    r"\bfrustrat\w*": 1.0, r"\boutage\b|\bis down\b": 1.5, r"\bcrash\w*": 1.0,
+    r"\bpayment fail\w*": 1.0, r"\bdata sync\b": 1.0, r"\bbilling dispute\b": 1.0,
+    r"\baccount deletion\b": 1.0, r"\blogin\b|\blocked out\b": 0.5, r"\brefund\b|\bcharged\b": 0.5,
+    r"\bsatisf\w*": -1.0, r"\bhappy\b|\blove\b|\bgreat\b": -1.0, r"\bfeature request\b": -1.0,
+    r"\bquestion\b|\bwondering\b|\bconfus\w*": -0.5,
+}
+_KEYWORD_PATTERNS = [(re.compile(pattern, re.IGNORECASE), weight) for pattern, weight in URGENCY_KEYWORDS.items()]
+
+
+def keyword_scores(texts: List[str]) -> np.ndarray:
+    """Cheap urgency estimate in [0, 1] from cue words and shouting"""
+    scores = np.empty(len(texts))
+    for i, text in enumerate(texts):
+        text = str(text)
+        raw = sum(weight for pattern, weight in _KEYWORD_PATTERNS if pattern.search(text))
+        raw += 0.5 * min(text.count('!'), 3) + (1.0 if re.search(r"\b[A-Z]{4,}\b", text) else 0.0)
+        scores[i] = 1 / (1 + np.exp(-(raw - 1.0)))
+    return scores
+
+
+def model_scores(texts: List[str], model_path: str = URGENCY_MODEL) -> np.ndarray:
+    """Expected urgency in [0, 1] (P(High) + P(Medium) / 2) from the trained pipeline, one batched call"""
+    import joblib
+
+    pipeline = joblib.load(model_path)
+    texts = [str(t) for t in texts]
+    if hasattr(pipeline, 'predict_proba'):
+        proba = pipeline.predict_proba(texts)
+    else:
+        # Margin models (LinearSVC, picked when it is cheapest) only have decision scores
+        print(f"ℹ️ {model_path} has no predict_proba - using a softmax of decision_function")
+        scores = np.asarray(pipeline.decision_function(texts), dtype=float)
+        if scores.ndim == 1:
+            scores = np.column_stack([-scores, scores])  # Binary: one margin for classes_[1]
+        scores = np.exp(scores - scores.max(axis=1, keepdims=True))
+        proba = scores / scores.sum(axis=1, keepdims=True)
+    classes = np.asarray(pipeline.classes_)
+    label_classes = getattr(pipeline, 'label_classes_', None)
+    if label_classes is not None:
+        classes = np.asarray(label_classes)[classes]  # Encoded ints → label names
+    weights = np.array([{'High': 1.0, 'Medium': 0.5}.get(str(c), 0.0) for c in classes])
+    return proba @ weights
+
+
+def prescore(texts: List[str], method: str = 'auto', model_path: str = URGENCY_MODEL) -> np.ndarray:
+    """Urgency pre-scores for dispatch order: the persisted model if it loads, else keywords"""
+    if method in ('auto', 'model'):
+        try:
+            scores = model_scores(texts, model_path)
+            print(f"🎯 Pre-scored {len(texts)} tickets with {model_path}")
+            return scores
+        except Exception as e:
+            if method == 'model':
+                raise
+            print(f"⚠️ Urgency model unavailable ({type(e).__name__}: {e}) - using keyword heuristics")
+    scores = keyword_scores(texts)
+    print(f"🎯 Pre-scored {len(texts)} tickets with keyword heuristics")
+    return scores
+
+
+class UrgencyScheduler:
+    def __init__(self, max_boost_seconds: float = 1800.0):
+        """Priority queue of tickets: likely-urgent first, with aging so nothing starves
+
+        Each ticket's key is a virtual deadline, arrival - score * max_boost_seconds:
+        a score-1.0 ticket overtakes tickets that arrived up to max_boost_seconds
+        before it, never more, so an old low-score ticket eventually wins over any
+        stream of new urgent ones. Keys are fixed at push time, so the heap stays valid.
+        """
+        self.max_boost_seconds = max_boost_seconds
+        self.heap = []
+        self.order = itertools.count()  # FIFO among equal keys
+
+    def push(self, item, score: float, arrival: float = 0.0):
+        heapq.heappush(self.heap, (arrival - score * self.max_boost_seconds, next(self.order), item))
+
+    def pop(self):
+        return heapq.heappop(self.heap)[2]
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+
+def arrival_seconds(df: pd.DataFrame, seconds_per_ticket: float = 3.5) -> np.ndarray:
+    """Ticket creation times (seconds since the oldest)
+
+    The generator stamps a whole batch with one timestamp, so when the times are
+    missing or all equal, tickets are taken to arrive in ticket_id (else file) order,
+    one every seconds_per_ticket - otherwise aging would have no effect.
+    """
+    times = pd.to_datetime(df['generated_timestamp'], errors='coerce') if 'generated_timestamp' in df else None
+    if times is None or times.nunique() <= 1:
+        order = (df['ticket_id'].rank(method='first').to_numpy() - 1 if 'ticket_id' in df
+                 else np.arange(len(df), dtype=float))
+        return order * seconds_per_ticket
+    seconds = (times - times.min()).dt.total_seconds()
+    return seconds.fillna(seconds.max()).to_numpy()
+
+
+def check_aging(max_boost_seconds: float = 1800.0, interval: float = 3.5) -> int:
+    """Replay one score-0 ticket followed by a steady stream of score-1 tickets
+
+    Returns how many urgent tickets overtook it; raises if it was starved past the
+    max_boost_seconds bound, i.e. if aging does not let the old ticket through.
+    """
+    scheduler = UrgencyScheduler(max_boost_seconds)
+    scheduler.push('old', 0.0, 0.0)
+    overtaken, arrival = 0, 0.0
+    while True:
+        arrival += interval
+        scheduler.push('urgent', 1.0, arrival)
+        if scheduler.pop() == 'old':
+            break
+        overtaken += 1
+    bound = int(max_boost_seconds // interval)
+    if overtaken > bound:
+        raise AssertionError(f"Low-priority ticket overtaken {overtaken} times (bound {bound})")
+    return overtaken
+
+
+def time_to_label_report(records: pd.DataFrame, percentiles=(50, 90, 99)) -> pd.DataFrame:
+    """Time-to-label percentiles (minutes) per labeled urgency class, scheduled vs file order
+
+    records: one row per ticket analyzed in the run with position (file order),
+    urgency (the label it received), service_seconds and labeled_seconds (since the run started).
+    The file-order column replays the same service times in file order.
+    """
+    records = records.sort_values('position')
+    fifo = records['service_seconds'].cumsum()
+    columns = {'scheduled': records['labeled_seconds'], 'file_order': fifo}
+    rows = []
+    for urgency in URGENCY_LABELS + ['All']:
+        mask = records['urgency'].eq(urgency) if urgency != 'All' else pd.Series(True, index=records.index)
+        if not mask.any():
+            continue
+        row = {'Urgency': urgency, 'Tickets': int(mask.sum())}
+        for name, seconds in columns.items():
+            for p in percentiles:
+                row[f'{name}_p{p}_min'] = round(float(np.percentile(seconds[mask], p)) / 60, 2)
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def simulate(labeled_file: str, seconds_per_ticket: float, method: str = 'auto',
+             max_boost_seconds: float = 1800.0, model_path: str = URGENCY_MODEL) -> pd.DataFrame:
+    """Replay an analyzed file at a constant service time to compare dispatch orders offline"""
+    df = pd.read_csv(labeled_file)
+    df = df[df['urgency'].isin(URGENCY_LABELS)].reset_index(drop=True)
+    scheduler = UrgencyScheduler(max_boost_seconds)
+    for position, (score, arrival) in enumerate(zip(prescore(df['ticket_text'].tolist(), method, model_path),
+                                                    arrival_seconds(df, seconds_per_ticket))):
+        scheduler.push(position, score, arrival)
+    dispatch = [scheduler.pop() for _ in range(len(scheduler))]
+    labeled = np.empty(len(df))
+    labeled[dispatch] = np.arange(1, len(df) + 1) * seconds_per_ticket
+    return time_to_label_report(pd.DataFrame({'position': np.arange(len(df)), 'urgency': df['urgency'],
+                                              'service_seconds': seconds_per_ticket,
+                                              'labeled_seconds': labeled}))
+
+
+def print_report(report: pd.DataFrame, output_file: Optional[str] = None):
+    print("\n⏱️  Time-to-label by urgency (minutes, scheduled vs file order):")
+    print(report.to_string(index=False))
+    if output_file:
+        os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+        report.to_csv(output_file, index=False)
+        print(f"💾 Saved time-to-label report → {output_file}")
+
+
+def main():
+    """Offline check of the urgency-first dispatch order on an already analyzed file"""
+    parser = argparse.ArgumentParser(description="Urgency-prioritized scheduling simulation")
+    parser.add_argument('--simulate', default='analyzed_tickets.csv')
+    parser.add_argument('--seconds-per-ticket', type=float, default=3.5)
+    parser.add_argument('--prescore', choices=['auto', 'model', 'keywords'], default='auto')
+    parser.add_argument('--max-boost-seconds', type=float, default=1800.0)
+    parser.add_argument('--model', default=URGENCY_MODEL)
+    parser.add_argument('--report', default='reports/time_to_label_simulation.csv')
+    parser.add_argument('--check-aging', action='store_true',
+                        help="Only verify that an old low-priority ticket is not starved")
+    args = parser.parse_args()
+
+    if args.check_aging:
+        overtaken = check_aging(args.max_boost_seconds, args.seconds_per_ticket)
+        print(f"✅ Aging works: an old low-priority ticket was overtaken by {overtaken} urgent tickets, "
+              f"then served")
+        return
+
+    report = simulate(args.simulate, args.seconds_per_ticket, args.prescore, args.max_boost_seconds, args.model)
+    print_report(report, args.report)
+
+
+if __name__ == "__main__":
+    main()